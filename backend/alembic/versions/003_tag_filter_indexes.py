@@ -0,0 +1,28 @@
+"""Index tag_id on entry/tag association tables
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The composite primary keys lead with the entry id, so tag-first lookups
+# (EXISTS semi-joins used by tag filters) need their own index.
+_TABLES = ("bp_entry_tags", "symptom_entry_tags", "food_entry_tags", "gym_entry_tags")
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.create_index(f"ix_{table}_tag_id", table, ["tag_id"])
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.drop_index(f"ix_{table}_tag_id", table_name=table)
@@ -0,0 +1,68 @@
+"""Add bp_daily_stats aggregate table
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from alembic import op
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "bp_daily_stats",
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("day", sa.Date, primary_key=True),
+        sa.Column("n", sa.Integer, nullable=False),
+        sa.Column("sys_sum", sa.Integer, nullable=False),
+        sa.Column("sys_min", sa.Integer, nullable=False),
+        sa.Column("sys_max", sa.Integer, nullable=False),
+        sa.Column("dia_sum", sa.Integer, nullable=False),
+        sa.Column("dia_min", sa.Integer, nullable=False),
+        sa.Column("dia_max", sa.Integer, nullable=False),
+        sa.Column("pulse_n", sa.Integer, nullable=False),
+        sa.Column("pulse_sum", sa.Integer, nullable=False),
+        sa.Column("category_counts", JSONB, nullable=False),
+    )
+
+    # Initial fill from existing readings; `python -m app.backfill` rebuilds it later if needed
+    op.execute("""
+        INSERT INTO bp_daily_stats
+        SELECT user_id, entry_date, count(*),
+               sum(systolic), min(systolic), max(systolic),
+               sum(diastolic), min(diastolic), max(diastolic),
+               count(pulse), coalesce(sum(pulse), 0),
+               jsonb_build_object(
+                   'Normal', count(*) FILTER (WHERE category = 'Normal'),
+                   'Elevated', count(*) FILTER (WHERE category = 'Elevated'),
+                   'High Stage 1', count(*) FILTER (WHERE category = 'High Stage 1'),
+                   'High Stage 2', count(*) FILTER (WHERE category = 'High Stage 2'),
+                   'Hypertensive Crisis', count(*) FILTER (WHERE category = 'Hypertensive Crisis'),
+                   'Low (Hypotension)', count(*) FILTER (WHERE category = 'Low (Hypotension)')
+               )
+        FROM (
+            SELECT e.user_id, e.entry_date, r.systolic, r.diastolic, r.pulse,
+                   CASE
+                       WHEN r.systolic > 180 OR r.diastolic > 120 THEN 'Hypertensive Crisis'
+                       WHEN r.systolic >= 140 OR r.diastolic >= 90 THEN 'High Stage 2'
+                       WHEN r.systolic >= 130 OR r.diastolic >= 80 THEN 'High Stage 1'
+                       WHEN r.systolic BETWEEN 120 AND 129 AND r.diastolic < 80 THEN 'Elevated'
+                       WHEN r.systolic < 90 AND r.diastolic < 60 THEN 'Low (Hypotension)'
+                       ELSE 'Normal'
+                   END AS category
+            FROM bp_readings r JOIN bp_entries e ON r.bp_entry_id = e.id
+        ) readings
+        GROUP BY user_id, entry_date
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("bp_daily_stats")
@@ -0,0 +1,52 @@
+"""Persist BP category on readings
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from alembic import op
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    postgresql.ENUM("low", "normal", "elevated", "stage_1", "stage_2", "crisis", name="bpcategory").create(bind, checkfirst=True)
+
+    op.add_column(
+        "bp_readings",
+        sa.Column("category", postgresql.ENUM(name="bpcategory", create_type=False), nullable=True),
+    )
+    # Same thresholds as services.bp_category.classify_bp
+    op.execute("""
+        UPDATE bp_readings SET category = (CASE
+            WHEN systolic > 180 OR diastolic > 120 THEN 'crisis'
+            WHEN systolic >= 140 OR diastolic >= 90 THEN 'stage_2'
+            WHEN systolic >= 130 OR diastolic >= 80 THEN 'stage_1'
+            WHEN systolic BETWEEN 120 AND 129 AND diastolic < 80 THEN 'elevated'
+            WHEN systolic < 90 AND diastolic < 60 THEN 'low'
+            ELSE 'normal'
+        END)::bpcategory
+    """)
+    op.alter_column("bp_readings", "category", nullable=False)
+
+    op.create_index(
+        "ix_bp_readings_high_category",
+        "bp_readings",
+        ["bp_entry_id", "recorded_at"],
+        postgresql_where=sa.text("category IN ('stage_2', 'crisis')"),
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    op.drop_index("ix_bp_readings_high_category", table_name="bp_readings")
+    op.drop_column("bp_readings", "category")
+    postgresql.ENUM(name="bpcategory").drop(bind, checkfirst=True)
@@ -0,0 +1,40 @@
+"""Add stored tsvector columns and GIN indexes for full-text search
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 00:00:00.000000
+
+Adding a stored generated column rewrites each table, so this takes a
+lock proportional to table size on large installs.
+"""
+from typing import Sequence, Union
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from alembic import op
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_WEIGHTED = "setweight(to_tsvector('english', description), 'A') || setweight(to_tsvector('english', coalesce(notes, '')), 'B')"
+
+VECTORS = {
+    "bp_entries": "to_tsvector('english', coalesce(notes, ''))",
+    "symptom_entries": _WEIGHTED,
+    "food_entries": _WEIGHTED,
+    "gym_entries": "to_tsvector('english', coalesce(session_notes, ''))",
+    "ai_summaries": "to_tsvector('english', content)",
+}
+
+
+def upgrade() -> None:
+    for table, expression in VECTORS.items():
+        op.add_column(table, sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(expression, persisted=True)))
+        op.create_index(f"ix_{table}_search", table, ["search_vector"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    for table in VECTORS:
+        op.drop_index(f"ix_{table}_search", table_name=table)
+        op.drop_column(table, "search_vector")
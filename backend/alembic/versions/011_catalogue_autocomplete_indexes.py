@@ -0,0 +1,53 @@
+"""Add indexes for ranked catalogue autocomplete
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19 00:00:00.000000
+
+pg_trgm ships with the standard Postgres contrib packages. Where it isn't
+available the trigram indexes are skipped and autocomplete falls back to
+prefix and substring matching (services.catalogue). Once the extension can
+be installed, downgrade to 010 and upgrade again to add them.
+"""
+import logging
+from typing import Sequence, Union
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_CATALOGUES = ("food_catalogue_items", "exercise_catalogue_items")
+
+# Alembic's own logger, so the message shows alongside "Running upgrade ..."
+log = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade() -> None:
+    # Usage counts for ranking: a user's recent food entries per catalogue item
+    op.create_index("ix_food_entries_user_catalogue_item", "food_entries", ["user_id", "catalogue_item_id", "entry_date"])
+    # Deleting a catalogue item nulls out its entries' references
+    op.create_index("ix_food_entries_catalogue_item_id", "food_entries", ["catalogue_item_id"])
+    for table in _CATALOGUES:
+        op.create_index(f"ix_{table}_user_name", table, ["user_id", sa.text('lower(name) COLLATE "C"')])
+
+    available = op.get_bind().scalar(sa.text("SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')"))
+    if not available:
+        log.warning("pg_trgm is not available; skipping trigram indexes on catalogue names")
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table in _CATALOGUES:
+        op.create_index(
+            f"ix_{table}_name_trgm", table, ["name"],
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for table in _CATALOGUES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_name_trgm")
+        op.drop_index(f"ix_{table}_user_name", table_name=table)
+    op.drop_index("ix_food_entries_catalogue_item_id", table_name="food_entries")
+    op.drop_index("ix_food_entries_user_catalogue_item", table_name="food_entries")
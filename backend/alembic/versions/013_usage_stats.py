@@ -0,0 +1,58 @@
+"""Add food_usage_stats and exercise_usage_stats for quick-log suggestions
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, ENUM
+from alembic import op
+
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "food_usage_stats",
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("meal_type", ENUM(name="mealtype", create_type=False), primary_key=True),
+        sa.Column("catalogue_item_id", UUID(as_uuid=True), sa.ForeignKey("food_catalogue_items.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("hour", sa.SmallInteger, primary_key=True),
+        sa.Column("uses", sa.Integer, nullable=False),
+        sa.Column("weight", sa.Float, nullable=False),
+    )
+    op.create_index("ix_food_usage_stats_catalogue_item_id", "food_usage_stats", ["catalogue_item_id"])
+    op.create_table(
+        "exercise_usage_stats",
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("name", sa.String(255), primary_key=True),
+        sa.Column("uses", sa.Integer, nullable=False),
+        sa.Column("weight", sa.Float, nullable=False),
+    )
+
+    # Initial fill from existing entries; `python -m app.backfill` rebuilds them later if needed.
+    # weight: 2 ** (days since 2020-01-01 / 30) per use, as services.usage_stats
+    op.execute("""
+        INSERT INTO food_usage_stats
+        SELECT user_id, meal_type, catalogue_item_id, extract(hour FROM entry_time)::smallint, count(*),
+               sum(power(2.0, ((entry_date - date '2020-01-01') + extract(epoch FROM entry_time) / 86400) / 30.0))::float8
+        FROM food_entries
+        WHERE catalogue_item_id IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+    """)
+    op.execute("""
+        INSERT INTO exercise_usage_stats
+        SELECT e.user_id, lower(x.machine), count(*), sum(power(2.0, (e.entry_date - date '2020-01-01') / 30.0))::float8
+        FROM gym_exercises x JOIN gym_entries e ON x.gym_entry_id = e.id
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("exercise_usage_stats")
+    op.drop_table("food_usage_stats")
@@ -0,0 +1,33 @@
+"""
+Rebuild derived tables from the raw diary data.
+
+    python -m app.backfill                 # every user
+    python -m app.backfill <user-uuid>     # a single user
+
+Rebuilds bp_daily_stats and the quick-log usage stats. Safe to re-run at
+any time; the work happens in a single transaction.
+"""
+import asyncio
+import logging
+import sys
+import uuid
+from .database import AsyncSessionLocal
+from .services.bp_stats import backfill_daily_stats
+from .services.usage_stats import backfill_usage_stats
+
+log = logging.getLogger(__name__)
+
+
+async def backfill(user_id: uuid.UUID | None = None) -> None:
+    async with AsyncSessionLocal() as session:
+        rows = await backfill_daily_stats(session, user_id)
+        usage_rows = await backfill_usage_stats(session, user_id)
+        await session.commit()
+    who = f" for {user_id}" if user_id else ""
+    log.info("Backfill: bp_daily_stats rebuilt (%d day rows%s).", rows, who)
+    log.info("Backfill: usage stats rebuilt (%d rows%s).", usage_rows, who)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(backfill(uuid.UUID(sys.argv[1]) if len(sys.argv) > 1 else None))
@@ -6,6 +6,9 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
     DATABASE_URL: str
+    # Optional read replica for GET routes; users who wrote within the window read from the primary
+    DATABASE_READ_URL: str | None = None
+    READ_AFTER_WRITE_SECONDS: float = 5
     SECRET_KEY: str
     ANTHROPIC_API_KEY: str
     FRONTEND_URL: str = "http://localhost:5173"
@@ -13,6 +16,66 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     ALGORITHM: str = "HS256"
 
+    # AI provider: anthropic | stub (canned summaries after AI_STUB_LATENCY_MS, for load tests)
+    AI_PROVIDER: str = "anthropic"
+    AI_STUB_LATENCY_MS: float = 800
+
+    # Connection pool, per worker process (size × workers must fit max_connections / PgBouncer)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = -1  # seconds; -1 keeps connections indefinitely
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int = 0  # connections opened at startup
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection
+    # Server settings sent when connecting; unset leaves the server default
+    DB_STATEMENT_TIMEOUT_MS: int | None = None
+    DB_JIT: bool | None = None
+    # Transaction-mode PgBouncer: no prepared-statement reuse, no startup parameters
+    DB_PGBOUNCER: bool = False
+
+    # Rate-limit buckets: memory (per process) | postgres (shared via DATABASE_URL) | redis://host:6379/0
+    RATE_LIMIT_STORAGE: str = "memory"
+    # Proxies (addresses/CIDRs) whose X-Forwarded-For entries are believed when resolving the client IP.
+    # Default: loopback, and the docker bridge networks that the host nginx's proxy_pass 127.0.0.1:8000
+    # and the frontend container arrive from. Any other private range can reach :8000 directly and must
+    # be opted into deliberately, or its hosts could pick their own address for every request.
+    RATE_LIMIT_TRUSTED_PROXIES: str = "127.0.0.0/8,::1,172.16.0.0/12"
+
+    # Per-user quota for AI summaries and PDF export, in cost units (see services.quotas.COSTS)
+    QUOTA_PER_MINUTE: int = 30
+    QUOTA_PER_DAY: int = 300
+    # Admission control, per worker: shed new AI/PDF work with 503 beyond this many in flight or queued
+    ADMISSION_MAX_AI: int = 8
+    ADMISSION_MAX_PDF: int = 4
+    ADMISSION_RETRY_AFTER: int = 10  # seconds
+
+    # Concurrent identical GETs from one user (entries, profile, summaries, tags) share one run of the route
+    SINGLE_FLIGHT: bool = True
+
+    # Per-worker LRU of users' tags and catalogues (services.user_cache): entries, and the
+    # largest set kept; bigger catalogues are always queried
+    USER_CACHE_SIZE: int = 2000
+    USER_CACHE_MAX_ITEMS: int = 1000
+
+    # Responses smaller than this (bytes) are sent uncompressed
+    COMPRESSION_MIN_SIZE: int = 1024
+
+    # Debug mode adds X-DB-Queries / X-DB-Time headers to every response
+    DEBUG: bool = False
+    # Requests issuing more SQL statements than this are logged as warnings
+    QUERY_BUDGET: int = 15
+
+    # Slow-query log (off unless a threshold is set); EXPLAIN sample is a 0–1 fraction
+    SLOW_QUERY_MS: float | None = None
+    SLOW_QUERY_EXPLAIN_SAMPLE: float = 0.0
+    SLOW_QUERY_BUFFER: int = 200
+
+    # Tracing: none | file (JSON lines at TRACING_FILE) | otlp (OTEL_EXPORTER_OTLP_* env vars)
+    TRACING_EXPORTER: str = "none"
+    TRACING_FILE: str = "traces.jsonl"
+    TRACING_SAMPLE_RATE: float = 1.0
+
     # Initial admin seed (optional — only used on first startup when no users exist)
     ADMIN_EMAIL: str | None = None
     ADMIN_PASSWORD: str | None = None
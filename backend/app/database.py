@@ -1,24 +1,101 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+import asyncio
+import uuid
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 from typing import AsyncGenerator
 from contextlib import asynccontextmanager
-from .config import get_settings
+from .config import Settings, get_settings
+from .services.metrics import instrument_engine
+from .services.slow_queries import install_slow_query_log
+from .services.tracing import setup_tracing
 
 
 class Base(DeclarativeBase):
     pass
 
 
-def _get_engine():
+def _server_settings(settings: Settings, read_only: bool) -> dict[str, str]:
+    server_settings = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS is not None:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    if settings.DB_JIT is not None:
+        server_settings["jit"] = "on" if settings.DB_JIT else "off"
+    if read_only:
+        # Guards against a write slipping onto the replica engine (or onto the
+        # primary when both URLs point at one server for local testing)
+        server_settings["default_transaction_read_only"] = "on"
+    return server_settings
+
+
+def _get_engine(url: str, pool_name: str, read_only: bool = False) -> AsyncEngine:
     settings = get_settings()
-    return create_async_engine(settings.DATABASE_URL, echo=False, pool_pre_ping=True)
+    server_settings = _server_settings(settings, read_only)
+    # statement_cache_size is asyncpg's own cache, prepared_statement_cache_size SQLAlchemy's
+    cache_size = 0 if settings.DB_PGBOUNCER else settings.DB_STATEMENT_CACHE_SIZE
+    connect_args = {"statement_cache_size": cache_size, "prepared_statement_cache_size": cache_size}
+    if settings.DB_PGBOUNCER:
+        # A transaction-mode pooler may hand each transaction a different server
+        # connection, so prepared statements need unique names and can't be reused
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+    elif server_settings:
+        connect_args["server_settings"] = server_settings
+    engine = create_async_engine(
+        url,
+        echo=False,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    if settings.DB_PGBOUNCER and server_settings:
+        # PgBouncer rejects unknown startup parameters; apply them per transaction instead
+        if server_settings.pop("default_transaction_read_only", None):
+            server_settings["transaction_read_only"] = "on"
+        set_local = "SELECT " + ", ".join(f"set_config('{k}', '{v}', true)" for k, v in server_settings.items())
+
+        @event.listens_for(engine.sync_engine, "begin")
+        def _apply_server_settings(conn):
+            conn.exec_driver_sql(set_local)
+
+    instrument_engine(engine.sync_engine, pool_name)
+    if settings.SLOW_QUERY_MS is not None:
+        install_slow_query_log(
+            engine,
+            threshold_ms=settings.SLOW_QUERY_MS,
+            hash_key=settings.SECRET_KEY,
+            explain_sample=settings.SLOW_QUERY_EXPLAIN_SAMPLE,
+            capacity=settings.SLOW_QUERY_BUFFER,
+        )
+    return engine
 
 
-engine = _get_engine()
+_settings = get_settings()
+engine = _get_engine(_settings.DATABASE_URL, "primary")
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
+# Optional replica for read-only routes (see routers.deps.get_read_db)
+read_engine = _get_engine(_settings.DATABASE_READ_URL, "replica", read_only=True) if _settings.DATABASE_READ_URL else None
+ReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False) if read_engine else None
+
+setup_tracing(_settings, *(e.sync_engine for e in (engine, read_engine) if e))
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open `connections` pool connections at once so the first requests don't pay for connecting."""
+    if connections <= 0:
+        return
+    conns = await asyncio.gather(*(engine.connect() for _ in range(connections)))
+    for conn in conns:
+        await conn.close()
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Request session. A pooled connection is checked out on its first
+    statement, not here, so requests answered before any SQL (rejected auth,
+    rate limits, cache hits) never touch the pool."""
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -1,25 +1,45 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 from .config import get_settings
-from .routers import auth, users, profile, entries, tags, catalogue, exercise_catalogue, summaries, export
+from .database import engine, read_engine, warm_up_pool
+from .middleware import (
+    CompressionMiddleware, MetricsMiddleware, ProfilingMiddleware, QueryBudgetMiddleware, SingleFlightMiddleware, TracingMiddleware,
+)
+from .services import metrics
+from .services.rate_limit import get_limiter
+from .routers.deps import conditional_get
+from .routers import auth, users, profile, entries, tags, catalogue, exercise_catalogue, summaries, export, analytics, admin, search
 
 settings = get_settings()
 
-limiter = Limiter(key_func=get_remote_address)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    engines = [e for e in (engine, read_engine) if e]
+    for e in engines:
+        await warm_up_pool(e, min(settings.DB_POOL_WARMUP, settings.DB_POOL_SIZE))
+    yield
+    await get_limiter().close()
+    for e in engines:
+        await e.dispose()
+
 
 app = FastAPI(
     title="MediDiary API",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
+if settings.SINGLE_FLIGHT:
+    app.add_middleware(
+        SingleFlightMiddleware,
+        prefixes=("/api/v1/entries", "/api/v1/profile", "/api/v1/summaries", "/api/v1/tags"),
+    )
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[settings.FRONTEND_URL],
@@ -27,18 +47,35 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(QueryBudgetMiddleware, budget=settings.QUERY_BUDGET, debug_headers=settings.DEBUG)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+
+# Per-user data routes answer conditional GETs from the user's data version
+cached = [Depends(conditional_get)]
 
 app.include_router(auth.router,      prefix="/api/v1/auth",      tags=["auth"])
 app.include_router(users.router,     prefix="/api/v1/users",     tags=["users"])
-app.include_router(profile.router,   prefix="/api/v1/profile",   tags=["profile"])
-app.include_router(entries.router,   prefix="/api/v1/entries",   tags=["entries"])
-app.include_router(tags.router,      prefix="/api/v1/tags",      tags=["tags"])
-app.include_router(catalogue.router,          prefix="/api/v1/catalogue",          tags=["catalogue"])
-app.include_router(exercise_catalogue.router, prefix="/api/v1/exercise-catalogue", tags=["exercise-catalogue"])
-app.include_router(summaries.router,          prefix="/api/v1/summaries",          tags=["summaries"])
+app.include_router(profile.router,   prefix="/api/v1/profile",   tags=["profile"],   dependencies=cached)
+app.include_router(entries.router,   prefix="/api/v1/entries",   tags=["entries"],   dependencies=cached)
+app.include_router(tags.router,      prefix="/api/v1/tags",      tags=["tags"],      dependencies=cached)
+app.include_router(catalogue.router,          prefix="/api/v1/catalogue",          tags=["catalogue"],          dependencies=cached)
+app.include_router(exercise_catalogue.router, prefix="/api/v1/exercise-catalogue", tags=["exercise-catalogue"], dependencies=cached)
+app.include_router(summaries.router,          prefix="/api/v1/summaries",          tags=["summaries"],          dependencies=cached)
 app.include_router(export.router,    prefix="/api/v1/export",    tags=["export"])
+app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["analytics"], dependencies=cached)
+app.include_router(search.router,    prefix="/api/v1/search",    tags=["search"],    dependencies=cached)
+app.include_router(admin.router,     prefix="/api/v1/admin",     tags=["admin"])
 
 
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+# Not proxied by nginx (only /api/ is) — scrape the backend container directly
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
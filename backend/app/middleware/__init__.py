@@ -0,0 +1,8 @@
+from .compression import CompressionMiddleware
+from .metrics import MetricsMiddleware
+from .profiling import ProfilingMiddleware
+from .query_budget import QueryBudgetMiddleware
+from .single_flight import SingleFlightMiddleware
+from .tracing import TracingMiddleware
+
+__all__ = ["CompressionMiddleware", "MetricsMiddleware", "ProfilingMiddleware", "QueryBudgetMiddleware", "SingleFlightMiddleware", "TracingMiddleware"]
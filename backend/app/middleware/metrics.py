@@ -0,0 +1,40 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..services import metrics
+
+
+class MetricsMiddleware:
+    """Per-route request counts and latency, plus the DB work each request did."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = metrics.RequestStats(scope=scope)
+        token = metrics.current_request.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.current_request.reset(token)
+            route = stats.route = metrics.route_template(scope)
+            method = scope["method"]
+            metrics.http_requests.inc(method, route, str(status_code))
+            metrics.http_latency.observe(elapsed, method, route)
+            metrics.http_db_queries.observe(stats.queries, route)
+            metrics.http_db_time.observe(stats.db_time, route)
+            if not stats.checkouts:
+                metrics.http_no_db.inc(method, route)
@@ -0,0 +1,64 @@
+from urllib.parse import parse_qs
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..database import AsyncSessionLocal
+from ..routers.deps import get_current_user, get_admin_user
+from ..services.request_profiler import start_profiler, new_profile_id, save_profile
+
+_TRUTHY = ("1", "true", "yes")
+
+
+def _requested(scope: Scope) -> bool:
+    if Headers(scope=scope).get("x-profile", "").lower() in _TRUTHY:
+        return True
+    query = scope.get("query_string", b"")
+    return b"profile=" in query and parse_qs(query.decode()).get("profile", [""])[-1].lower() in _TRUTHY
+
+
+async def _is_admin(scope: Scope) -> bool:
+    scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    async with AsyncSessionLocal() as session:
+        try:
+            user = await get_current_user(HTTPAuthorizationCredentials(scheme=scheme, credentials=token), session)
+            await get_admin_user(user)
+        except HTTPException:
+            return False
+    return True
+
+
+class ProfilingMiddleware:
+    """Profile a single request when an admin sends `X-Profile: 1` or `?profile=1`.
+
+    The admin's bearer token authorises profiling even on routes that don't
+    otherwise read it (e.g. login). Requests without the flag pay one header
+    lookup and nothing else. The profile id is returned in X-Profile-Id.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _requested(scope) or not await _is_admin(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = new_profile_id()
+        status_code = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile_id
+            await send(message)
+
+        profiler = start_profiler()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            session = profiler.stop()
+            save_profile(profile_id, scope["method"], scope["path"], status_code, session)
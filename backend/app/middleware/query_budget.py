@@ -0,0 +1,50 @@
+import logging
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..services import metrics
+
+log = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    """Warn when a request issues more SQL statements than `budget`, or runs
+    the same statement `repeat_threshold` times or more (a likely N+1).
+
+    Reads the per-request counters kept by MetricsMiddleware, so it must be
+    added before it (i.e. run inside it). With `debug_headers`, responses
+    carry X-DB-Queries and X-DB-Time (ms).
+    """
+
+    def __init__(self, app: ASGIApp, budget: int, repeat_threshold: int = 5, debug_headers: bool = False) -> None:
+        self.app = app
+        self.budget = budget
+        self.repeat_threshold = repeat_threshold
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stats = metrics.current_request.get()
+        if scope["type"] != "http" or stats is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                if stats.queries > self.budget:
+                    log.warning(
+                        "%s %s issued %d queries (budget %d, %.1f ms in DB)",
+                        scope["method"], metrics.route_template(scope), stats.queries, self.budget, stats.db_time * 1000,
+                    )
+                if stats.statements:
+                    statement, repeats = stats.statements.most_common(1)[0]
+                    if repeats >= self.repeat_threshold:
+                        log.warning(
+                            "%s %s ran the same statement %d times (possible N+1): %s",
+                            scope["method"], metrics.route_template(scope), repeats, " ".join(statement.split())[:200],
+                        )
+                if self.debug_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.queries)
+                    headers["X-DB-Time"] = f"{stats.db_time * 1000:.1f}"
+            await send(message)
+
+        await self.app(scope, receive, send_with_stats)
@@ -0,0 +1,106 @@
+import asyncio
+import uuid
+from urllib.parse import parse_qsl, urlencode
+from jose import JWTError
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..services import metrics
+from ..services.auth import decode_token
+
+# (user, path, normalised query, If-None-Match)
+_Key = tuple[uuid.UUID, str, str, str]
+
+
+def _user_id(headers: Headers) -> uuid.UUID | None:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = decode_token(token)
+        return uuid.UUID(payload["sub"]) if payload.get("type") == "access" else None
+    except (JWTError, ValueError, KeyError):
+        return None
+
+
+def _copy(message: Message) -> Message:
+    # Outer middleware edits header lists in place; each replay needs its own
+    if message["type"] == "http.response.start":
+        return {**message, "headers": list(message.get("headers", []))}
+    return dict(message)
+
+
+class SingleFlightMiddleware:
+    """Let concurrent identical GETs from one user share one run of the route.
+
+    The first GET for a key (user, path, normalised query, If-None-Match)
+    under `prefixes` runs normally with its response buffered. Identical
+    GETs arriving before it finishes wait and replay that response. When
+    any other request from the user finishes, that user's in-flight GETs are
+    detached, so a read that starts after a write never gets a pre-write
+    result. Add it first, so it runs innermost, beneath CORS and compression.
+    """
+
+    def __init__(self, app: ASGIApp, prefixes: tuple[str, ...]) -> None:
+        self.app = app
+        self.prefixes = prefixes
+        self._flights: dict[_Key, asyncio.Future] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            if self._flights and (user_id := _user_id(headers)):
+                for key in [k for k in self._flights if k[0] == user_id]:
+                    del self._flights[key]
+            return
+
+        query = scope.get("query_string", b"").decode()
+        if not scope["path"].startswith(self.prefixes) or "x-profile" in headers or "profile=" in query:
+            await self.app(scope, receive, send)
+            return
+        user_id = _user_id(headers)
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = (user_id, scope["path"], urlencode(sorted(parse_qsl(query, keep_blank_values=True))), headers.get("if-none-match", ""))
+        if (flight := self._flights.get(key)) is not None:
+            await self._follow(flight, scope, receive, send)
+        else:
+            await self._lead(key, scope, receive, send)
+
+    async def _lead(self, key: _Key, scope: Scope, receive: Receive, send: Send) -> None:
+        flight = self._flights[key] = asyncio.get_running_loop().create_future()
+        messages: list[Message] = []
+
+        async def buffer(message: Message) -> None:
+            messages.append(message)
+
+        result = None
+        try:
+            await self.app(scope, receive, buffer)
+            result = (messages, scope.get("route"))
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            # None sends followers to run the route themselves
+            flight.set_result(result)
+        metrics.single_flight.inc(metrics.route_template(scope), "leader")
+        for message in messages:
+            await send(_copy(message))
+
+    async def _follow(self, flight: asyncio.Future, scope: Scope, receive: Receive, send: Send) -> None:
+        # Shielded: a follower's client going away mustn't cancel the shared result
+        result = await asyncio.shield(flight)
+        if result is None:
+            await self.app(scope, receive, send)
+            return
+        messages, route = result
+        if route is not None:
+            scope["route"] = route  # so outer middleware labels the request by its route
+        metrics.single_flight.inc(metrics.route_template(scope), "follower")
+        for message in messages:
+            await send(_copy(message))
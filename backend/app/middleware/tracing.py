@@ -0,0 +1,43 @@
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..services import metrics
+from ..services.tracing import tracer, request_id, resolve_request_id
+
+
+class TracingMiddleware:
+    """Assign each request an X-Request-ID and wrap it in a server span."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rid = resolve_request_id(Headers(scope=scope).get("x-request-id"))
+        token = request_id.set(rid)
+        method = scope["method"]
+
+        with tracer.start_as_current_span(
+            f"{method} {scope['path']}",
+            kind=SpanKind.SERVER,
+            attributes={"http.method": method, "http.target": scope["path"], "http.request_id": rid},
+        ) as span:
+            async def send_with_id(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message)["X-Request-ID"] = rid
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                if span.is_recording():
+                    route = metrics.route_template(scope)
+                    span.set_attribute("http.route", route)
+                    span.update_name(f"{method} {route}")
+                request_id.reset(token)
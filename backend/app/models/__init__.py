@@ -1,26 +1,31 @@
 from .user import User, UserRole
 from .profile import UserIdentityProfile, UserBodyMetrics, Diagnosis, Medication, Tag
 from .entries import (
-    BPEntry, BPReading,
+    BPEntry, BPReading, BPDailyStats,
     SymptomEntry,
     FoodEntry,
     GymEntry, GymExercise,
     FoodCatalogueItem,
+    FoodUsageStats, ExerciseUsageStats,
     AISummary,
     bp_entry_tags,
     symptom_entry_tags,
     food_entry_tags,
     gym_entry_tags,
 )
+from .rate_limit import RateLimitBucket
+from .usage import UsageCounter
 
 __all__ = [
     "User", "UserRole",
     "UserIdentityProfile", "UserBodyMetrics", "Diagnosis", "Medication", "Tag",
-    "BPEntry", "BPReading",
+    "BPEntry", "BPReading", "BPDailyStats",
     "SymptomEntry",
     "FoodEntry",
     "GymEntry", "GymExercise",
     "FoodCatalogueItem",
+    "FoodUsageStats", "ExerciseUsageStats",
     "AISummary",
     "bp_entry_tags", "symptom_entry_tags", "food_entry_tags", "gym_entry_tags",
+    "RateLimitBucket", "UsageCounter",
 ]
@@ -3,11 +3,11 @@ import uuid
 import enum
 from datetime import datetime, date, time
 from sqlalchemy import (
-    String, Integer, Float, DateTime, Date, Time, ForeignKey,
-    Enum as SAEnum, Text, Table, Column, func
+    String, Integer, SmallInteger, Float, DateTime, Date, Time, ForeignKey,
+    Enum as SAEnum, Text, Table, Column, Index, Computed, func, text
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from ..database import Base
 
 
@@ -16,25 +16,25 @@ from ..database import Base
 bp_entry_tags = Table(
     "bp_entry_tags", Base.metadata,
     Column("bp_entry_id", UUID(as_uuid=True), ForeignKey("bp_entries.id", ondelete="CASCADE"), primary_key=True),
-    Column("tag_id", UUID(as_uuid=True), ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", UUID(as_uuid=True), ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 symptom_entry_tags = Table(
     "symptom_entry_tags", Base.metadata,
     Column("symptom_entry_id", UUID(as_uuid=True), ForeignKey("symptom_entries.id", ondelete="CASCADE"), primary_key=True),
-    Column("tag_id", UUID(as_uuid=True), ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", UUID(as_uuid=True), ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 food_entry_tags = Table(
     "food_entry_tags", Base.metadata,
     Column("food_entry_id", UUID(as_uuid=True), ForeignKey("food_entries.id", ondelete="CASCADE"), primary_key=True),
-    Column("tag_id", UUID(as_uuid=True), ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", UUID(as_uuid=True), ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 gym_entry_tags = Table(
     "gym_entry_tags", Base.metadata,
     Column("gym_entry_id", UUID(as_uuid=True), ForeignKey("gym_entries.id", ondelete="CASCADE"), primary_key=True),
-    Column("tag_id", UUID(as_uuid=True), ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", UUID(as_uuid=True), ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 
@@ -58,15 +58,45 @@ class SummaryType(str, enum.Enum):
     weekly = "weekly"
 
 
+class BPCategory(str, enum.Enum):
+    low = "low"
+    normal = "normal"
+    elevated = "elevated"
+    stage_1 = "stage_1"
+    stage_2 = "stage_2"
+    crisis = "crisis"
+
+
+# ── Full-text search ────────────────────────────────────────────────────────
+
+def _search_vector(expression: str):
+    """Stored tsvector over an entry's free text, maintained by Postgres (services.search)."""
+    return mapped_column(TSVECTOR, Computed(expression, persisted=True), deferred=True)
+
+
+def _search_index(table: str) -> Index:
+    return Index(f"ix_{table}_search", "search_vector", postgresql_using="gin")
+
+
+def _name_indexes(table: str) -> tuple[Index, Index]:
+    """Prefix and trigram indexes for catalogue autocomplete (services.catalogue); the latter needs pg_trgm."""
+    return (
+        Index(f"ix_{table}_user_name", "user_id", text('lower(name) COLLATE "C"')),
+        Index(f"ix_{table}_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
+
+
 # ── Blood Pressure ──────────────────────────────────────────────────────────
 
 class BPEntry(Base):
     __tablename__ = "bp_entries"
+    __table_args__ = (_search_index("bp_entries"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     entry_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    search_vector: Mapped[str] = _search_vector("to_tsvector('english', coalesce(notes, ''))")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -77,6 +107,10 @@ class BPEntry(Base):
 
 class BPReading(Base):
     __tablename__ = "bp_readings"
+    __table_args__ = (
+        # Backs "concerning readings" lookups — only Stage 2 / crisis rows are indexed
+        Index("ix_bp_readings_high_category", "bp_entry_id", "recorded_at", postgresql_where=text("category IN ('stage_2', 'crisis')")),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     bp_entry_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("bp_entries.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -85,14 +119,34 @@ class BPReading(Base):
     pulse: Mapped[int | None] = mapped_column(Integer, nullable=True)
     recorded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     order_index: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    category: Mapped[BPCategory] = mapped_column(SAEnum(BPCategory, name="bpcategory"), nullable=False)
 
     bp_entry: Mapped[BPEntry] = relationship("BPEntry", back_populates="readings")
 
 
+class BPDailyStats(Base):
+    """Per-user, per-day BP aggregates, rebuilt for a day whenever its readings change."""
+    __tablename__ = "bp_daily_stats"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    n: Mapped[int] = mapped_column(Integer, nullable=False)
+    sys_sum: Mapped[int] = mapped_column(Integer, nullable=False)
+    sys_min: Mapped[int] = mapped_column(Integer, nullable=False)
+    sys_max: Mapped[int] = mapped_column(Integer, nullable=False)
+    dia_sum: Mapped[int] = mapped_column(Integer, nullable=False)
+    dia_min: Mapped[int] = mapped_column(Integer, nullable=False)
+    dia_max: Mapped[int] = mapped_column(Integer, nullable=False)
+    pulse_n: Mapped[int] = mapped_column(Integer, nullable=False)
+    pulse_sum: Mapped[int] = mapped_column(Integer, nullable=False)
+    category_counts: Mapped[dict[str, int]] = mapped_column(JSONB, nullable=False)
+
+
 # ── Symptom ─────────────────────────────────────────────────────────────────
 
 class SymptomEntry(Base):
     __tablename__ = "symptom_entries"
+    __table_args__ = (_search_index("symptom_entries"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -101,6 +155,9 @@ class SymptomEntry(Base):
     description: Mapped[str] = mapped_column(Text, nullable=False)
     severity: Mapped[int | None] = mapped_column(Integer, nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    search_vector: Mapped[str] = _search_vector(
+        "setweight(to_tsvector('english', description), 'A') || setweight(to_tsvector('english', coalesce(notes, '')), 'B')"
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -112,6 +169,10 @@ class SymptomEntry(Base):
 
 class FoodEntry(Base):
     __tablename__ = "food_entries"
+    __table_args__ = (
+        _search_index("food_entries"),
+        Index("ix_food_entries_user_catalogue_item", "user_id", "catalogue_item_id", "entry_date"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -120,8 +181,11 @@ class FoodEntry(Base):
     meal_type: Mapped[MealType] = mapped_column(SAEnum(MealType, name="mealtype"), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     quantity: Mapped[str | None] = mapped_column(String(255), nullable=True)
-    catalogue_item_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("food_catalogue_items.id", ondelete="SET NULL"), nullable=True)
+    catalogue_item_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("food_catalogue_items.id", ondelete="SET NULL"), nullable=True, index=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    search_vector: Mapped[str] = _search_vector(
+        "setweight(to_tsvector('english', description), 'A') || setweight(to_tsvector('english', coalesce(notes, '')), 'B')"
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -132,6 +196,7 @@ class FoodEntry(Base):
 
 class FoodCatalogueItem(Base):
     __tablename__ = "food_catalogue_items"
+    __table_args__ = _name_indexes("food_catalogue_items")
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -148,6 +213,7 @@ class FoodCatalogueItem(Base):
 
 class ExerciseCatalogueItem(Base):
     __tablename__ = "exercise_catalogue_items"
+    __table_args__ = _name_indexes("exercise_catalogue_items")
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -161,11 +227,13 @@ class ExerciseCatalogueItem(Base):
 
 class GymEntry(Base):
     __tablename__ = "gym_entries"
+    __table_args__ = (_search_index("gym_entries"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     entry_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     session_notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    search_vector: Mapped[str] = _search_vector("to_tsvector('english', coalesce(session_notes, ''))")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -189,10 +257,35 @@ class GymExercise(Base):
     gym_entry: Mapped[GymEntry] = relationship("GymEntry", back_populates="exercises")
 
 
+# ── Usage statistics ────────────────────────────────────────────────────────
+
+class FoodUsageStats(Base):
+    """Per-user use of each catalogue item by meal type and hour, kept up to date as entries change (services.usage_stats)."""
+    __tablename__ = "food_usage_stats"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    meal_type: Mapped[MealType] = mapped_column(SAEnum(MealType, name="mealtype"), primary_key=True)
+    catalogue_item_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("food_catalogue_items.id", ondelete="CASCADE"), primary_key=True, index=True)
+    hour: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    uses: Mapped[int] = mapped_column(Integer, nullable=False)
+    weight: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class ExerciseUsageStats(Base):
+    """Per-user use of each exercise (by lower-cased machine name), kept up to date as gym entries change."""
+    __tablename__ = "exercise_usage_stats"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    uses: Mapped[int] = mapped_column(Integer, nullable=False)
+    weight: Mapped[float] = mapped_column(Float, nullable=False)
+
+
 # ── AI Summary ───────────────────────────────────────────────────────────────
 
 class AISummary(Base):
     __tablename__ = "ai_summaries"
+    __table_args__ = (_search_index("ai_summaries"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -200,6 +293,7 @@ class AISummary(Base):
     period_start: Mapped[date] = mapped_column(Date, nullable=False)
     period_end: Mapped[date] = mapped_column(Date, nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    search_vector: Mapped[str] = _search_vector("to_tsvector('english', content)")
     generated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     user: Mapped[User] = relationship("User", back_populates="ai_summaries")
@@ -0,0 +1,17 @@
+from sqlalchemy import Float, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from ..database import Base
+
+
+class RateLimitBucket(Base):
+    """Shared rate-limit state for PostgresStorage (services.rate_limit).
+
+    Unlogged: no WAL, not replicated, emptied after a crash — all fine for
+    buckets that refill within minutes.
+    """
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key: Mapped[str] = mapped_column(Text, primary_key=True)
+    # Theoretical arrival time (epoch seconds) of the next request at the sustained rate
+    tat: Mapped[float] = mapped_column(Float(precision=53), nullable=False)
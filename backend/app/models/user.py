@@ -2,7 +2,7 @@ from __future__ import annotations
 import uuid
 import enum
 from datetime import datetime
-from sqlalchemy import String, Boolean, DateTime, Enum as SAEnum, func
+from sqlalchemy import String, Boolean, BigInteger, DateTime, Enum as SAEnum, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from ..database import Base
@@ -24,6 +24,12 @@ class User(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     mfa_enabled: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     mfa_secret: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Bumped on every write made on the user's behalf; feeds ETags (services.data_version)
+    data_version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    # When data_version was last bumped; keeps the user's reads on the primary for a while (read-your-writes)
+    data_written_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Bumped only when the user's tags or catalogues change; validates services.user_cache
+    catalogue_version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -0,0 +1,60 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import HTMLResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_db
+from ..models.user import User
+from ..schemas.admin import SlowQueryOut, RequestProfileOut, UsageOut
+from ..services.quotas import get_usage
+from ..services.slow_queries import get_slow_queries, clear_slow_queries
+from ..services.request_profiler import list_profiles, render_profile
+from .deps import get_admin_user
+
+router = APIRouter()
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryOut])
+async def list_slow_queries(
+    limit: int = Query(default=50, ge=1, le=1000),
+    _admin: User = Depends(get_admin_user),
+):
+    return get_slow_queries(limit)
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_slow_queries(_admin: User = Depends(get_admin_user)):
+    clear_slow_queries()
+
+
+@router.get("/request-profiles", response_model=list[RequestProfileOut])
+async def list_request_profiles(_admin: User = Depends(get_admin_user)):
+    return list_profiles()
+
+
+@router.get("/request-profiles/{profile_id}")
+async def get_request_profile(
+    profile_id: str,
+    format: Literal["speedscope", "html"] = Query(default="speedscope"),
+    _admin: User = Depends(get_admin_user),
+):
+    """speedscope JSON (open at https://www.speedscope.app) or an HTML flame view."""
+    rendered = render_profile(profile_id, format)
+    if rendered is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "html":
+        return HTMLResponse(rendered)
+    return Response(
+        content=rendered,
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.speedscope.json"'},
+    )
+
+
+@router.get("/usage", response_model=list[UsageOut])
+async def list_usage(
+    days: int = Query(default=7, ge=1, le=90),
+    session: AsyncSession = Depends(get_db),
+    _admin: User = Depends(get_admin_user),
+):
+    """Quota-charged requests, cost units and rejections per user and kind over the last `days` days."""
+    return await get_usage(session, days)
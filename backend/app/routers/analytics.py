@@ -0,0 +1,41 @@
+from datetime import date, timedelta
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.user import User
+from ..schemas.analytics import BPStatisticsOut, ConcerningReadingOut
+from ..services.analytics import get_bp_statistics, get_concerning_readings
+from .deps import get_current_user, get_read_db
+
+router = APIRouter()
+
+
+def _resolve_range(start_date: date | None, end_date: date | None) -> tuple[date, date]:
+    """Default to the 90 days ending today."""
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=90)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+    return start_date, end_date
+
+
+@router.get("/bp", response_model=BPStatisticsOut)
+async def bp_statistics(
+    start_date: date | None = Query(default=None),
+    end_date: date | None = Query(default=None),
+    session: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    start_date, end_date = _resolve_range(start_date, end_date)
+    stats = await get_bp_statistics(session, user.id, start_date, end_date)
+    return BPStatisticsOut(start_date=start_date, end_date=end_date, **stats)
+
+
+@router.get("/bp/concerning", response_model=list[ConcerningReadingOut])
+async def concerning_readings(
+    start_date: date | None = Query(default=None),
+    end_date: date | None = Query(default=None),
+    session: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    start_date, end_date = _resolve_range(start_date, end_date)
+    return await get_concerning_readings(session, user.id, start_date, end_date)
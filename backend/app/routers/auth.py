@@ -1,6 +1,6 @@
 import uuid
 from datetime import timedelta, timezone, datetime
-from fastapi import APIRouter, HTTPException, Response, Cookie, Depends, Request, status
+from fastapi import APIRouter, HTTPException, Response, Cookie, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 import pyotp
@@ -22,12 +22,9 @@ from ..services.auth import (
     get_user_by_id, hash_password, verify_password,
 )
 from ..config import get_settings
-from .deps import get_current_user
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from .deps import get_current_user, rate_limit
 
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
 
 
 def _set_refresh_cookie(response: Response, token: str) -> None:
@@ -43,10 +40,8 @@ def _set_refresh_cookie(response: Response, token: str) -> None:
     )
 
 
-@router.post("/login")
-@limiter.limit("5/minute")
+@router.post("/login", dependencies=[Depends(rate_limit("5/minute"))])
 async def login(
-    request: Request,
     body: LoginRequest,
     response: Response,
     session: AsyncSession = Depends(get_db),
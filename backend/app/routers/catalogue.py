@@ -1,12 +1,16 @@
 import uuid
+from datetime import datetime, time
 from fastapi import APIRouter, HTTPException, Depends, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from ..database import get_db
 from ..models.user import User
-from ..models.entries import FoodCatalogueItem, CatalogueCategory
+from ..models.entries import FoodCatalogueItem, CatalogueCategory, MealType
 from ..schemas.entries import FoodCatalogueItemCreate, FoodCatalogueItemUpdate, FoodCatalogueItemOut
-from .deps import get_current_user
+from ..services import user_cache
+from ..services.catalogue import autocomplete_food
+from ..services.usage_stats import suggest_food
+from .deps import get_current_user, get_read_db
 
 router = APIRouter()
 
@@ -15,9 +19,16 @@ router = APIRouter()
 async def list_catalogue(
     search: str | None = Query(default=None),
     category: CatalogueCategory | None = Query(default=None),
-    session: AsyncSession = Depends(get_db),
+    limit: int | None = Query(default=None, ge=1, le=50, description="Autocomplete: the best `limit` matches, ranked"),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
+    if limit is not None:
+        return await autocomplete_food(session, user, search or "", limit, category)
+    items = await user_cache.food_catalogue(session, user)
+    if items is not None:
+        needle = (search or "").lower()
+        return [item for item in items if needle in item.name.lower() and (not category or item.category == category)]
     q = select(FoodCatalogueItem).where(FoodCatalogueItem.user_id == user.id)
     if search:
         q = q.where(FoodCatalogueItem.name.ilike(f"%{search}%"))
@@ -27,6 +38,18 @@ async def list_catalogue(
     return result.scalars().all()
 
 
+@router.get("/suggestions", response_model=list[FoodCatalogueItemOut])
+async def catalogue_suggestions(
+    meal_type: MealType | None = Query(default=None),
+    at: time | None = Query(default=None, description="Time of day to suggest for, in the user's local time; defaults to the server's clock, so clients should send it"),
+    limit: int = Query(default=8, ge=1, le=50),
+    session: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    """Quick-log: the items the user most often logs for this meal around this time, recent uses counting most."""
+    return await suggest_food(session, user.id, meal_type, at or datetime.now().time(), limit)
+
+
 @router.post("", response_model=FoodCatalogueItemOut, status_code=status.HTTP_201_CREATED)
 async def create_catalogue_item(
     body: FoodCatalogueItemCreate,
@@ -1,11 +1,18 @@
 import uuid
-from fastapi import Depends, HTTPException, status
+from datetime import datetime, timezone
+from typing import AsyncGenerator
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..database import get_db
+from ..config import get_settings
+from ..database import AsyncSessionLocal, ReadSessionLocal, get_db
 from ..models.user import User, UserRole
 from ..services.auth import decode_token, get_user_by_id
+from ..services.data_version import track_user, weak_etag
+from ..services.quotas import COSTS, charge, record_usage, refund, release, reserve
+from ..services.metrics import current_request, rate_limited, read_routing, route_template
+from ..services.rate_limit import get_limiter, parse_rate, retry_after_header
 
 bearer = HTTPBearer()
 
@@ -26,10 +33,123 @@ async def get_current_user(
     user = await get_user_by_id(session, user_id)
     if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or inactive")
+    track_user(session, user.id)
+    if (stats := current_request.get()) is not None:
+        stats.user_id = user.id
     return user
 
 
+async def get_read_db(
+    response: Response,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only routes: the replica when DATABASE_READ_URL is set.
+
+    Users who wrote within READ_AFTER_WRITE_SECONDS stay on the primary, so
+    they never read their own data from before a change the replica hasn't
+    replayed yet.
+
+    A replica-served body goes out without conditional_get's ETag: that
+    comes from the primary's user row, and if the replica lags more than
+    READ_AFTER_WRITE_SECONDS the client would keep an older body under the
+    current ETag, revalidated with 304s until the next write.
+    """
+    written_at = user.data_written_at
+    recent = written_at is not None and (
+        datetime.now(timezone.utc) - written_at
+    ).total_seconds() < get_settings().READ_AFTER_WRITE_SECONDS
+    if ReadSessionLocal is None or recent:
+        read_routing.inc("primary")
+        yield session
+        return
+    read_routing.inc("replica")
+    # Router dependencies (conditional_get) are solved before the route's own, so the header is set by now
+    if "etag" in response.headers:
+        del response.headers["etag"]
+    # The user lookup is done — hand the primary connection back for the rest of the request
+    await session.commit()
+    async with ReadSessionLocal() as read_session:
+        yield read_session
+
+
 async def get_admin_user(user: User = Depends(get_current_user)) -> User:
     if user.role != UserRole.admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
     return user
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    user: User = Depends(get_current_user),
+) -> None:
+    """Router dependency: answer GETs with 304 when the user's data hasn't changed.
+
+    Resolved before the endpoint body, so a match costs only the user lookup.
+    """
+    if request.method != "GET":
+        return
+    etag = weak_etag(user)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
+def rate_limit(limit: str, scope: str | None = None):
+    """Route dependency limiting each client IP to `limit` (e.g. "5/minute").
+
+    Buckets are per route unless several routes share a `scope`. List it
+    before dependencies that query, so rejected requests never reach the pool.
+    """
+    rate = parse_rate(limit)
+
+    async def check(request: Request) -> None:
+        limiter = get_limiter()
+        key = f"{scope or route_template(request.scope)}:{limiter.client_ip(request)}"
+        wait = await limiter.hit(key, rate)
+        if wait:
+            rate_limited.inc(route_template(request.scope))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded: {limit}",
+                headers={"Retry-After": retry_after_header(wait)},
+            )
+
+    return check
+
+
+def quota(kind: str):
+    """Route dependency for expensive routes: admission control, then the user's cost quota.
+
+    Overloaded queues answer 503, exhausted quotas 429, both with Retry-After.
+    The admission slot is held until the route returns; if it fails, the
+    charge is refunded and no usage is recorded.
+    """
+    cost = COSTS[kind]
+
+    async def record(user_id: uuid.UUID, rejected: str | None = None) -> None:
+        # Own session: the request's may be on the replica, and usage isn't diary data
+        async with AsyncSessionLocal() as session:
+            await record_usage(session, user_id, kind, cost.units, rejected)
+
+    async def check(user: User = Depends(get_current_user)) -> AsyncGenerator[None, None]:
+        if not reserve(cost.queue):
+            await record(user.id, "overload")
+            wait = get_settings().ADMISSION_RETRY_AFTER
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Server busy, try again shortly", headers={"Retry-After": retry_after_header(wait)})
+        try:
+            if wait := await charge(user.id, cost.units):
+                await record(user.id, "quota")
+                raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Usage quota exceeded", headers={"Retry-After": retry_after_header(wait)})
+            try:
+                yield
+            except Exception:
+                await refund(user.id, cost.units)
+                raise
+            await record(user.id)
+        finally:
+            release(cost.queue)
+
+    return check
@@ -3,7 +3,7 @@ from datetime import date
 from fastapi import APIRouter, HTTPException, Depends, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, extract
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import make_transient_to_detached, selectinload
 from ..database import get_db
 from ..models.user import User
 from ..models.profile import Tag
@@ -20,23 +20,38 @@ from ..schemas.entries import (
     GymEntryCreate, GymEntryUpdate, GymEntryOut,
     CalendarMonthOut, DayEntryCounts,
 )
-from .deps import get_current_user
+from ..services import usage_stats, user_cache
+from ..services.filters import tagged_with
+from ..services.bp_stats import refresh_daily_stats
+from ..services.bp_category import classify_bp
+from .deps import get_current_user, get_read_db
 
 router = APIRouter()
 
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
-async def _resolve_tags(session: AsyncSession, user_id: uuid.UUID, tag_ids: list[uuid.UUID]) -> list[Tag]:
+async def _resolve_tags(session: AsyncSession, user: User, tag_ids: list[uuid.UUID]) -> list[Tag]:
     if not tag_ids:
         return []
-    result = await session.execute(
-        select(Tag).where(Tag.user_id == user_id, Tag.id.in_(tag_ids))
-    )
-    tags = result.scalars().all()
+    cached = await user_cache.tags(session, user)
+    if cached is None:
+        result = await session.execute(
+            select(Tag).where(Tag.user_id == user.id, Tag.id.in_(tag_ids))
+        )
+        tags = list(result.scalars().all())
+    else:
+        by_id = {tag.id: tag for tag in cached}
+        found = {tag_id: by_id[tag_id] for tag_id in tag_ids if tag_id in by_id}
+        tags = []
+        for cached_tag in found.values():
+            # Attached as an already-loaded row, so linking it to the entry needs no SELECT
+            tag = Tag(**cached_tag.model_dump())
+            make_transient_to_detached(tag)
+            tags.append(await session.merge(tag, load=False))
     if len(tags) != len(tag_ids):
         raise HTTPException(status_code=400, detail="One or more tags not found")
-    return list(tags)
+    return tags
 
 
 # ── Blood Pressure ────────────────────────────────────────────────────────────
@@ -45,9 +60,10 @@ async def _resolve_tags(session: AsyncSession, user_id: uuid.UUID, tag_ids: list
 async def list_bp_entries(
     start_date: date | None = Query(default=None),
     end_date: date | None = Query(default=None),
+    tag_ids: list[uuid.UUID] | None = Query(default=None),
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=20, ge=1, le=100),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     q = select(BPEntry).options(
@@ -58,6 +74,8 @@ async def list_bp_entries(
         q = q.where(BPEntry.entry_date >= start_date)
     if end_date:
         q = q.where(BPEntry.entry_date <= end_date)
+    if tag_ids:
+        q = q.where(tagged_with(BPEntry, tag_ids))
     q = q.order_by(BPEntry.entry_date.desc()).offset((page - 1) * limit).limit(limit)
     result = await session.execute(q)
     return result.scalars().all()
@@ -69,7 +87,7 @@ async def create_bp_entry(
     session: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    tags = await _resolve_tags(session, user.id, body.tag_ids)
+    tags = await _resolve_tags(session, user, body.tag_ids)
     entry = BPEntry(user_id=user.id, entry_date=body.entry_date, notes=body.notes, tags=tags)
     session.add(entry)
     await session.flush()
@@ -81,8 +99,11 @@ async def create_bp_entry(
             pulse=r.pulse,
             recorded_at=r.recorded_at,
             order_index=i,
+            category=classify_bp(r.systolic, r.diastolic),
         )
         session.add(reading)
+    await session.flush()
+    await refresh_daily_stats(session, user.id, {entry.entry_date})
     await session.commit()
     result = await session.execute(
         select(BPEntry).options(selectinload(BPEntry.readings), selectinload(BPEntry.tags)).where(BPEntry.id == entry.id)
@@ -93,7 +114,7 @@ async def create_bp_entry(
 @router.get("/bp/{entry_id}", response_model=BPEntryOut)
 async def get_bp_entry(
     entry_id: uuid.UUID,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     result = await session.execute(
@@ -119,19 +140,24 @@ async def update_bp_entry(
     if not entry or entry.user_id != user.id:
         raise HTTPException(status_code=404, detail="Entry not found")
 
+    affected_days = {entry.entry_date}
     if body.entry_date is not None:
         entry.entry_date = body.entry_date
+        affected_days.add(body.entry_date)
     if body.notes is not None:
         entry.notes = body.notes
     if body.tag_ids is not None:
-        entry.tags = await _resolve_tags(session, user.id, body.tag_ids)
+        entry.tags = await _resolve_tags(session, user, body.tag_ids)
     if body.readings is not None:
         for old in entry.readings:
             await session.delete(old)
         await session.flush()
         for i, r in enumerate(body.readings):
-            session.add(BPReading(bp_entry_id=entry.id, systolic=r.systolic, diastolic=r.diastolic, pulse=r.pulse, recorded_at=r.recorded_at, order_index=i))
+            session.add(BPReading(bp_entry_id=entry.id, systolic=r.systolic, diastolic=r.diastolic, pulse=r.pulse, recorded_at=r.recorded_at, order_index=i, category=classify_bp(r.systolic, r.diastolic)))
 
+    if body.entry_date is not None or body.readings is not None:
+        await session.flush()
+        await refresh_daily_stats(session, user.id, affected_days)
     await session.commit()
     result = await session.execute(
         select(BPEntry).options(selectinload(BPEntry.readings), selectinload(BPEntry.tags)).where(BPEntry.id == entry.id)
@@ -149,6 +175,8 @@ async def delete_bp_entry(
     if not entry or entry.user_id != user.id:
         raise HTTPException(status_code=404, detail="Entry not found")
     await session.delete(entry)
+    await session.flush()
+    await refresh_daily_stats(session, user.id, {entry.entry_date})
     await session.commit()
 
 
@@ -158,9 +186,10 @@ async def delete_bp_entry(
 async def list_symptom_entries(
     start_date: date | None = Query(default=None),
     end_date: date | None = Query(default=None),
+    tag_ids: list[uuid.UUID] | None = Query(default=None),
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=20, ge=1, le=100),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     q = select(SymptomEntry).options(selectinload(SymptomEntry.tags)).where(SymptomEntry.user_id == user.id)
@@ -168,6 +197,8 @@ async def list_symptom_entries(
         q = q.where(SymptomEntry.entry_date >= start_date)
     if end_date:
         q = q.where(SymptomEntry.entry_date <= end_date)
+    if tag_ids:
+        q = q.where(tagged_with(SymptomEntry, tag_ids))
     q = q.order_by(SymptomEntry.entry_date.desc(), SymptomEntry.entry_time.desc()).offset((page - 1) * limit).limit(limit)
     result = await session.execute(q)
     return result.scalars().all()
@@ -179,7 +210,7 @@ async def create_symptom_entry(
     session: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    tags = await _resolve_tags(session, user.id, body.tag_ids)
+    tags = await _resolve_tags(session, user, body.tag_ids)
     entry = SymptomEntry(user_id=user.id, entry_date=body.entry_date, entry_time=body.entry_time, description=body.description, severity=body.severity, notes=body.notes, tags=tags)
     session.add(entry)
     await session.commit()
@@ -190,7 +221,7 @@ async def create_symptom_entry(
 
 
 @router.get("/symptom/{entry_id}", response_model=SymptomEntryOut)
-async def get_symptom_entry(entry_id: uuid.UUID, session: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def get_symptom_entry(entry_id: uuid.UUID, session: AsyncSession = Depends(get_read_db), user: User = Depends(get_current_user)):
     result = await session.execute(select(SymptomEntry).options(selectinload(SymptomEntry.tags)).where(SymptomEntry.id == entry_id))
     entry = result.scalar_one_or_none()
     if not entry or entry.user_id != user.id:
@@ -207,7 +238,7 @@ async def update_symptom_entry(entry_id: uuid.UUID, body: SymptomEntryUpdate, se
     for field, value in body.model_dump(exclude_unset=True, exclude={"tag_ids"}).items():
         setattr(entry, field, value)
     if body.tag_ids is not None:
-        entry.tags = await _resolve_tags(session, user.id, body.tag_ids)
+        entry.tags = await _resolve_tags(session, user, body.tag_ids)
     await session.commit()
     result = await session.execute(
         select(SymptomEntry).options(selectinload(SymptomEntry.tags)).where(SymptomEntry.id == entry.id)
@@ -230,9 +261,10 @@ async def delete_symptom_entry(entry_id: uuid.UUID, session: AsyncSession = Depe
 async def list_food_entries(
     start_date: date | None = Query(default=None),
     end_date: date | None = Query(default=None),
+    tag_ids: list[uuid.UUID] | None = Query(default=None),
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=20, ge=1, le=100),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     q = select(FoodEntry).options(selectinload(FoodEntry.tags)).where(FoodEntry.user_id == user.id)
@@ -240,6 +272,8 @@ async def list_food_entries(
         q = q.where(FoodEntry.entry_date >= start_date)
     if end_date:
         q = q.where(FoodEntry.entry_date <= end_date)
+    if tag_ids:
+        q = q.where(tagged_with(FoodEntry, tag_ids))
     q = q.order_by(FoodEntry.entry_date.desc(), FoodEntry.entry_time.desc()).offset((page - 1) * limit).limit(limit)
     result = await session.execute(q)
     return result.scalars().all()
@@ -247,10 +281,11 @@ async def list_food_entries(
 
 @router.post("/food", response_model=FoodEntryOut, status_code=status.HTTP_201_CREATED)
 async def create_food_entry(body: FoodEntryCreate, session: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
-    tags = await _resolve_tags(session, user.id, body.tag_ids)
+    tags = await _resolve_tags(session, user, body.tag_ids)
     data = body.model_dump(exclude={"tag_ids"})
     entry = FoodEntry(user_id=user.id, **data, tags=tags)
     session.add(entry)
+    await usage_stats.record_food(session, user.id, usage_stats.food_use(entry), 1)
     await session.commit()
     result = await session.execute(
         select(FoodEntry).options(selectinload(FoodEntry.tags)).where(FoodEntry.id == entry.id)
@@ -259,7 +294,7 @@ async def create_food_entry(body: FoodEntryCreate, session: AsyncSession = Depen
 
 
 @router.get("/food/{entry_id}", response_model=FoodEntryOut)
-async def get_food_entry(entry_id: uuid.UUID, session: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def get_food_entry(entry_id: uuid.UUID, session: AsyncSession = Depends(get_read_db), user: User = Depends(get_current_user)):
     result = await session.execute(select(FoodEntry).options(selectinload(FoodEntry.tags)).where(FoodEntry.id == entry_id))
     entry = result.scalar_one_or_none()
     if not entry or entry.user_id != user.id:
@@ -273,10 +308,14 @@ async def update_food_entry(entry_id: uuid.UUID, body: FoodEntryUpdate, session:
     entry = result.scalar_one_or_none()
     if not entry or entry.user_id != user.id:
         raise HTTPException(status_code=404, detail="Entry not found")
+    used = usage_stats.food_use(entry)
     for field, value in body.model_dump(exclude_unset=True, exclude={"tag_ids"}).items():
         setattr(entry, field, value)
     if body.tag_ids is not None:
-        entry.tags = await _resolve_tags(session, user.id, body.tag_ids)
+        entry.tags = await _resolve_tags(session, user, body.tag_ids)
+    if usage_stats.food_use(entry) != used:
+        await usage_stats.record_food(session, user.id, used, -1)
+        await usage_stats.record_food(session, user.id, usage_stats.food_use(entry), 1)
     await session.commit()
     result = await session.execute(
         select(FoodEntry).options(selectinload(FoodEntry.tags)).where(FoodEntry.id == entry.id)
@@ -289,6 +328,7 @@ async def delete_food_entry(entry_id: uuid.UUID, session: AsyncSession = Depends
     entry = await session.get(FoodEntry, entry_id)
     if not entry or entry.user_id != user.id:
         raise HTTPException(status_code=404, detail="Entry not found")
+    await usage_stats.record_food(session, user.id, usage_stats.food_use(entry), -1)
     await session.delete(entry)
     await session.commit()
 
@@ -299,9 +339,10 @@ async def delete_food_entry(entry_id: uuid.UUID, session: AsyncSession = Depends
 async def list_gym_entries(
     start_date: date | None = Query(default=None),
     end_date: date | None = Query(default=None),
+    tag_ids: list[uuid.UUID] | None = Query(default=None),
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=20, ge=1, le=100),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     q = select(GymEntry).options(selectinload(GymEntry.exercises), selectinload(GymEntry.tags)).where(GymEntry.user_id == user.id)
@@ -309,6 +350,8 @@ async def list_gym_entries(
         q = q.where(GymEntry.entry_date >= start_date)
     if end_date:
         q = q.where(GymEntry.entry_date <= end_date)
+    if tag_ids:
+        q = q.where(tagged_with(GymEntry, tag_ids))
     q = q.order_by(GymEntry.entry_date.desc()).offset((page - 1) * limit).limit(limit)
     result = await session.execute(q)
     return result.scalars().all()
@@ -316,19 +359,20 @@ async def list_gym_entries(
 
 @router.post("/gym", response_model=GymEntryOut, status_code=status.HTTP_201_CREATED)
 async def create_gym_entry(body: GymEntryCreate, session: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
-    tags = await _resolve_tags(session, user.id, body.tag_ids)
+    tags = await _resolve_tags(session, user, body.tag_ids)
     entry = GymEntry(user_id=user.id, entry_date=body.entry_date, session_notes=body.session_notes, tags=tags)
     session.add(entry)
     await session.flush()
     for i, ex in enumerate(body.exercises):
         session.add(GymExercise(gym_entry_id=entry.id, machine=ex.machine, duration_min=ex.duration_min, sets=ex.sets, reps=ex.reps, weight_kg=ex.weight_kg, order_index=i))
+    await usage_stats.record_exercises(session, user.id, entry.entry_date, [ex.machine for ex in body.exercises], 1)
     await session.commit()
     result = await session.execute(select(GymEntry).options(selectinload(GymEntry.exercises), selectinload(GymEntry.tags)).where(GymEntry.id == entry.id))
     return result.scalar_one()
 
 
 @router.get("/gym/{entry_id}", response_model=GymEntryOut)
-async def get_gym_entry(entry_id: uuid.UUID, session: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def get_gym_entry(entry_id: uuid.UUID, session: AsyncSession = Depends(get_read_db), user: User = Depends(get_current_user)):
     result = await session.execute(select(GymEntry).options(selectinload(GymEntry.exercises), selectinload(GymEntry.tags)).where(GymEntry.id == entry_id))
     entry = result.scalar_one_or_none()
     if not entry or entry.user_id != user.id:
@@ -342,18 +386,23 @@ async def update_gym_entry(entry_id: uuid.UUID, body: GymEntryUpdate, session: A
     entry = result.scalar_one_or_none()
     if not entry or entry.user_id != user.id:
         raise HTTPException(status_code=404, detail="Entry not found")
+    used = (entry.entry_date, sorted(ex.machine.lower() for ex in entry.exercises))
     if body.entry_date is not None:
         entry.entry_date = body.entry_date
     if body.session_notes is not None:
         entry.session_notes = body.session_notes
     if body.tag_ids is not None:
-        entry.tags = await _resolve_tags(session, user.id, body.tag_ids)
+        entry.tags = await _resolve_tags(session, user, body.tag_ids)
     if body.exercises is not None:
         for ex in entry.exercises:
             await session.delete(ex)
         await session.flush()
         for i, ex in enumerate(body.exercises):
             session.add(GymExercise(gym_entry_id=entry.id, machine=ex.machine, duration_min=ex.duration_min, sets=ex.sets, reps=ex.reps, weight_kg=ex.weight_kg, order_index=i))
+    machines = used[1] if body.exercises is None else sorted(ex.machine.lower() for ex in body.exercises)
+    if (entry.entry_date, machines) != used:
+        await usage_stats.record_exercises(session, user.id, *used, -1)
+        await usage_stats.record_exercises(session, user.id, entry.entry_date, machines, 1)
     await session.commit()
     result = await session.execute(select(GymEntry).options(selectinload(GymEntry.exercises), selectinload(GymEntry.tags)).where(GymEntry.id == entry.id))
     return result.scalar_one()
@@ -361,9 +410,11 @@ async def update_gym_entry(entry_id: uuid.UUID, body: GymEntryUpdate, session: A
 
 @router.delete("/gym/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_gym_entry(entry_id: uuid.UUID, session: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
-    entry = await session.get(GymEntry, entry_id)
+    result = await session.execute(select(GymEntry).options(selectinload(GymEntry.exercises)).where(GymEntry.id == entry_id))
+    entry = result.scalar_one_or_none()
     if not entry or entry.user_id != user.id:
         raise HTTPException(status_code=404, detail="Entry not found")
+    await usage_stats.record_exercises(session, user.id, entry.entry_date, [ex.machine for ex in entry.exercises], -1)
     await session.delete(entry)
     await session.commit()
 
@@ -374,7 +425,7 @@ async def delete_gym_entry(entry_id: uuid.UUID, session: AsyncSession = Depends(
 async def get_calendar(
     year: int,
     month: int,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     from datetime import date as date_type
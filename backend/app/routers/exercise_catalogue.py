@@ -6,7 +6,10 @@ from ..database import get_db
 from ..models.user import User
 from ..models.entries import ExerciseCatalogueItem
 from ..schemas.entries import ExerciseCatalogueItemCreate, ExerciseCatalogueItemOut
-from .deps import get_current_user
+from ..services import user_cache
+from ..services.catalogue import autocomplete_exercises
+from ..services.usage_stats import suggest_exercises
+from .deps import get_current_user, get_read_db
 
 router = APIRouter()
 
@@ -14,9 +17,16 @@ router = APIRouter()
 @router.get("", response_model=list[ExerciseCatalogueItemOut])
 async def list_exercise_catalogue(
     search: str | None = Query(default=None),
-    session: AsyncSession = Depends(get_db),
+    limit: int | None = Query(default=None, ge=1, le=50, description="Autocomplete: the best `limit` matches, ranked"),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
+    if limit is not None:
+        return await autocomplete_exercises(session, user, search or "", limit)
+    items = await user_cache.exercise_catalogue(session, user)
+    if items is not None:
+        needle = (search or "").lower()
+        return [item for item in items if needle in item.name.lower()]
     q = select(ExerciseCatalogueItem).where(ExerciseCatalogueItem.user_id == user.id)
     if search:
         q = q.where(ExerciseCatalogueItem.name.ilike(f"%{search}%"))
@@ -24,6 +34,16 @@ async def list_exercise_catalogue(
     return result.scalars().all()
 
 
+@router.get("/suggestions", response_model=list[ExerciseCatalogueItemOut])
+async def exercise_catalogue_suggestions(
+    limit: int = Query(default=8, ge=1, le=50),
+    session: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    """Quick-log: the exercises the user logs most, recent sessions counting most."""
+    return await suggest_exercises(session, user.id, limit)
+
+
 @router.post("", response_model=ExerciseCatalogueItemOut, status_code=status.HTTP_201_CREATED)
 async def create_exercise_catalogue_item(
     body: ExerciseCatalogueItemCreate,
@@ -1,19 +1,18 @@
 from fastapi import APIRouter, Depends
 from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..database import get_db
 from ..models.user import User
 from ..schemas.entries import ExportRequest
 from ..services.pdf import generate_pdf
-from .deps import get_current_user
+from .deps import get_current_user, get_read_db, quota
 
 router = APIRouter()
 
 
-@router.post("/pdf")
+@router.post("/pdf", dependencies=[Depends(quota("pdf_export"))])
 async def export_pdf(
     body: ExportRequest,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     pdf_bytes = await generate_pdf(
@@ -23,6 +22,7 @@ async def export_pdf(
         end_date=body.end_date,
         tag_ids=body.tag_ids,
         include_summary=body.include_summary,
+        include_bp_readings=body.include_bp_readings,
     )
     filename = f"medidiary-{body.start_date}-to-{body.end_date}.pdf"
     return Response(
@@ -12,14 +12,14 @@ from ..schemas.profile import (
     MedicationCreate, MedicationUpdate, MedicationOut,
     FullProfileOut,
 )
-from .deps import get_current_user
+from .deps import get_current_user, get_read_db
 
 router = APIRouter()
 
 
 @router.get("", response_model=FullProfileOut)
 async def get_profile(
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     identity_result = await session.execute(
@@ -79,7 +79,7 @@ async def add_body_metrics(
 
 @router.get("/diagnoses", response_model=list[DiagnosisOut])
 async def list_diagnoses(
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     result = await session.execute(select(Diagnosis).where(Diagnosis.user_id == user.id))
@@ -133,7 +133,7 @@ async def delete_diagnosis(
 
 @router.get("/medications", response_model=list[MedicationOut])
 async def list_medications(
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     result = await session.execute(select(Medication).where(Medication.user_id == user.id))
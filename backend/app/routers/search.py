@@ -0,0 +1,31 @@
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.user import User
+from ..schemas.search import SearchResultsOut, SearchType
+from ..services.search import InvalidCursor, search
+from .deps import get_current_user, get_read_db
+
+router = APIRouter()
+
+
+@router.get("", response_model=SearchResultsOut)
+async def search_diary(
+    q: str = Query(min_length=1, max_length=200),
+    type: list[SearchType] | None = Query(default=None),
+    sort: Literal["relevance", "recent"] = Query(default="relevance"),
+    limit: int = Query(default=20, ge=1, le=50),
+    cursor: str | None = Query(default=None),
+    session: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    """Full-text search across symptoms, food, BP and gym notes, and AI summaries.
+
+    `q` takes web-search syntax ("red wine", migraine OR headache, -coffee).
+    Pass the returned `next_cursor` back to fetch the following page.
+    """
+    try:
+        hits, next_cursor = await search(session, user.id, q, types=type, sort=sort, limit=limit, cursor=cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return SearchResultsOut(hits=hits, next_cursor=next_cursor)
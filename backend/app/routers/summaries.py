@@ -8,7 +8,7 @@ from ..models.user import User
 from ..models.entries import AISummary, SummaryType
 from ..schemas.entries import AISummaryOut
 from ..services.ai import generate_daily_summary, generate_weekly_summary
-from .deps import get_current_user
+from .deps import get_current_user, get_read_db, quota
 
 router = APIRouter()
 
@@ -27,7 +27,7 @@ def _iso_week_to_dates(iso_week: str) -> tuple[date, date]:
 @router.get("/daily/{target_date}", response_model=AISummaryOut | None)
 async def get_daily_summary(
     target_date: date,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     result = await session.execute(
@@ -40,7 +40,10 @@ async def get_daily_summary(
     return result.scalars().first()
 
 
-@router.post("/daily/{target_date}/generate", response_model=AISummaryOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/daily/{target_date}/generate", response_model=AISummaryOut, status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(quota("summary_daily"))],
+)
 async def generate_daily(
     target_date: date,
     session: AsyncSession = Depends(get_db),
@@ -63,7 +66,7 @@ async def generate_daily(
 @router.get("/weekly/{iso_week}", response_model=AISummaryOut | None)
 async def get_weekly_summary(
     iso_week: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     week_start, week_end = _iso_week_to_dates(iso_week)
@@ -77,7 +80,10 @@ async def get_weekly_summary(
     return result.scalars().first()
 
 
-@router.post("/weekly/{iso_week}/generate", response_model=AISummaryOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/weekly/{iso_week}/generate", response_model=AISummaryOut, status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(quota("summary_weekly"))],
+)
 async def generate_weekly(
     iso_week: str,
     session: AsyncSession = Depends(get_db),
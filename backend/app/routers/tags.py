@@ -6,16 +6,20 @@ from ..database import get_db
 from ..models.user import User
 from ..models.profile import Tag
 from ..schemas.profile import TagCreate, TagUpdate, TagOut
-from .deps import get_current_user
+from ..services import user_cache
+from .deps import get_current_user, get_read_db
 
 router = APIRouter()
 
 
 @router.get("", response_model=list[TagOut])
 async def list_tags(
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
+    tags = await user_cache.tags(session, user)
+    if tags is not None:
+        return tags
     result = await session.execute(select(Tag).where(Tag.user_id == user.id).order_by(Tag.name))
     return result.scalars().all()
 
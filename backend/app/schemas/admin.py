@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class SlowQueryOut(BaseModel):
+    recorded_at: datetime
+    duration_ms: float
+    method: str | None
+    route: str | None
+    user: str | None  # keyed hash of the user id
+    statement: str
+    params: list | dict
+    explain: str | None
+
+
+class RequestProfileOut(BaseModel):
+    id: str
+    recorded_at: datetime
+    method: str
+    path: str
+    status: int
+    duration_ms: float
+    samples: int
+
+
+class UsageOut(BaseModel):
+    user_id: uuid.UUID
+    email: str
+    kind: str
+    requests: int
+    cost: int
+    rejected: int
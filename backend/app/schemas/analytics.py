@@ -0,0 +1,64 @@
+import uuid
+from datetime import date, datetime
+from pydantic import BaseModel
+from ..models.entries import BPCategory
+
+
+class SeriesStats(BaseModel):
+    n: int
+    mean: float | None
+    median: float | None
+    sd: float | None
+    min: float | None
+    max: float | None
+
+
+class TimeOfDayStats(BaseModel):
+    n: int
+    systolic_mean: float | None
+    diastolic_mean: float | None
+
+
+class VariabilityStats(BaseModel):
+    sd: float | None
+    cv: float | None   # coefficient of variation, %
+    arv: float | None  # average real variability, mmHg
+
+
+class BPVariability(BaseModel):
+    systolic: VariabilityStats
+    diastolic: VariabilityStats
+
+
+class RollingPoint(BaseModel):
+    date: date
+    systolic_7d: float
+    diastolic_7d: float
+    systolic_30d: float
+    diastolic_30d: float
+
+
+class BPStatisticsOut(BaseModel):
+    start_date: date
+    end_date: date
+    n: int
+    systolic: SeriesStats
+    diastolic: SeriesStats
+    pulse: SeriesStats
+    pulse_pressure: SeriesStats
+    morning: TimeOfDayStats  # readings recorded 04:00–12:00 UTC
+    evening: TimeOfDayStats  # 16:00–24:00 UTC
+    categories: dict[str, int]
+    variability: BPVariability
+    rolling: list[RollingPoint]
+
+
+class ConcerningReadingOut(BaseModel):
+    id: uuid.UUID
+    bp_entry_id: uuid.UUID
+    entry_date: date
+    systolic: int
+    diastolic: int
+    pulse: int | None
+    recorded_at: datetime
+    category: BPCategory
@@ -1,19 +1,21 @@
 import uuid
 from datetime import datetime, date, time
 from pydantic import BaseModel, ConfigDict, field_validator
-from ..models.entries import MealType, CatalogueCategory, SummaryType
+from ..models.entries import MealType, CatalogueCategory, SummaryType, BPCategory
 from .profile import TagOut
 
 
 # ── Blood Pressure ──────────────────────────────────────────────────────────
 
-class BPReadingCreate(BaseModel):
+class BPReadingBase(BaseModel):
     systolic: int
     diastolic: int
     pulse: int | None = None
     recorded_at: datetime
     order_index: int = 0
 
+
+class BPReadingCreate(BPReadingBase):
     @field_validator("systolic")
     @classmethod
     def systolic_range(cls, v: int) -> int:
@@ -29,10 +31,12 @@ class BPReadingCreate(BaseModel):
         return v
 
 
-class BPReadingOut(BPReadingCreate):
+# Output models skip the input range validators — they run per reading on every list response
+class BPReadingOut(BPReadingBase):
     model_config = ConfigDict(from_attributes=True)
     id: uuid.UUID
     bp_entry_id: uuid.UUID
+    category: BPCategory
 
 
 class BPEntryCreate(BaseModel):
@@ -260,3 +264,4 @@ class ExportRequest(BaseModel):
     end_date: date
     tag_ids: list[uuid.UUID] = []
     include_summary: bool = False
+    include_bp_readings: bool = False  # full per-reading table for long ranges
@@ -0,0 +1,19 @@
+import uuid
+from datetime import date
+from typing import Literal
+from pydantic import BaseModel
+
+SearchType = Literal["symptom", "food", "bp", "gym", "summary"]
+
+
+class SearchHitOut(BaseModel):
+    type: SearchType
+    id: uuid.UUID
+    date: date
+    rank: float
+    snippet: str  # HTML-escaped text; matches wrapped in <mark>
+
+
+class SearchResultsOut(BaseModel):
+    hits: list[SearchHitOut]
+    next_cursor: str | None
@@ -2,9 +2,12 @@
 Startup seed script.
 Creates the initial admin user from environment variables if no users exist.
 Run after alembic upgrade head, before starting uvicorn.
+
+    python -m app.seed synthetic --users N --years Y   # bulk synthetic diaries, see app.synthetic
 """
 import asyncio
 import logging
+import sys
 from sqlalchemy import select
 from .database import AsyncSessionLocal
 from .models.user import User, UserRole
@@ -39,4 +42,8 @@ async def seed() -> None:
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    asyncio.run(seed())
+    if sys.argv[1:2] == ["synthetic"]:
+        from .synthetic import main
+        main(sys.argv[2:])
+    else:
+        asyncio.run(seed())
@@ -1,27 +1,58 @@
+import asyncio
+import time
 from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 import anthropic
-from ..config import get_settings
+from ..config import Settings, get_settings
 from ..models.entries import BPEntry, SymptomEntry, FoodEntry, GymEntry
 from ..models.profile import UserIdentityProfile, UserBodyMetrics, Diagnosis, Medication
-
-
-def _bp_category(systolic: int, diastolic: int) -> str:
-    if systolic > 180 or diastolic > 120:
-        return "Hypertensive Crisis"
-    if systolic >= 140 or diastolic >= 90:
-        return "High Stage 2"
-    if systolic >= 130 or diastolic >= 80:
-        return "High Stage 1"
-    if 120 <= systolic <= 129 and diastolic < 80:
-        return "Elevated"
-    if systolic < 90 and diastolic < 60:
-        return "Low (Hypotension)"
-    return "Normal"
-
-
+from .bp_stats import get_range_totals
+from .bp_category import BP_CATEGORY_LABELS
+from .metrics import ai_in_flight, ai_latency, ai_tokens, ai_errors
+from .tracing import tracer, traced
+from .ai_stub import StubClient
+
+
+def _get_client(settings: Settings) -> anthropic.Anthropic | StubClient:
+    if settings.AI_PROVIDER == "stub":
+        return StubClient(settings.AI_STUB_LATENCY_MS)
+    return anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+
+
+def _create_message(client: anthropic.Anthropic | StubClient, model: str, max_tokens: int, prompt: str) -> str:
+    """Single Anthropic call, recording latency and token usage."""
+    with tracer.start_as_current_span("ai.messages.create", attributes={"ai.model": model, "ai.prompt_chars": len(prompt)}) as span:
+        start = time.perf_counter()
+        try:
+            message = client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+            )
+        except anthropic.APIError:
+            ai_errors.inc(model)
+            raise
+        finally:
+            ai_latency.observe(time.perf_counter() - start, model)
+        ai_tokens.inc(model, "input", amount=message.usage.input_tokens)
+        ai_tokens.inc(model, "output", amount=message.usage.output_tokens)
+        span.set_attribute("ai.input_tokens", message.usage.input_tokens)
+        span.set_attribute("ai.output_tokens", message.usage.output_tokens)
+        return message.content[0].text
+
+
+async def _complete(client: anthropic.Anthropic | StubClient, model: str, max_tokens: int, prompt: str) -> str:
+    """Run the blocking client call on a worker thread so the event loop keeps serving."""
+    ai_in_flight.inc()
+    try:
+        return await asyncio.to_thread(_create_message, client, model, max_tokens, prompt)
+    finally:
+        ai_in_flight.dec()
+
+
+@traced("ai.daily_context")
 async def _get_daily_context(session: AsyncSession, user_id, target_date: date) -> str:
     lines = [f"Date: {target_date.isoformat()}"]
 
@@ -35,7 +66,7 @@ async def _get_daily_context(session: AsyncSession, user_id, target_date: date)
         lines.append("\n## Blood Pressure Readings")
         for entry in bp_entries:
             for r in entry.readings:
-                cat = _bp_category(r.systolic, r.diastolic)
+                cat = BP_CATEGORY_LABELS[r.category]
                 pulse_str = f", pulse {r.pulse} bpm" if r.pulse else ""
                 lines.append(f"- {r.recorded_at.strftime('%H:%M')}: {r.systolic}/{r.diastolic} mmHg{pulse_str} ({cat})")
             if entry.notes:
@@ -79,6 +110,7 @@ async def _get_daily_context(session: AsyncSession, user_id, target_date: date)
     return "\n".join(lines)
 
 
+@traced("ai.medical_context")
 async def _get_user_medical_context(session: AsyncSession, user_id) -> str:
     identity_result = await session.execute(
         select(UserIdentityProfile).where(UserIdentityProfile.user_id == user_id)
@@ -136,9 +168,10 @@ async def _get_user_medical_context(session: AsyncSession, user_id) -> str:
     return "\n".join(lines) if lines else "No profile information recorded."
 
 
+@traced("ai.daily_summary")
 async def generate_daily_summary(session: AsyncSession, user_id, target_date: date) -> str:
     settings = get_settings()
-    client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+    client = _get_client(settings)
 
     diary_context = await _get_daily_context(session, user_id, target_date)
     medical_context = await _get_user_medical_context(session, user_id)
@@ -160,20 +193,12 @@ Write a concise, professional daily summary suitable for sharing with a GP. Incl
 
 Tone: clinical but readable. Do not be alarmist. Be factual and specific."""
 
-    message = client.messages.create(
-        model="claude-sonnet-4-6",
-        max_tokens=1024,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return message.content[0].text
-
-
-async def generate_weekly_summary(session: AsyncSession, user_id, week_start: date, week_end: date) -> str:
-    settings = get_settings()
-    client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+    return await _complete(client, "claude-sonnet-4-6", 1024, prompt)
 
-    medical_context = await _get_user_medical_context(session, user_id)
 
+@traced("ai.weekly_context")
+async def _get_weekly_context(session: AsyncSession, user_id, week_start: date, week_end: date) -> tuple[list[str], list[str], list[str]]:
+    """BP, symptom and gym lines for the weekly prompt."""
     # Collect all BP readings for the week
     bp_lines = []
     bp_result = await session.execute(
@@ -185,10 +210,19 @@ async def generate_weekly_summary(session: AsyncSession, user_id, week_start: da
     )
     for entry in bp_result.scalars().all():
         for r in entry.readings:
-            cat = _bp_category(r.systolic, r.diastolic)
+            cat = BP_CATEGORY_LABELS[r.category]
             pulse_str = f", pulse {r.pulse} bpm" if r.pulse else ""
             bp_lines.append(f"{entry.entry_date} {r.recorded_at.strftime('%H:%M')}: {r.systolic}/{r.diastolic}{pulse_str} — {cat}")
 
+    totals = await get_range_totals(session, user_id, week_start, week_end)
+    if totals:
+        pulse_str = f", average pulse {totals['pulse_avg']:.0f} bpm" if totals["pulse_avg"] else ""
+        bp_lines.append(
+            f"Week overview: {totals['n']} readings over {totals['days']} day(s), "
+            f"average {totals['sys_avg']:.0f}/{totals['dia_avg']:.0f} mmHg "
+            f"(systolic {totals['sys_min']}–{totals['sys_max']}, diastolic {totals['dia_min']}–{totals['dia_max']}){pulse_str}"
+        )
+
     sym_result = await session.execute(
         select(SymptomEntry).where(
             SymptomEntry.user_id == user_id,
@@ -206,6 +240,16 @@ async def generate_weekly_summary(session: AsyncSession, user_id, week_start: da
         )
     )
     gym_lines = [f"{g.entry_date}: {len(g.exercises)} exercise(s)" for g in gym_result.scalars().all()]
+    return bp_lines, sym_lines, gym_lines
+
+
+@traced("ai.weekly_summary")
+async def generate_weekly_summary(session: AsyncSession, user_id, week_start: date, week_end: date) -> str:
+    settings = get_settings()
+    client = _get_client(settings)
+
+    medical_context = await _get_user_medical_context(session, user_id)
+    bp_lines, sym_lines, gym_lines = await _get_weekly_context(session, user_id, week_start, week_end)
 
     prompt = f"""You are a clinical GP assistant generating a weekly health summary for the week of {week_start.isoformat()} to {week_end.isoformat()}.
 
@@ -229,9 +273,4 @@ Write a structured weekly summary including:
 
 Format: clear sections with headings. Tone: clinical, professional, suitable for sharing with a doctor."""
 
-    message = client.messages.create(
-        model="claude-opus-4-6",
-        max_tokens=1500,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return message.content[0].text
+    return await _complete(client, "claude-opus-4-6", 1500, prompt)
@@ -0,0 +1,44 @@
+"""
+Offline stand-in for the Anthropic client (AI_PROVIDER=stub).
+
+Answers every messages.create call with canned markdown after a fixed
+delay, so load tests and local development exercise the summary and PDF
+paths without network access or API spend. Blocks the calling thread like
+the real synchronous client does.
+"""
+import time
+from types import SimpleNamespace
+
+STUB_SUMMARY = """## Blood pressure
+Readings were mostly in the **elevated** range, with higher values in the evening.
+
+| Period | Average | Readings |
+|---|---|---|
+| Morning | 128/82 | 7 |
+| Evening | 136/86 | 7 |
+
+## Symptoms
+Occasional mild headaches, resolved without medication.
+
+## Observations
+- No crisis-range readings recorded.
+- Worth discussing evening readings with a GP.
+"""
+
+
+class _Messages:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def create(self, *, model: str, max_tokens: int, messages: list[dict]):
+        time.sleep(self.latency)
+        prompt_chars = sum(len(m["content"]) for m in messages)
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="text", text=STUB_SUMMARY)],
+            usage=SimpleNamespace(input_tokens=prompt_chars // 4, output_tokens=len(STUB_SUMMARY) // 4),
+        )
+
+
+class StubClient:
+    def __init__(self, latency_ms: float) -> None:
+        self.messages = _Messages(latency_ms / 1000)
@@ -0,0 +1,188 @@
+import uuid
+from datetime import date
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, cast, extract, func, Integer
+from ..models.entries import BPEntry, BPReading, BPCategory
+from .bp_category import BP_CATEGORY_LABELS, HIGH_BP_CATEGORIES
+
+# Index order used by categorise(); labels come from the shared classifier table
+BP_CATEGORY_ORDER = [
+    BPCategory.normal, BPCategory.elevated, BPCategory.stage_1,
+    BPCategory.stage_2, BPCategory.crisis, BPCategory.low,
+]
+BP_CATEGORIES = [BP_CATEGORY_LABELS[c] for c in BP_CATEGORY_ORDER]
+
+# recorded_at hour windows used for the morning/evening split, [start, end).
+# Hours are UTC: users have no stored timezone, so a reading's local hour is unknown.
+MORNING_HOURS = (4, 12)
+EVENING_HOURS = (16, 24)
+
+ROLLING_WINDOWS = (7, 30)
+
+
+async def load_bp_arrays(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    start_date: date,
+    end_date: date,
+) -> np.ndarray:
+    """Fetch a user's readings in one query as a (5, n) float array.
+
+    Rows are: entry day (days since epoch), recorded_at hour in UTC,
+    systolic, diastolic, pulse (NaN when missing). Everything is computed in SQL as
+    plain numbers so conversion is a single np.array call.
+    """
+    result = await session.execute(
+        select(
+            cast(extract("epoch", BPEntry.entry_date) / 86400, Integer),
+            # Explicitly UTC, rather than whatever TimeZone the connection has
+            cast(extract("hour", func.timezone("UTC", BPReading.recorded_at)), Integer),
+            BPReading.systolic,
+            BPReading.diastolic,
+            BPReading.pulse,
+        )
+        .join(BPEntry, BPReading.bp_entry_id == BPEntry.id)
+        .where(
+            BPEntry.user_id == user_id,
+            BPEntry.entry_date >= start_date,
+            BPEntry.entry_date <= end_date,
+        )
+        .order_by(BPReading.recorded_at)
+    )
+    rows = result.all()
+    if not rows:
+        return np.empty((5, 0))
+    return np.array(rows, dtype=np.float64).T
+
+
+def categorise(systolic: np.ndarray, diastolic: np.ndarray) -> np.ndarray:
+    """Vectorised classify_bp — returns indices into BP_CATEGORY_ORDER."""
+    return np.select(
+        [
+            (systolic > 180) | (diastolic > 120),
+            (systolic >= 140) | (diastolic >= 90),
+            (systolic >= 130) | (diastolic >= 80),
+            (systolic >= 120) & (systolic <= 129) & (diastolic < 80),
+            (systolic < 90) & (diastolic < 60),
+        ],
+        [4, 3, 2, 1, 5],
+        default=0,
+    )
+
+
+def _summary(values: np.ndarray) -> dict:
+    values = values[~np.isnan(values)]
+    if not values.size:
+        return {"n": 0, "mean": None, "median": None, "sd": None, "min": None, "max": None}
+    return {
+        "n": int(values.size),
+        "mean": round(float(values.mean()), 1),
+        "median": round(float(np.median(values)), 1),
+        "sd": round(float(values.std(ddof=1)), 1) if values.size > 1 else 0.0,
+        "min": float(values.min()),
+        "max": float(values.max()),
+    }
+
+
+def _split(hours: np.ndarray, systolic: np.ndarray, diastolic: np.ndarray, window: tuple[int, int]) -> dict:
+    mask = (hours >= window[0]) & (hours < window[1])
+    n = int(mask.sum())
+    return {
+        "n": n,
+        "systolic_mean": round(float(systolic[mask].mean()), 1) if n else None,
+        "diastolic_mean": round(float(diastolic[mask].mean()), 1) if n else None,
+    }
+
+
+def _variability(values: np.ndarray) -> dict:
+    """SD, coefficient of variation and average real variability (mean |Δ| between successive readings)."""
+    if values.size < 2:
+        return {"sd": None, "cv": None, "arv": None}
+    sd = float(values.std(ddof=1))
+    return {
+        "sd": round(sd, 1),
+        "cv": round(sd / float(values.mean()) * 100, 1),
+        "arv": round(float(np.abs(np.diff(values)).mean()), 1),
+    }
+
+
+def _rolling_means(days: np.ndarray, values: np.ndarray, windows: tuple[int, ...]) -> tuple[np.ndarray, list[np.ndarray]]:
+    """Calendar-day rolling means, evaluated on each day that has readings.
+
+    Readings are bucketed per day with bincount, then each window is a
+    difference of prefix sums, so gaps in the diary are handled correctly.
+    """
+    offset = days - days.min()
+    span = int(offset.max()) + 1
+    sums = np.concatenate(([0.0], np.cumsum(np.bincount(offset, weights=values, minlength=span))))
+    counts = np.concatenate(([0], np.cumsum(np.bincount(offset, minlength=span))))
+    present = np.flatnonzero(np.diff(counts))
+    means = []
+    for w in windows:
+        lo = np.maximum(present + 1 - w, 0)
+        means.append((sums[present + 1] - sums[lo]) / (counts[present + 1] - counts[lo]))
+    return present + days.min(), means
+
+
+def compute_bp_statistics(data: np.ndarray) -> dict:
+    """All BP statistics for a (5, n) array from load_bp_arrays."""
+    days, hours, systolic, diastolic, pulse = data
+    n = int(systolic.size)
+    out = {
+        "n": n,
+        "systolic": _summary(systolic),
+        "diastolic": _summary(diastolic),
+        "pulse": _summary(pulse),
+        "pulse_pressure": _summary(systolic - diastolic),
+        "morning": _split(hours, systolic, diastolic, MORNING_HOURS),
+        "evening": _split(hours, systolic, diastolic, EVENING_HOURS),
+        "categories": dict.fromkeys(BP_CATEGORIES, 0),
+        "variability": {"systolic": _variability(systolic), "diastolic": _variability(diastolic)},
+        "rolling": [],
+    }
+    if not n:
+        return out
+
+    counts = np.bincount(categorise(systolic, diastolic), minlength=len(BP_CATEGORIES))
+    out["categories"] = {label: int(c) for label, c in zip(BP_CATEGORIES, counts)}
+
+    day_idx = days.astype(np.int64)
+    present, sys_means = _rolling_means(day_idx, systolic, ROLLING_WINDOWS)
+    _, dia_means = _rolling_means(day_idx, diastolic, ROLLING_WINDOWS)
+    columns = {}
+    for w, s, di in zip(ROLLING_WINDOWS, sys_means, dia_means):
+        columns[f"systolic_{w}d"] = np.round(s, 1).tolist()
+        columns[f"diastolic_{w}d"] = np.round(di, 1).tolist()
+    keys = ["date", *columns]
+    dates = present.astype("datetime64[D]").tolist()
+    out["rolling"] = [dict(zip(keys, row)) for row in zip(dates, *columns.values())]
+    return out
+
+
+async def get_bp_statistics(session: AsyncSession, user_id: uuid.UUID, start_date: date, end_date: date) -> dict:
+    data = await load_bp_arrays(session, user_id, start_date, end_date)
+    return compute_bp_statistics(data)
+
+
+async def get_concerning_readings(session: AsyncSession, user_id: uuid.UUID, start_date: date, end_date: date) -> list[dict]:
+    """Stage 2 / crisis readings in range, served by the partial index on bp_readings.category."""
+    result = await session.execute(
+        select(BPReading, BPEntry.entry_date)
+        .join(BPEntry, BPReading.bp_entry_id == BPEntry.id)
+        .where(
+            BPEntry.user_id == user_id,
+            BPEntry.entry_date >= start_date,
+            BPEntry.entry_date <= end_date,
+            BPReading.category.in_(HIGH_BP_CATEGORIES),
+        )
+        .order_by(BPReading.recorded_at)
+    )
+    return [
+        {
+            "id": r.id, "bp_entry_id": r.bp_entry_id, "entry_date": entry_date,
+            "systolic": r.systolic, "diastolic": r.diastolic, "pulse": r.pulse,
+            "recorded_at": r.recorded_at, "category": r.category,
+        }
+        for r, entry_date in result.all()
+    ]
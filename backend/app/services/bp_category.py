@@ -0,0 +1,39 @@
+from ..models.entries import BPCategory
+
+# Single source of truth for BP classification. Readings store the result
+# in bp_readings.category at write time; display code maps it to text here.
+
+BP_CATEGORY_LABELS = {
+    BPCategory.crisis: "Hypertensive Crisis",
+    BPCategory.stage_2: "High Stage 2",
+    BPCategory.stage_1: "High Stage 1",
+    BPCategory.elevated: "Elevated",
+    BPCategory.low: "Low (Hypotension)",
+    BPCategory.normal: "Normal",
+}
+
+BP_CATEGORY_COLOURS = {
+    BPCategory.crisis: "#7c3aed",
+    BPCategory.stage_2: "#dc2626",
+    BPCategory.stage_1: "#ea580c",
+    BPCategory.elevated: "#ca8a04",
+    BPCategory.low: "#2563eb",
+    BPCategory.normal: "#16a34a",
+}
+
+# Categories covered by the partial index on bp_readings.category
+HIGH_BP_CATEGORIES = (BPCategory.stage_2, BPCategory.crisis)
+
+
+def classify_bp(systolic: int, diastolic: int) -> BPCategory:
+    if systolic > 180 or diastolic > 120:
+        return BPCategory.crisis
+    if systolic >= 140 or diastolic >= 90:
+        return BPCategory.stage_2
+    if systolic >= 130 or diastolic >= 80:
+        return BPCategory.stage_1
+    if 120 <= systolic <= 129 and diastolic < 80:
+        return BPCategory.elevated
+    if systolic < 90 and diastolic < 60:
+        return BPCategory.low
+    return BPCategory.normal
@@ -0,0 +1,128 @@
+import uuid
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, exists, func, literal, String
+from sqlalchemy.dialects.postgresql import insert
+from ..models.entries import BPEntry, BPReading, BPDailyStats
+from .analytics import BP_CATEGORIES
+from .bp_category import BP_CATEGORY_LABELS
+
+_STAT_COLUMNS = [
+    "user_id", "day", "n",
+    "sys_sum", "sys_min", "sys_max",
+    "dia_sum", "dia_min", "dia_max",
+    "pulse_n", "pulse_sum", "category_counts",
+]
+
+
+def _aggregate_query(*where):
+    """One row per (user, entry_date) with the same columns as bp_daily_stats."""
+    category_counts = func.jsonb_build_object(*[
+        arg
+        for cat, label in BP_CATEGORY_LABELS.items()
+        for arg in (literal(label, String), func.count().filter(BPReading.category == cat))
+    ])
+    return (
+        select(
+            BPEntry.user_id,
+            BPEntry.entry_date,
+            func.count(),
+            func.sum(BPReading.systolic), func.min(BPReading.systolic), func.max(BPReading.systolic),
+            func.sum(BPReading.diastolic), func.min(BPReading.diastolic), func.max(BPReading.diastolic),
+            func.count(BPReading.pulse), func.coalesce(func.sum(BPReading.pulse), 0),
+            category_counts,
+        )
+        .join(BPEntry, BPReading.bp_entry_id == BPEntry.id)
+        .where(*where)
+        .group_by(BPEntry.user_id, BPEntry.entry_date)
+    )
+
+
+async def refresh_daily_stats(session: AsyncSession, user_id: uuid.UUID, days: set[date]) -> None:
+    """Rebuild bp_daily_stats for the given days from their current readings.
+
+    Call after flushing a BP write and before commit so the aggregates change
+    in the same transaction. Days left without readings lose their row.
+    """
+    if not days:
+        return
+    # Under READ COMMITTED the INSERT … SELECT below reads its snapshot before
+    # it can block on a concurrent writer's row, so two writers rebuilding the
+    # same day would each miss the other's readings. Taking the day's lock
+    # first means the later one starts only after the earlier commits.
+    for day in sorted(days):
+        await session.execute(select(func.pg_advisory_xact_lock(func.hashtextextended(f"bp_daily_stats:{user_id}:{day}", 0))))
+    stmt = insert(BPDailyStats).from_select(
+        _STAT_COLUMNS,
+        _aggregate_query(BPEntry.user_id == user_id, BPEntry.entry_date.in_(days)),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[BPDailyStats.user_id, BPDailyStats.day],
+        set_={col: stmt.excluded[col] for col in _STAT_COLUMNS[2:]},
+    )
+    await session.execute(stmt)
+    await session.execute(
+        delete(BPDailyStats).where(
+            BPDailyStats.user_id == user_id,
+            BPDailyStats.day.in_(days),
+            ~exists().where(
+                BPReading.bp_entry_id == BPEntry.id,
+                BPEntry.user_id == user_id,
+                BPEntry.entry_date == BPDailyStats.day,
+            ),
+        )
+    )
+
+
+async def backfill_daily_stats(session: AsyncSession, user_id: uuid.UUID | None = None) -> int:
+    """Rebuild bp_daily_stats from scratch for one user or everyone; returns rows written."""
+    where = [BPEntry.user_id == user_id] if user_id else []
+    await session.execute(
+        delete(BPDailyStats).where(BPDailyStats.user_id == user_id) if user_id else delete(BPDailyStats)
+    )
+    result = await session.execute(insert(BPDailyStats).from_select(_STAT_COLUMNS, _aggregate_query(*where)))
+    return result.rowcount
+
+
+async def build_daily_stats(session: AsyncSession, user_ids: list[uuid.UUID]) -> int:
+    """Insert bp_daily_stats for users that have no rows yet (freshly bulk-loaded); returns rows written."""
+    result = await session.execute(
+        insert(BPDailyStats).from_select(_STAT_COLUMNS, _aggregate_query(BPEntry.user_id.in_(user_ids)))
+    )
+    return result.rowcount
+
+
+async def get_daily_stats(session: AsyncSession, user_id: uuid.UUID, start_date: date, end_date: date) -> list[BPDailyStats]:
+    result = await session.execute(
+        select(BPDailyStats).where(
+            BPDailyStats.user_id == user_id,
+            BPDailyStats.day >= start_date,
+            BPDailyStats.day <= end_date,
+        ).order_by(BPDailyStats.day)
+    )
+    return list(result.scalars().all())
+
+
+async def get_range_totals(session: AsyncSession, user_id: uuid.UUID, start_date: date, end_date: date) -> dict | None:
+    """Range statistics summed from the daily rows — never touches bp_readings."""
+    rows = await get_daily_stats(session, user_id, start_date, end_date)
+    n = sum(r.n for r in rows)
+    if not n:
+        return None
+    pulse_n = sum(r.pulse_n for r in rows)
+    categories = dict.fromkeys(BP_CATEGORIES, 0)
+    for r in rows:
+        for label, count in r.category_counts.items():
+            categories[label] = categories.get(label, 0) + count
+    return {
+        "n": n,
+        "days": len(rows),
+        "sys_avg": sum(r.sys_sum for r in rows) / n,
+        "dia_avg": sum(r.dia_sum for r in rows) / n,
+        "sys_min": min(r.sys_min for r in rows),
+        "sys_max": max(r.sys_max for r in rows),
+        "dia_min": min(r.dia_min for r in rows),
+        "dia_max": max(r.dia_max for r in rows),
+        "pulse_avg": sum(r.pulse_sum for r in rows) / pulse_n if pulse_n else None,
+        "categories": categories,
+    }
@@ -0,0 +1,205 @@
+"""
+Ranked autocomplete for the food and exercise catalogues.
+
+A query only ever scores a small candidate set, so its cost doesn't grow
+with the size of the catalogue:
+
+  prefix        names starting with the term, a range scan on
+                ix_<table>_user_name (first POOL by name)
+  similar       for terms of 3+ characters, names containing the term or,
+                when pg_trgm is installed, trigram-similar to it ("brocoli"
+                finds "Broccoli"), via ix_<table>_name_trgm (best POOL)
+  used          matching items among the POOL the user logged most in
+                the last year
+
+Candidates are then scored by
+
+  prefix match  1.0 for a name prefix, 0.6 for a word prefix
+  similarity    pg_trgm similarity(name, term), 0–1
+  usage         0.1 × ln(1 + uses in the last year)
+
+and the top `limit` returned. With no term, the most-used items come first.
+
+Catalogues small enough for services.user_cache are ranked in Python
+instead, over the cached items and usage counts, matching and scoring the
+same way, so a keystroke costs no query at all.
+"""
+import math
+import re
+import uuid
+from datetime import date, timedelta
+from sqlalchemy import case, func, literal, or_, select, text, true, union
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.entries import CatalogueCategory, ExerciseCatalogueItem, FoodCatalogueItem, FoodEntry, GymEntry, GymExercise
+from ..models.user import User
+from . import user_cache
+
+USAGE_WINDOW_DAYS = 365
+POOL = 50
+TRGM_THRESHOLD = 0.3  # pg_trgm.similarity_threshold's default, which `%` uses
+
+_has_trgm: bool | None = None
+
+
+async def _trgm_available(session: AsyncSession) -> bool:
+    """Whether pg_trgm is installed (checked once per process); without it, matching is substring-only."""
+    global _has_trgm
+    if _has_trgm is None:
+        _has_trgm = bool(await session.scalar(text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")))
+    return _has_trgm
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def _autocomplete(session: AsyncSession, model, user_id: uuid.UUID, uses, usage_key, term: str, limit: int, *filters):
+    """Top `limit` of the user's `model` items for `term`; `uses` is a (key, uses) CTE joined on `usage_key`."""
+    trgm = await _trgm_available(session)
+    # How large a user's catalogue is only shows in the parameter values, and
+    # a generic plan (used after a statement's fifth run) assumes the average
+    await session.execute(text("SET LOCAL plan_cache_mode = force_custom_plan"))
+    name = func.lower(model.name).collate("C")  # as indexed: byte order, so a prefix is a range
+    owned = (model.user_id == user_id, *filters)
+    term = term.strip().lower()
+    score = 0.1 * func.ln(1 + func.coalesce(uses.c.uses, 0))
+
+    # Capped so the planner reaches items by key rather than scanning the catalogue
+    top_used = select(uses.c.key).order_by(uses.c.uses.desc()).limit(POOL).subquery()
+    used = select(model.id).join(top_used, top_used.c.key == usage_key).where(*owned)
+    if term:
+        pattern = _escape_like(term)
+        pools = [
+            select(model.id).where(*owned, name.like(f"{pattern}%")).order_by(name).limit(POOL),
+            used.where(name.like(f"%{pattern}%")),
+        ]
+        if len(term) >= 3:
+            contains = name.like(f"%{pattern}%")
+            if trgm:
+                pools.append(
+                    select(model.id).where(*owned, or_(contains, model.name.op("%")(term)))
+                    .order_by(func.similarity(model.name, term).desc()).limit(POOL)
+                )
+            else:
+                pools.append(select(model.id).where(*owned, contains).limit(POOL))
+        score = score + case(
+            (name.like(f"{pattern}%"), 1.0),
+            (name.like(f"% {pattern}%"), 0.6),
+            else_=literal(0.0),
+        )
+        if trgm:
+            score = score + func.similarity(model.name, term)
+    else:
+        pools = [used, select(model.id).where(*owned).order_by(name).limit(POOL)]
+
+    candidates = union(*pools).subquery("candidates")
+    result = await session.execute(
+        select(model)
+        .join(candidates, candidates.c.id == model.id)
+        .outerjoin(uses, uses.c.key == usage_key)
+        .order_by(score.desc(), model.name)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+def _food_uses(user_id: uuid.UUID):
+    # Index-only off ix_food_entries_user_catalogue_item
+    since = date.today() - timedelta(days=USAGE_WINDOW_DAYS)
+    return (
+        select(FoodEntry.catalogue_item_id.label("key"), func.count().label("uses"))
+        .where(FoodEntry.user_id == user_id, FoodEntry.catalogue_item_id.is_not(None), FoodEntry.entry_date >= since)
+        .group_by(FoodEntry.catalogue_item_id)
+    )
+
+
+def _exercise_uses(user_id: uuid.UUID):
+    # Gym exercises store the machine name, not a catalogue id, so usage is grouped by name
+    since = date.today() - timedelta(days=USAGE_WINDOW_DAYS)
+    key = func.lower(GymExercise.machine)
+    return (
+        select(key.label("key"), func.count().label("uses"))
+        .join(GymEntry, GymEntry.id == GymExercise.gym_entry_id)
+        .where(GymEntry.user_id == user_id, GymEntry.entry_date >= since)
+        .group_by(key)
+    )
+
+
+async def _cached_uses(session: AsyncSession, user: User, kind: str, query) -> dict:
+    async def load():
+        # The version is read in the same statement, i.e. the same snapshot (see services.user_cache)
+        uses = query.subquery()
+        rows = (await session.execute(
+            select(User.data_version, uses.c.key, uses.c.uses)
+            .select_from(User)
+            .outerjoin(uses, true())
+            .where(User.id == user.id)
+        )).all()
+        return rows[0][0], {key: n for _, key, n in rows if key is not None}
+
+    # Any write may log a use, so these follow data_version rather than catalogue_version
+    return await user_cache.cached(user.id, kind, user.data_version, load)
+
+
+def _trigrams(value: str) -> set[str]:
+    # As pg_trgm: lower-cased alphanumeric words, each padded with two spaces before and one after
+    grams = set()
+    for word in re.findall(r"[^\W_]+", value.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _similarity(a: str, b: str) -> float:
+    ga, gb = _trigrams(a), _trigrams(b)
+    return len(ga & gb) / len(ga | gb) if ga and gb else 0.0
+
+
+def _rank(items, uses: dict, key, term: str, limit: int, trgm: bool) -> list:
+    """_autocomplete over already-loaded `items` (in name order): same matching, same scores."""
+    term = term.strip().lower()
+    top_used = set(sorted(uses, key=uses.get, reverse=True)[:POOL])
+    scored = []
+    for position, item in enumerate(items):
+        name = item.name.lower()
+        item_key = key(item)
+        score = 0.1 * math.log(1 + uses.get(item_key, 0))
+        if term:
+            contains = term in name
+            similarity = _similarity(item.name, term) if trgm else 0.0
+            matched = (
+                name.startswith(term)
+                or (contains and item_key in top_used)
+                or (len(term) >= 3 and (contains or similarity >= TRGM_THRESHOLD))
+            )
+            if not matched:
+                continue
+            score += (1.0 if name.startswith(term) else 0.6 if f" {term}" in name else 0.0) + similarity
+        scored.append((-score, position, item))
+    return [item for *_, item in sorted(scored)[:limit]]
+
+
+async def autocomplete_food(
+    session: AsyncSession, user: User, term: str, limit: int, category: CatalogueCategory | None = None,
+) -> list:
+    items = await user_cache.food_catalogue(session, user)
+    if items is not None:
+        if category:
+            items = [item for item in items if item.category == category]
+        uses = await _cached_uses(session, user, "food_uses", _food_uses(user.id))
+        return _rank(items, uses, lambda item: item.id, term, limit, await _trgm_available(session))
+    filters = [FoodCatalogueItem.category == category] if category else []
+    return await _autocomplete(
+        session, FoodCatalogueItem, user.id, _food_uses(user.id).cte("uses"), FoodCatalogueItem.id, term, limit, *filters,
+    )
+
+
+async def autocomplete_exercises(session: AsyncSession, user: User, term: str, limit: int) -> list:
+    items = await user_cache.exercise_catalogue(session, user)
+    if items is not None:
+        uses = await _cached_uses(session, user, "exercise_uses", _exercise_uses(user.id))
+        return _rank(items, uses, lambda item: item.name.lower(), term, limit, await _trgm_available(session))
+    return await _autocomplete(
+        session, ExerciseCatalogueItem, user.id, _exercise_uses(user.id).cte("uses"),
+        func.lower(ExerciseCatalogueItem.name), term, limit,
+    )
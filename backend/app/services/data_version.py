@@ -0,0 +1,69 @@
+"""
+Per-user data version used for conditional GETs.
+
+get_current_user records the acting user on the request's session. Any
+flush that writes rows, or INSERT/UPDATE/DELETE run through
+session.execute() (which no flush sees), marks the session, and the user's
+users.data_version is bumped just before commit — inside the same
+transaction as the write, so a version is never visible without its data.
+users.data_written_at is stamped alongside and drives read-replica
+stickiness (routers.deps.get_read_db). When the write touched tags or
+catalogue items, users.catalogue_version is bumped too; it validates the
+per-user cache of those sets (services.user_cache).
+"""
+import uuid
+from datetime import date
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.user import User
+
+_USER_KEY = "data_version_user_id"
+_WROTE_KEY = "data_version_wrote"
+_CATALOGUE_KEY = "data_version_catalogue"
+_CATALOGUE_TABLES = {"tags", "food_catalogue_items", "exercise_catalogue_items"}
+
+
+def track_user(session: AsyncSession, user_id: uuid.UUID) -> None:
+    session.info[_USER_KEY] = user_id
+
+
+def weak_etag(user: User) -> str:
+    # The date keeps "today"-relative defaults (e.g. analytics ranges) from
+    # being served stale across midnight.
+    return f'W/"{user.id.hex}.{user.data_version}.{date.today().isoformat()}"'
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_write(session: Session, flush_context) -> None:
+    if session.new or session.dirty or session.deleted:
+        session.info[_WROTE_KEY] = True
+        if any(getattr(obj, "__tablename__", None) in _CATALOGUE_TABLES for obj in (*session.new, *session.dirty, *session.deleted)):
+            session.info[_CATALOGUE_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(state) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_WROTE_KEY] = True
+        if getattr(getattr(state.statement, "table", None), "name", None) in _CATALOGUE_TABLES:
+            state.session.info[_CATALOGUE_KEY] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_version(session: Session) -> None:
+    # commit() flushes pending changes only after this hook, so do it here
+    session.flush()
+    catalogue = session.info.pop(_CATALOGUE_KEY, False)
+    if session.info.pop(_WROTE_KEY, False) and _USER_KEY in session.info:
+        bump = ", catalogue_version = catalogue_version + 1" if catalogue else ""
+        session.execute(
+            text(f"UPDATE users SET data_version = data_version + 1, data_written_at = now(){bump} WHERE id = :id"),
+            {"id": session.info[_USER_KEY]},
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_write(session: Session) -> None:
+    session.info.pop(_WROTE_KEY, None)
+    session.info.pop(_CATALOGUE_KEY, None)
@@ -0,0 +1,25 @@
+import uuid
+from sqlalchemy import exists
+from sqlalchemy.sql.elements import ColumnElement
+from ..models.entries import (
+    BPEntry, SymptomEntry, FoodEntry, GymEntry,
+    bp_entry_tags, symptom_entry_tags, food_entry_tags, gym_entry_tags,
+)
+
+# entry model → (association table, column pointing back at the entry)
+_TAG_LINKS = {
+    BPEntry: (bp_entry_tags, bp_entry_tags.c.bp_entry_id),
+    SymptomEntry: (symptom_entry_tags, symptom_entry_tags.c.symptom_entry_id),
+    FoodEntry: (food_entry_tags, food_entry_tags.c.food_entry_id),
+    GymEntry: (gym_entry_tags, gym_entry_tags.c.gym_entry_id),
+}
+
+
+def tagged_with(model, tag_ids: list[uuid.UUID]) -> ColumnElement[bool]:
+    """EXISTS semi-join matching entries carrying any of the given tags.
+
+    Only the association table is consulted (backed by its tag_id index), so
+    neither the tags table nor the entries' tag collections are loaded.
+    """
+    table, entry_col = _TAG_LINKS[model]
+    return exists().where(entry_col == model.id, table.c.tag_id.in_(tag_ids))
@@ -0,0 +1,236 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+A deliberately small registry (counters, histograms, callback gauges) so
+/metrics needs no client library or sidecar. Values are per process.
+Requests are timed by MetricsMiddleware; statements are counted by the
+engine hooks installed with instrument_engine(). Updates take a lock,
+since some come from worker threads (AI calls, PDF renders).
+"""
+import threading
+import time
+import uuid
+from collections import Counter as StatementCounter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+SLOW_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+_REGISTRY: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        return "\n".join([f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self.samples()])
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> list[str]:
+        return [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+        # labels → [count per bucket (non-cumulative, +Inf last), sum]
+        self._values: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = next((i for i, b in enumerate(self.buckets) if value <= b), len(self.buckets))
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][i] += 1
+            state[1] += value
+
+    def samples(self) -> list[str]:
+        lines = []
+        for labels, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(bound)
+                bucket_labels = _labels(self.labelnames, labels, 'le="%s"' % le)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Either set directly or read at scrape time from callbacks (one per label set)."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._callbacks: dict[tuple[str, ...], Callable[[], float]] = {}
+        self._value = 0.0
+
+    def track(self, callback: Callable[[], float], *labels: str) -> None:
+        self._callbacks[labels] = callback
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def value(self, *labels: str) -> float:
+        callback = self._callbacks.get(labels)
+        return callback() if callback else self._value
+
+    def samples(self) -> list[str]:
+        if not self._callbacks:
+            return [f"{self.name} {_number(self._value)}"]
+        return [f"{self.name}{_labels(self.labelnames, k)} {_number(fn())}" for k, fn in sorted(self._callbacks.items())]
+
+
+def render() -> str:
+    return "\n".join(m.render() for m in _REGISTRY) + "\n"
+
+
+# ── Metric definitions ──────────────────────────────────────────────────────
+
+http_requests = Counter("http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"))
+http_latency = Histogram("http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+http_db_queries = Histogram("http_request_db_queries", "SQL statements issued per request.", ("route",), QUERY_COUNT_BUCKETS)
+http_db_time = Histogram("http_request_db_seconds", "Time spent in SQL statements per request.", ("route",))
+single_flight = Counter(
+    "http_single_flight_total", "Coalescable GETs that ran the route (leader) or shared a concurrent identical one (follower).",
+    ("route", "role"),
+)
+http_no_db = Counter("http_requests_without_db_total", "Requests that finished without checking out a DB connection.", ("method", "route"))
+
+db_queries = Counter("db_queries_total", "SQL statements executed.")
+db_query_time = Counter("db_query_seconds_total", "Cumulative time spent executing SQL statements.")
+read_routing = Counter("db_read_routing_total", "Read-only route requests by the engine that served them.", ("engine",))
+user_cache = Counter("user_cache_lookups_total", "Per-user tag/catalogue cache lookups (services.user_cache).", ("kind", "result"))
+
+ai_latency = Histogram("ai_request_duration_seconds", "Anthropic API call latency.", ("model",), SLOW_BUCKETS)
+ai_tokens = Counter("ai_tokens_total", "Anthropic API tokens used.", ("model", "direction"))
+ai_errors = Counter("ai_request_errors_total", "Failed Anthropic API calls.", ("model",))
+ai_in_flight = Gauge("ai_requests_in_flight", "Anthropic API calls currently running.")
+
+pdf_queue_depth = Gauge("pdf_render_queue_depth", "PDF renders handed to the executor and not yet finished (waiting or running).")
+pdf_rendering = Gauge("pdf_renders_in_progress", "PDF renders currently running.")
+pdf_render_time = Histogram("pdf_render_duration_seconds", "WeasyPrint render time.", buckets=SLOW_BUCKETS)
+
+rate_limited = Counter("rate_limit_rejections_total", "Requests rejected by the rate limiter.", ("route",))
+quota_usage = Counter("quota_usage_total", "Cost units charged to per-user quotas.", ("kind",))
+admission_slots = Gauge("admission_slots_in_use", "Expensive requests admitted and not yet finished, per queue (services.quotas).", ("queue",))
+quota_rejections = Counter("quota_rejections_total", "Expensive requests refused, by reason (quota or overload).", ("kind", "reason"))
+
+db_pool_size = Gauge("db_pool_size", "Configured connection pool size.", ("pool",))
+db_pool_checked_out = Gauge("db_pool_checked_out", "Connections currently checked out of the pool.", ("pool",))
+db_pool_overflow = Gauge("db_pool_overflow", "Connections open beyond pool_size (negative while the pool is not full).", ("pool",))
+db_pool_idle = Gauge("db_pool_idle", "Idle connections held in the pool.", ("pool",))
+
+
+# ── Per-request DB accounting ───────────────────────────────────────────────
+
+@dataclass
+class RequestStats:
+    scope: dict = field(default_factory=dict, repr=False)
+    route: str = ""
+    user_id: uuid.UUID | None = None  # set by get_current_user
+    queries: int = 0
+    checkouts: int = 0
+    db_time: float = 0.0
+    # SQL text → executions, for spotting N+1 patterns
+    statements: StatementCounter = field(default_factory=StatementCounter)
+
+
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+def instrument_engine(engine: Engine, pool_name: str = "primary") -> None:
+    """Count and time every statement; attribute it to the current request, if any."""
+    pool = engine.pool
+    db_pool_size.track(pool.size, pool_name)
+    db_pool_checked_out.track(pool.checkedout, pool_name)
+    db_pool_overflow.track(pool.overflow, pool_name)
+    db_pool_idle.track(pool.checkedin, pool_name)
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        stats = current_request.get()
+        if stats is not None:
+            stats.checkouts += 1
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        db_queries.inc()
+        db_query_time.inc(amount=elapsed)
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += elapsed
+            stats.statements[statement] += 1
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(exception_context):
+        starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+        if starts:
+            starts.pop()
+
+
+def route_template(scope) -> str:
+    """Matched route path (e.g. /api/v1/entries/bp/{entry_id}) — bounded label cardinality."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
@@ -1,14 +1,21 @@
 import asyncio
 import re
+import time
+import uuid
 from datetime import date
 from html import escape
 from weasyprint import HTML
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from ..models.entries import BPEntry, SymptomEntry, FoodEntry, GymEntry, AISummary, SummaryType
+from ..models.entries import BPEntry, BPDailyStats, BPCategory, SymptomEntry, FoodEntry, GymEntry, AISummary, SummaryType
 from ..models.user import User
 from ..models.profile import UserIdentityProfile
+from .filters import tagged_with
+from .bp_stats import get_daily_stats
+from .bp_category import BP_CATEGORY_LABELS, BP_CATEGORY_COLOURS, classify_bp
+from .metrics import pdf_queue_depth, pdf_rendering, pdf_render_time
+from .tracing import tracer, traced
 
 
 def _inline(text: str) -> str:
@@ -90,21 +97,121 @@ def _markdown_to_html(md: str) -> str:
     return '\n'.join(out)
 
 
-def _bp_category_colour(systolic: int, diastolic: int) -> tuple[str, str]:
-    """Returns (label, hex_colour) for a BP reading."""
-    if systolic > 180 or diastolic > 120:
-        return "Hypertensive Crisis", "#7c3aed"
-    if systolic >= 140 or diastolic >= 90:
-        return "High Stage 2", "#dc2626"
-    if systolic >= 130 or diastolic >= 80:
-        return "High Stage 1", "#ea580c"
-    if 120 <= systolic <= 129 and diastolic < 80:
-        return "Elevated", "#ca8a04"
-    if systolic < 90 and diastolic < 60:
-        return "Low", "#2563eb"
-    return "Normal", "#16a34a"
+# Ranges longer than this are charted and tabulated per day rather than per reading
+DAILY_AGGREGATE_AFTER_DAYS = 14
 
+# Systolic bands drawn behind the trend chart: (lower bound, upper bound, colour)
+_CHART_BANDS = [
+    (0, 120, BP_CATEGORY_COLOURS[BPCategory.normal]),
+    (120, 130, BP_CATEGORY_COLOURS[BPCategory.elevated]),
+    (130, 140, BP_CATEGORY_COLOURS[BPCategory.stage_1]),
+    (140, 180, BP_CATEGORY_COLOURS[BPCategory.stage_2]),
+    (180, 400, BP_CATEGORY_COLOURS[BPCategory.crisis]),
+]
 
+
+def _bp_daily_aggregates(bp_entries: list) -> list[dict]:
+    """Collapse readings into one row per entry date (entries arrive date-ordered)."""
+    days: dict[date, dict] = {}
+    for entry in bp_entries:
+        for r in entry.readings:
+            day = days.setdefault(entry.entry_date, {
+                "date": entry.entry_date, "n": 0, "sys": [], "dia": [], "pulse": [],
+            })
+            day["n"] += 1
+            day["sys"].append(r.systolic)
+            day["dia"].append(r.diastolic)
+            if r.pulse:
+                day["pulse"].append(r.pulse)
+    out = []
+    for day in days.values():
+        out.append({
+            "date": day["date"],
+            "n": day["n"],
+            "sys_avg": sum(day["sys"]) / day["n"],
+            "dia_avg": sum(day["dia"]) / day["n"],
+            "sys_min": min(day["sys"]), "sys_max": max(day["sys"]),
+            "dia_min": min(day["dia"]), "dia_max": max(day["dia"]),
+            "pulse_avg": sum(day["pulse"]) / len(day["pulse"]) if day["pulse"] else None,
+        })
+    return out
+
+
+def _daily_row(stats: BPDailyStats) -> dict:
+    """A bp_daily_stats row in the shape returned by _bp_daily_aggregates."""
+    return {
+        "date": stats.day,
+        "n": stats.n,
+        "sys_avg": stats.sys_sum / stats.n,
+        "dia_avg": stats.dia_sum / stats.n,
+        "sys_min": stats.sys_min, "sys_max": stats.sys_max,
+        "dia_min": stats.dia_min, "dia_max": stats.dia_max,
+        "pulse_avg": stats.pulse_sum / stats.pulse_n if stats.pulse_n else None,
+    }
+
+
+def _bp_series(bp_entries: list, daily: list[dict] | None) -> list[tuple[float, float, float, float | None]]:
+    """(x, systolic, diastolic, pulse) points — one per reading, or one per day if aggregated."""
+    if daily is not None:
+        return [(d["date"].toordinal(), d["sys_avg"], d["dia_avg"], d["pulse_avg"]) for d in daily]
+    points = [
+        (r.recorded_at.timestamp() / 86400, r.systolic, r.diastolic, r.pulse)
+        for entry in bp_entries for r in entry.readings
+    ]
+    points.sort(key=lambda p: p[0])
+    return points
+
+
+def _bp_chart_svg(points: list[tuple[float, float, float, float | None]], first: date, last: date) -> str:
+    """Render the BP series as a compact inline SVG with systolic category bands ("" with nothing to plot)."""
+    width, height = 700, 220
+    left, right, top, bottom = 36, 10, 10, 22
+    plot_w, plot_h = width - left - right, height - top - bottom
+
+    values = [v for p in points for v in (p[1], p[2], p[3]) if v]
+    if not values:
+        return ""
+    y_lo = min(40, min(values) - 10)
+    y_hi = max(200, max(values) + 10)
+    x_lo, x_hi = points[0][0], points[-1][0]
+    x_span = (x_hi - x_lo) or 1
+
+    def x(v: float) -> float:
+        return left + (v - x_lo) / x_span * plot_w if x_hi != x_lo else left + plot_w / 2
+
+    def y(v: float) -> float:
+        return top + (y_hi - v) / (y_hi - y_lo) * plot_h
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" class="bp-chart">']
+    for lo, hi, colour in _CHART_BANDS:
+        lo, hi = max(lo, y_lo), min(hi, y_hi)
+        if lo < hi:
+            parts.append(f'<rect x="{left}" y="{y(hi):.1f}" width="{plot_w}" height="{y(lo) - y(hi):.1f}" fill="{colour}" fill-opacity="0.08"/>')
+    for tick in range(int(y_lo // 20 + 1) * 20, int(y_hi) + 1, 20):
+        parts.append(f'<line x1="{left}" x2="{left + plot_w}" y1="{y(tick):.1f}" y2="{y(tick):.1f}" stroke="#e5e7eb" stroke-width="0.5"/>')
+        parts.append(f'<text x="{left - 4}" y="{y(tick) + 3:.1f}" font-size="8" text-anchor="end" fill="#6b7280">{tick}</text>')
+
+    series = [(1, "#4f46e5", ""), (2, "#0891b2", ""), (3, "#6b7280", ' stroke-dasharray="3,2"')]
+    for idx, colour, dash in series:
+        coords = " ".join(f"{x(p[0]):.1f},{y(p[idx]):.1f}" for p in points if p[idx])
+        if coords:
+            parts.append(f'<polyline points="{coords}" fill="none" stroke="{colour}" stroke-width="1.2"{dash}/>')
+        if len(points) <= 60:
+            for p in points:
+                if p[idx]:
+                    parts.append(f'<circle cx="{x(p[0]):.1f}" cy="{y(p[idx]):.1f}" r="1.6" fill="{colour}"/>')
+
+    parts.append(f'<text x="{left}" y="{height - 8}" font-size="8" fill="#6b7280">{first.isoformat()}</text>')
+    parts.append(f'<text x="{left + plot_w}" y="{height - 8}" font-size="8" text-anchor="end" fill="#6b7280">{last.isoformat()}</text>')
+    parts.append(
+        f'<text x="{left + plot_w / 2:.1f}" y="{height - 8}" font-size="8" text-anchor="middle">'
+        '<tspan fill="#4f46e5">— Systolic</tspan>  <tspan fill="#0891b2">— Diastolic</tspan>  <tspan fill="#6b7280">- - Pulse</tspan></text>'
+    )
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+@traced("pdf.build_html")
 def _build_html(
     user: User,
     identity: UserIdentityProfile | None,
@@ -115,7 +222,10 @@ def _build_html(
     foods: list,
     gyms: list,
     summary_content: str | None,
+    bp_daily: list[dict] | None = None,
 ) -> str:
+    """Render the export. With bp_daily the BP chart is per day, and the BP
+    table too unless bp_entries (the per-reading rows) are also given."""
     dob = identity.date_of_birth.isoformat() if identity and identity.date_of_birth else "—"
     nhs = escape(identity.nhs_number) if identity and identity.nhs_number else "—"
     gp = escape(identity.gp_name) if identity and identity.gp_name else "—"
@@ -134,6 +244,7 @@ def _build_html(
   td {{ padding: 5px 8px; border-bottom: 1px solid #f3f4f6; font-size: 11px; }}
   .bp-badge {{ display: inline-block; padding: 2px 6px; border-radius: 4px; color: white; font-weight: bold; font-size: 10px; }}
   .entry-block {{ margin-bottom: 12px; }}
+  .bp-chart {{ display: block; width: 100%; height: auto; margin-top: 8px; }}
   .ai-h1 {{ font-size: 14px; font-weight: bold; color: #1f2937; margin: 12px 0 4px; }}
   .ai-h2 {{ font-size: 13px; font-weight: bold; color: #374151; margin: 10px 0 3px; }}
   .ai-h3 {{ font-size: 12px; font-weight: 600; color: #4b5563; margin: 8px 0 2px; }}
@@ -161,14 +272,28 @@ def _build_html(
     if summary_content:
         html += f'<h2>AI-Generated Summary</h2><div class="ai-summary">{_markdown_to_html(summary_content)}</div>'
 
-    if bp_entries:
-        html += "<h2>Blood Pressure</h2><table><tr><th>Date</th><th>Time</th><th>Reading</th><th>Pulse</th><th>Category</th><th>Notes</th></tr>"
-        for entry in bp_entries:
-            for r in entry.readings:
-                label, colour = _bp_category_colour(r.systolic, r.diastolic)
-                pulse = f"{r.pulse} bpm" if r.pulse else "—"
-                html += f'<tr><td>{entry.entry_date}</td><td>{r.recorded_at.strftime("%H:%M")}</td><td>{r.systolic}/{r.diastolic} mmHg</td><td>{pulse}</td><td><span class="bp-badge" style="background:{colour}">{label}</span></td><td>{entry.notes or ""}</td></tr>'
-        html += "</table>"
+    if bp_entries or bp_daily:
+        points = _bp_series(bp_entries, bp_daily)
+        html += "<h2>Blood Pressure</h2>"
+        if points:
+            first, last = (bp_daily[0]["date"], bp_daily[-1]["date"]) if bp_daily else (bp_entries[0].entry_date, bp_entries[-1].entry_date)
+            html += _bp_chart_svg(points, first, last)
+        if not bp_entries:
+            html += "<table><tr><th>Date</th><th>Readings</th><th>Average</th><th>Range</th><th>Avg Pulse</th><th>Category</th></tr>"
+            for d in bp_daily:
+                cat = classify_bp(round(d["sys_avg"]), round(d["dia_avg"]))
+                label, colour = BP_CATEGORY_LABELS[cat], BP_CATEGORY_COLOURS[cat]
+                pulse = f"{d['pulse_avg']:.0f} bpm" if d["pulse_avg"] else "—"
+                html += f'<tr><td>{d["date"]}</td><td>{d["n"]}</td><td>{d["sys_avg"]:.0f}/{d["dia_avg"]:.0f} mmHg</td><td>{d["sys_min"]}–{d["sys_max"]} / {d["dia_min"]}–{d["dia_max"]}</td><td>{pulse}</td><td><span class="bp-badge" style="background:{colour}">{label}</span></td></tr>'
+            html += "</table>"
+        else:
+            html += "<table><tr><th>Date</th><th>Time</th><th>Reading</th><th>Pulse</th><th>Category</th><th>Notes</th></tr>"
+            for entry in bp_entries:
+                for r in entry.readings:
+                    label, colour = BP_CATEGORY_LABELS[r.category], BP_CATEGORY_COLOURS[r.category]
+                    pulse = f"{r.pulse} bpm" if r.pulse else "—"
+                    html += f'<tr><td>{entry.entry_date}</td><td>{r.recorded_at.strftime("%H:%M")}</td><td>{r.systolic}/{r.diastolic} mmHg</td><td>{pulse}</td><td><span class="bp-badge" style="background:{colour}">{label}</span></td><td>{entry.notes or ""}</td></tr>'
+            html += "</table>"
 
     if symptoms:
         html += "<h2>Symptoms</h2><table><tr><th>Date</th><th>Time</th><th>Description</th><th>Severity</th></tr>"
@@ -195,78 +320,99 @@ def _build_html(
     return html
 
 
+@traced("pdf.export")
 async def generate_pdf(
     session: AsyncSession,
     user: User,
     start_date: date,
     end_date: date,
-    tag_ids: list,
+    tag_ids: list[uuid.UUID],
     include_summary: bool,
+    include_bp_readings: bool = False,
 ) -> bytes:
-    identity_result = await session.execute(
-        select(UserIdentityProfile).where(UserIdentityProfile.user_id == user.id)
-    )
-    identity = identity_result.scalar_one_or_none()
+    with tracer.start_as_current_span("pdf.load_entries"):
+        identity_result = await session.execute(
+            select(UserIdentityProfile).where(UserIdentityProfile.user_id == user.id)
+        )
+        identity = identity_result.scalar_one_or_none()
+
+        long_range = (end_date - start_date).days > DAILY_AGGREGATE_AFTER_DAYS
+        bp_daily = None
+        if long_range and not tag_ids:
+            # Untagged long ranges chart straight from the pre-aggregated day rows
+            bp_daily = [_daily_row(d) for d in await get_daily_stats(session, user.id, start_date, end_date)]
 
-    bp_result = await session.execute(
-        select(BPEntry).options(
-            selectinload(BPEntry.readings),
-            selectinload(BPEntry.tags),
-        ).where(
+        # Tags are only used for filtering, never rendered — apply them as EXISTS
+        # semi-joins instead of eager-loading every entry's tag collection.
+        bp_q = select(BPEntry).options(selectinload(BPEntry.readings)).where(
             BPEntry.user_id == user.id,
             BPEntry.entry_date >= start_date,
             BPEntry.entry_date <= end_date,
-        ).order_by(BPEntry.entry_date)
-    )
-    bp_entries = bp_result.scalars().all()
-
-    sym_result = await session.execute(
-        select(SymptomEntry).options(
-            selectinload(SymptomEntry.tags),
-        ).where(
+        )
+        sym_q = select(SymptomEntry).where(
             SymptomEntry.user_id == user.id,
             SymptomEntry.entry_date >= start_date,
             SymptomEntry.entry_date <= end_date,
-        ).order_by(SymptomEntry.entry_date)
-    )
-    symptoms = sym_result.scalars().all()
-
-    food_result = await session.execute(
-        select(FoodEntry).options(
-            selectinload(FoodEntry.tags),
-        ).where(
+        )
+        food_q = select(FoodEntry).where(
             FoodEntry.user_id == user.id,
             FoodEntry.entry_date >= start_date,
             FoodEntry.entry_date <= end_date,
-        ).order_by(FoodEntry.entry_date)
-    )
-    foods = food_result.scalars().all()
-
-    gym_result = await session.execute(
-        select(GymEntry).options(
-            selectinload(GymEntry.exercises),
-            selectinload(GymEntry.tags),
-        ).where(
+        )
+        gym_q = select(GymEntry).options(selectinload(GymEntry.exercises)).where(
             GymEntry.user_id == user.id,
             GymEntry.entry_date >= start_date,
             GymEntry.entry_date <= end_date,
-        ).order_by(GymEntry.entry_date)
-    )
-    gyms = gym_result.scalars().all()
-
-    summary_content = None
-    if include_summary:
-        sum_result = await session.execute(
-            select(AISummary).where(
-                AISummary.user_id == user.id,
-                AISummary.period_start >= start_date,
-                AISummary.period_end <= end_date,
-            ).order_by(AISummary.generated_at.desc())
         )
-        summary = sum_result.scalars().first()
-        if summary:
-            summary_content = summary.content
+        if tag_ids:
+            bp_q = bp_q.where(tagged_with(BPEntry, tag_ids))
+            sym_q = sym_q.where(tagged_with(SymptomEntry, tag_ids))
+            food_q = food_q.where(tagged_with(FoodEntry, tag_ids))
+            gym_q = gym_q.where(tagged_with(GymEntry, tag_ids))
 
-    html_content = _build_html(user, identity, start_date, end_date, list(bp_entries), list(symptoms), list(foods), list(gyms), summary_content)
+        bp_entries = []
+        if bp_daily is None or include_bp_readings:
+            bp_entries = list((await session.execute(bp_q.order_by(BPEntry.entry_date))).scalars().all())
+        if long_range:
+            if bp_daily is None:
+                bp_daily = _bp_daily_aggregates(bp_entries)
+            if not include_bp_readings:
+                bp_entries = []
+        symptoms = (await session.execute(sym_q.order_by(SymptomEntry.entry_date))).scalars().all()
+        foods = (await session.execute(food_q.order_by(FoodEntry.entry_date))).scalars().all()
+        gyms = (await session.execute(gym_q.order_by(GymEntry.entry_date))).scalars().all()
+
+        summary_content = None
+        if include_summary:
+            sum_result = await session.execute(
+                select(AISummary).where(
+                    AISummary.user_id == user.id,
+                    AISummary.period_start >= start_date,
+                    AISummary.period_end <= end_date,
+                ).order_by(AISummary.generated_at.desc())
+            )
+            summary = sum_result.scalars().first()
+            if summary:
+                summary_content = summary.content
+
+    html_content = _build_html(user, identity, start_date, end_date, bp_entries, list(symptoms), list(foods), list(gyms), summary_content, bp_daily)
     loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, lambda: HTML(string=html_content).write_pdf())
+    # Counted on the loop side: if the request is cancelled before a thread
+    # picks the job up, _render_pdf never runs, but this finally still does
+    pdf_queue_depth.inc()
+    try:
+        with tracer.start_as_current_span("pdf.render", attributes={"pdf.html_chars": len(html_content)}):
+            return await loop.run_in_executor(None, _render_pdf, html_content)
+    finally:
+        pdf_queue_depth.dec()
+
+
+def _render_pdf(html_content: str) -> bytes:
+    """Executor-side render."""
+    pdf_rendering.inc()
+    start = time.perf_counter()
+    try:
+        return HTML(string=html_content).write_pdf()
+    finally:
+        pdf_rendering.dec()
+        pdf_render_time.observe(time.perf_counter() - start)
@@ -0,0 +1,119 @@
+"""
+Cost-weighted per-user quotas and admission control for expensive routes.
+
+Each expensive kind of request has a cost in quota units, roughly
+proportional to what it spends (model tokens, render time). Users get
+QUOTA_PER_MINUTE and QUOTA_PER_DAY units, held as token buckets in the
+shared rate-limit storage (services.rate_limit), so workers agree.
+
+Admission control is separate and global: each admitted request holds
+one of its worker's ADMISSION_MAX_AI or ADMISSION_MAX_PDF slots from
+admission until the route returns, and new work of that kind is shed with
+a 503 while none are free rather than queued behind everyone else's.
+Slots are taken before anything is awaited, so a burst can't all pass
+the check before any of it counts. Work that fails is refunded, and
+usage is recorded only once it succeeds; usage and rejections are counted
+per user and day in usage_counters for the admin usage view.
+"""
+import uuid
+from dataclasses import dataclass
+from datetime import date, timedelta
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import get_settings
+from ..models.usage import UsageCounter
+from ..models.user import User
+from .metrics import admission_slots, quota_rejections, quota_usage
+from .rate_limit import Rate, get_limiter
+
+
+@dataclass(frozen=True)
+class Cost:
+    units: int
+    queue: str  # "ai" or "pdf", for admission control
+
+
+COSTS = {
+    "summary_daily": Cost(5, "ai"),  # Sonnet, ~1k output tokens
+    "summary_weekly": Cost(15, "ai"),  # Opus, ~1.5k output tokens
+    "pdf_export": Cost(3, "pdf"),
+}
+
+
+_slots_in_use = {"ai": 0, "pdf": 0}
+for _queue in _slots_in_use:
+    admission_slots.track(lambda queue=_queue: _slots_in_use[queue], _queue)
+
+
+def reserve(queue: str) -> bool:
+    """Take one of this worker's admission slots for `queue`; False when all are in use. Pair with release()."""
+    settings = get_settings()
+    limit = settings.ADMISSION_MAX_AI if queue == "ai" else settings.ADMISSION_MAX_PDF
+    if _slots_in_use[queue] >= limit:
+        return False
+    _slots_in_use[queue] += 1
+    return True
+
+
+def release(queue: str) -> None:
+    _slots_in_use[queue] -= 1
+
+
+def _buckets() -> list[tuple[str, Rate]]:
+    settings = get_settings()
+    return [("day", Rate(settings.QUOTA_PER_DAY, 86400)), ("minute", Rate(settings.QUOTA_PER_MINUTE, 60))]
+
+
+async def charge(user_id: uuid.UUID, units: int) -> float:
+    """Charge the user's minute and day buckets. Returns 0, or the seconds to wait.
+
+    The day bucket is checked first; a minute-bucket rejection after it
+    still counts against the day, which only errs towards strictness.
+    """
+    limiter = get_limiter()
+    for window, rate in _buckets():
+        wait = await limiter.hit(f"quota:{window}:{user_id}", rate, min(units, rate.limit))
+        if wait:
+            return wait
+    return 0.0
+
+
+async def refund(user_id: uuid.UUID, units: int) -> None:
+    """Give back a charge() whose work failed."""
+    limiter = get_limiter()
+    for window, rate in _buckets():
+        await limiter.refund(f"quota:{window}:{user_id}", rate, min(units, rate.limit))
+
+
+async def record_usage(session: AsyncSession, user_id: uuid.UUID, kind: str, units: int, rejected: str | None = None) -> None:
+    if rejected:
+        quota_rejections.inc(kind, rejected)
+    else:
+        quota_usage.inc(kind, amount=units)
+    values = {"requests": 0 if rejected else 1, "cost": 0 if rejected else units, "rejected": 1 if rejected else 0}
+    stmt = insert(UsageCounter).values(user_id=user_id, day=date.today(), kind=kind, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UsageCounter.user_id, UsageCounter.day, UsageCounter.kind],
+        set_={col: getattr(UsageCounter, col) + stmt.excluded[col] for col in values},
+    )
+    await session.execute(stmt)
+    await session.commit()
+
+
+async def get_usage(session: AsyncSession, days: int) -> list[dict]:
+    """Totals per user and kind over the last `days` days, heaviest first."""
+    since = date.today() - timedelta(days=days - 1)
+    cost = func.sum(UsageCounter.cost)
+    result = await session.execute(
+        select(
+            UsageCounter.user_id, User.email, UsageCounter.kind,
+            func.sum(UsageCounter.requests).label("requests"), cost.label("cost"),
+            func.sum(UsageCounter.rejected).label("rejected"),
+        )
+        .join(User, User.id == UsageCounter.user_id)
+        .where(UsageCounter.day >= since)
+        .group_by(UsageCounter.user_id, User.email, UsageCounter.kind)
+        .order_by(cost.desc(), User.email, UsageCounter.kind)
+    )
+    return [dict(row._mapping) for row in result]
@@ -0,0 +1,224 @@
+"""
+App-wide rate limiting with token buckets, keyed by client IP.
+
+Buckets are kept in GCRA form: one "theoretical arrival time" per key
+rather than a token count plus timestamp, so every backend can check and
+update a bucket in a single atomic step. A limit of "5/minute" allows a
+burst of 5 and refills one request every 12 seconds.
+
+Where buckets live is pluggable (RATE_LIMIT_STORAGE):
+
+  memory      MemoryStorage — per process, for a single worker and tests
+  postgres    PostgresStorage — shared by every worker through the primary database
+  redis://... RedisStorage — any Redis-compatible server, for several hosts
+
+Routes opt in with the routers.deps.rate_limit() dependency.
+"""
+import ipaddress
+import math
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Protocol
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.requests import Request
+from ..config import get_settings
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_RATE = re.compile(r"^\s*(\d+)\s*(?:/|per)\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+
+@dataclass(frozen=True)
+class Rate:
+    limit: int
+    period: float  # seconds
+
+    @property
+    def interval(self) -> float:
+        """Seconds for one request's worth of the bucket to refill."""
+        return self.period / self.limit
+
+    def __str__(self) -> str:
+        return f"{self.limit} per {self.period:g} seconds"
+
+
+def parse_rate(value: str) -> Rate:
+    """Parse "5/minute", "100 per hour" or "20/5minutes"."""
+    match = _RATE.match(value)
+    if not match or int(match[1]) == 0:
+        raise ValueError(f"Invalid rate limit: {value!r}")
+    count, multiplier, unit = match.groups()
+    return Rate(int(count), int(multiplier or 1) * _PERIODS[unit])
+
+
+class Storage(Protocol):
+    async def acquire(self, key: str, increment: float, tolerance: float) -> float:
+        """Advance `key` by `increment` seconds unless that would put it more
+        than `tolerance` seconds ahead of now. Returns 0 when admitted,
+        otherwise the seconds until it would be. A negative `increment`
+        gives time back (RateLimiter.refund)."""
+
+    async def close(self) -> None: ...
+
+
+class MemoryStorage:
+    """Buckets in a dict. Each worker process counts separately."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, max_keys: int = 10_000) -> None:
+        self._clock = clock
+        self._max_keys = max_keys
+        self._tat: dict[str, float] = {}
+
+    async def acquire(self, key: str, increment: float, tolerance: float) -> float:
+        now = self._clock()
+        tat = max(self._tat.get(key, now), now) + increment
+        if tat - now > tolerance:
+            return tat - tolerance - now
+        self._tat[key] = tat
+        if len(self._tat) > self._max_keys:
+            # Buckets that have fully refilled carry no state
+            self._tat = {k: t for k, t in self._tat.items() if t > now}
+        return 0.0
+
+    async def close(self) -> None:
+        pass
+
+
+class PostgresStorage:
+    """Buckets in the rate_limit_buckets table, updated with one upsert per check."""
+
+    _ACQUIRE = text("""
+        INSERT INTO rate_limit_buckets AS b (key, tat)
+        VALUES (:key, extract(epoch FROM now()) + :increment)
+        ON CONFLICT (key) DO UPDATE
+        SET tat = greatest(b.tat, extract(epoch FROM now())) + :increment
+        WHERE greatest(b.tat, extract(epoch FROM now())) + :increment - extract(epoch FROM now()) <= :tolerance
+        RETURNING tat
+    """)
+    _WAIT = text("""
+        SELECT greatest(tat, extract(epoch FROM now())) + :increment - :tolerance - extract(epoch FROM now())
+        FROM rate_limit_buckets WHERE key = :key
+    """)
+    _PRUNE = text("DELETE FROM rate_limit_buckets WHERE tat < extract(epoch FROM now())")
+
+    def __init__(self, engine: AsyncEngine, prune_every: int = 1000) -> None:
+        self._engine = engine
+        self._prune_every = prune_every
+        self._calls = 0
+
+    async def acquire(self, key: str, increment: float, tolerance: float) -> float:
+        params = {"key": key, "increment": increment, "tolerance": tolerance}
+        async with self._engine.begin() as conn:
+            if (await conn.execute(self._ACQUIRE, params)).first() is not None:
+                wait = 0.0
+            else:
+                wait = float((await conn.execute(self._WAIT, params)).scalar_one())
+            self._calls += 1
+            if self._calls % self._prune_every == 0:
+                await conn.execute(self._PRUNE)
+        return max(wait, 0.0)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisStorage:
+    """Buckets in Redis (or a compatible server), checked by a Lua script.
+
+    Needs the `redis` package. Keys expire once their bucket has refilled.
+    """
+
+    _SCRIPT = """
+        local now = redis.call('TIME')
+        local t = tonumber(now[1]) + tonumber(now[2]) / 1000000
+        local tat = math.max(tonumber(redis.call('GET', KEYS[1]) or t), t) + tonumber(ARGV[1])
+        local wait = tat - t - tonumber(ARGV[2])
+        if wait > 0 then return tostring(wait) end
+        if tat <= t then redis.call('DEL', KEYS[1]) return '0' end  -- refunded back to a full bucket
+        redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil((tat - t) * 1000))
+        return '0'
+    """
+
+    def __init__(self, url: str | None = None, client=None, prefix: str = "ratelimit:") -> None:
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as exc:
+                raise RuntimeError("RATE_LIMIT_STORAGE=redis:// needs the redis package (pip install redis)") from exc
+            client = redis.from_url(url)
+        self._client = client
+        self._script = client.register_script(self._SCRIPT)
+        self._prefix = prefix
+
+    async def acquire(self, key: str, increment: float, tolerance: float) -> float:
+        wait = await self._script(keys=[self._prefix + key], args=[repr(increment), repr(tolerance)])
+        return float(wait)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def _networks(spec: str) -> tuple:
+    return tuple(ipaddress.ip_network(part.strip(), strict=False) for part in spec.split(",") if part.strip())
+
+
+class RateLimiter:
+    def __init__(self, storage: Storage, trusted_proxies: str = "") -> None:
+        self.storage = storage
+        self.trusted_proxies = _networks(trusted_proxies)
+
+    def _trusted(self, address: str) -> bool:
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in net for net in self.trusted_proxies)
+
+    def client_ip(self, request: Request) -> str:
+        """The address of the first hop that isn't a trusted proxy.
+
+        Walks X-Forwarded-For from the right, starting at the socket peer.
+        Entries left of the first untrusted hop were written by the client
+        and are ignored, so a spoofed header can't dodge the limit.
+        """
+        address = request.client.host if request.client else "unknown"
+        forwarded = [a.strip() for a in request.headers.get("x-forwarded-for", "").split(",") if a.strip()]
+        while forwarded and self._trusted(address):
+            address = forwarded.pop()
+        return address
+
+    async def hit(self, key: str, rate: Rate, cost: float = 1) -> float:
+        """Charge `cost` requests to `key`'s bucket. Returns 0, or the seconds to wait."""
+        if cost > rate.limit:
+            raise ValueError(f"Cost {cost} can never fit in {rate}")
+        return await self.storage.acquire(key, rate.interval * cost, rate.period)
+
+    async def refund(self, key: str, rate: Rate, cost: float = 1) -> None:
+        """Give back `cost` requests charged by hit(), e.g. for work that then failed."""
+        await self.storage.acquire(key, -rate.interval * cost, rate.period)
+
+    async def close(self) -> None:
+        await self.storage.close()
+
+
+def _storage(spec: str) -> Storage:
+    if spec == "memory":
+        return MemoryStorage()
+    if spec == "postgres":
+        from ..database import engine
+        return PostgresStorage(engine)
+    if spec.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStorage(spec)
+    raise ValueError(f"Unknown RATE_LIMIT_STORAGE: {spec!r}")
+
+
+@lru_cache
+def get_limiter() -> RateLimiter:
+    settings = get_settings()
+    return RateLimiter(_storage(settings.RATE_LIMIT_STORAGE), settings.RATE_LIMIT_TRUSTED_PROXIES)
+
+
+def retry_after_header(wait: float) -> str:
+    return str(max(1, math.ceil(wait)))
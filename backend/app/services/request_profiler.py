@@ -0,0 +1,54 @@
+"""
+Admin-triggered request profiling (pyinstrument, statistical sampling).
+
+Profiles are kept in memory, newest last, and rendered on demand as
+speedscope JSON or pyinstrument's HTML flame view.
+"""
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pyinstrument import Profiler
+from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+from pyinstrument.session import Session
+
+SAMPLE_INTERVAL = 0.001  # seconds
+KEEP_PROFILES = 20
+
+_profiles: OrderedDict[str, dict] = OrderedDict()
+
+
+def start_profiler() -> Profiler:
+    profiler = Profiler(interval=SAMPLE_INTERVAL, async_mode="enabled")
+    profiler.start()
+    return profiler
+
+
+def new_profile_id() -> str:
+    return uuid.uuid4().hex
+
+
+def save_profile(profile_id: str, method: str, path: str, status: int, session: Session) -> None:
+    _profiles[profile_id] = {
+        "id": profile_id,
+        "recorded_at": datetime.now(timezone.utc),
+        "method": method,
+        "path": path,
+        "status": status,
+        "duration_ms": round(session.duration * 1000, 1),
+        "samples": session.sample_count,
+        "session": session,
+    }
+    while len(_profiles) > KEEP_PROFILES:
+        _profiles.popitem(last=False)
+
+
+def list_profiles() -> list[dict]:
+    return [{k: v for k, v in p.items() if k != "session"} for p in reversed(_profiles.values())]
+
+
+def render_profile(profile_id: str, fmt: str) -> str | None:
+    profile = _profiles.get(profile_id)
+    if profile is None:
+        return None
+    renderer = HTMLRenderer() if fmt == "html" else SpeedscopeRenderer()
+    return renderer.render(profile["session"])
@@ -0,0 +1,113 @@
+"""
+Full-text search over a user's diary: symptoms, food, BP and gym notes,
+and AI summaries.
+
+Each table carries a stored `search_vector` (a generated tsvector column
+with a GIN index), so matching never re-parses text. Hits from every type
+are ranked in one UNION ALL. ts_headline, the costly part, runs only for
+the rows of the returned page. Pagination is keyset-based: the cursor holds
+the last hit's sort key, so deep pages cost the same as the first.
+"""
+import base64
+import html
+import json
+import uuid
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import Numeric, String, cast, func, literal, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.entries import AISummary, BPEntry, FoodEntry, GymEntry, SymptomEntry
+
+# type → (model, date column, text columns shown in the snippet)
+SOURCES = {
+    "symptom": (SymptomEntry, SymptomEntry.entry_date, (SymptomEntry.description, SymptomEntry.notes)),
+    "food": (FoodEntry, FoodEntry.entry_date, (FoodEntry.description, FoodEntry.notes)),
+    "bp": (BPEntry, BPEntry.entry_date, (BPEntry.notes,)),
+    "gym": (GymEntry, GymEntry.entry_date, (GymEntry.session_notes,)),
+    "summary": (AISummary, AISummary.period_start, (AISummary.content,)),
+}
+
+# Control characters can't occur in diary text, so they mark highlights
+# safely until the snippet has been HTML-escaped
+_START, _STOP = "\x02", "\x03"
+_HEADLINE_OPTIONS = f"StartSel={_START}, StopSel={_STOP}, MaxWords=30, MinWords=12, MaxFragments=2, FragmentDelimiter=\" … \""
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(hit: dict) -> str:
+    key = [str(hit["rank"]), hit["date"].isoformat(), hit["type"], str(hit["id"])]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[Decimal, date, str, uuid.UUID]:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not (isinstance(key, list) and len(key) == 4 and all(isinstance(part, str) for part in key)):
+            raise ValueError("cursor is not a list of four strings")
+        rank, day, type_, id_ = key
+        return Decimal(rank), date.fromisoformat(day), type_, uuid.UUID(id_)
+    except (ValueError, TypeError, InvalidOperation) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def _snippet(headline: str) -> str:
+    return html.escape(headline).replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+async def search(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    q: str,
+    *,
+    types: list[str] | None = None,
+    sort: str = "relevance",
+    limit: int = 20,
+    cursor: str | None = None,
+) -> tuple[list[dict], str | None]:
+    """Hits for `q` (web-search syntax: quotes, OR, -word) and the next page's cursor.
+
+    `sort` is "relevance" (rank, then newest) or "recent" (newest, then rank).
+    """
+    query = func.websearch_to_tsquery("english", q)
+    parts = []
+    for type_, (model, day, columns) in SOURCES.items():
+        if types and type_ not in types:
+            continue
+        parts.append(
+            select(
+                literal(type_, String).label("type"),
+                model.id.label("id"),
+                day.label("date"),
+                # Rounded to numeric so the cursor round-trips exactly
+                func.round(cast(func.ts_rank_cd(model.search_vector, query), Numeric), 6).label("rank"),
+                func.concat_ws(" — ", *columns).label("doc"),
+            ).where(model.user_id == user_id, model.search_vector.op("@@")(query))
+        )
+    if not parts:
+        return [], None
+    hits = union_all(*parts).subquery("hits")
+
+    order = (hits.c.rank, hits.c.date) if sort == "relevance" else (hits.c.date, hits.c.rank)
+    key = tuple_(*order, hits.c.type, hits.c.id)
+    page = select(hits).order_by(*(c.desc() for c in key.clauses))
+    if cursor:
+        rank, day, type_, id_ = _decode_cursor(cursor)
+        after = (rank, day) if sort == "relevance" else (day, rank)
+        page = page.where(key < tuple_(*after, literal(type_, String), literal(id_)))
+    page = page.limit(limit + 1).subquery("page")
+
+    result = await session.execute(
+        select(
+            page.c.type, page.c.id, page.c.date, page.c.rank,
+            func.ts_headline("english", page.c.doc, query, _HEADLINE_OPTIONS).label("headline"),
+        ).order_by(*(page.c[c.name].desc() for c in key.clauses))
+    )
+    rows = [dict(row._mapping) for row in result]
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return [
+        {"type": r["type"], "id": r["id"], "date": r["date"], "rank": float(r["rank"]), "snippet": _snippet(r["headline"])}
+        for r in rows[:limit]
+    ], next_cursor
@@ -0,0 +1,148 @@
+"""
+Opt-in slow-query recorder (SLOW_QUERY_MS).
+
+Statements slower than the threshold are kept in a bounded in-memory ring
+buffer with the route that issued them, a keyed hash of the user id and
+their parameters reduced to type placeholders. A sample of slow SELECTs is
+re-run under EXPLAIN (ANALYZE, BUFFERS) on a separate connection, inside a
+transaction that is rolled back and under EXPLAIN_TIMEOUT_MS /
+EXPLAIN_LOCK_TIMEOUT_MS, since ANALYZE executes the statement again and the
+database is likely busy already. SELECTs with side effects (advisory locks,
+sequences, set_config, FOR UPDATE/SHARE, ...) only get a plain EXPLAIN.
+"""
+import asyncio
+import hashlib
+import hmac
+import logging
+import random
+import re
+import time
+import uuid
+from collections import deque
+from datetime import date, datetime, timezone
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from .metrics import current_request, route_template
+
+log = logging.getLogger(__name__)
+
+_records: deque[dict] = deque(maxlen=200)
+_background: set[asyncio.Task] = set()
+
+EXPLAIN_TIMEOUT_MS = 5000
+EXPLAIN_LOCK_TIMEOUT_MS = 100
+# Running these again would take locks, advance sequences or otherwise act
+_SIDE_EFFECTS = re.compile(
+    r"\b(pg_(try_)?advisory\w*|nextval|setval|set_config|pg_sleep\w*|pg_notify|pg_cancel_backend|pg_terminate_backend"
+    r"|lo_\w+|dblink\w*)\s*\("
+    r"|\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b",
+    re.IGNORECASE,
+)
+
+
+def _redact(value) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    if isinstance(value, str):
+        return f"<str:{len(value)}>"
+    if isinstance(value, (uuid.UUID, datetime, date)):
+        return f"<{type(value).__name__.lower()}>"
+    return f"<{type(value).__name__}>"
+
+
+def _redact_params(parameters) -> list | dict:
+    if isinstance(parameters, dict):
+        return {k: _redact(v) for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact(v) for v in parameters]
+    return []
+
+
+def hash_user_id(user_id: uuid.UUID, key: str) -> str:
+    return hmac.new(key.encode(), user_id.bytes, hashlib.sha256).hexdigest()[:16]
+
+
+def get_slow_queries(limit: int | None = None) -> list[dict]:
+    """Most recent first."""
+    records = list(reversed(_records))
+    return records[:limit] if limit else records
+
+
+def clear_slow_queries() -> None:
+    _records.clear()
+
+
+def _explain_options(statement: str) -> str | None:
+    """How to EXPLAIN a slow statement: ANALYZE only when re-running it is harmless; None to skip."""
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    return "(COSTS)" if _SIDE_EFFECTS.search(statement) else "(ANALYZE, BUFFERS)"
+
+
+async def _explain(engine: AsyncEngine, record: dict, statement: str, parameters) -> None:
+    try:
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(slow_query_log=False)
+            await conn.exec_driver_sql(
+                f"SELECT set_config('statement_timeout', '{EXPLAIN_TIMEOUT_MS}', true),"
+                f" set_config('lock_timeout', '{EXPLAIN_LOCK_TIMEOUT_MS}', true)"
+            )
+            result = await conn.exec_driver_sql(f"EXPLAIN {_explain_options(statement)} {statement}", parameters)
+            record["explain"] = "\n".join(row[0] for row in result)
+            await conn.rollback()
+    except Exception as exc:  # noqa: BLE001 — best effort, never surfaces to a request
+        record["explain"] = f"EXPLAIN failed: {exc}"
+
+
+def install_slow_query_log(
+    engine: AsyncEngine,
+    threshold_ms: float,
+    hash_key: str,
+    explain_sample: float = 0.0,
+    capacity: int = 200,
+) -> None:
+    global _records
+    _records = deque(maxlen=capacity)
+    sync_engine: Engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _end(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["slow_query_start"].pop()) * 1000
+        if elapsed_ms < threshold_ms or not conn.get_execution_options().get("slow_query_log", True):
+            return
+        stats = current_request.get()
+        record = {
+            "recorded_at": datetime.now(timezone.utc),
+            "duration_ms": round(elapsed_ms, 1),
+            "method": stats.scope.get("method") if stats else None,
+            "route": route_template(stats.scope) if stats else None,
+            "user": hash_user_id(stats.user_id, hash_key) if stats and stats.user_id else None,
+            "statement": statement,
+            "params": _redact_params(parameters),
+            "explain": None,
+        }
+        _records.append(record)
+        log.warning("slow query %.1f ms on %s: %s", elapsed_ms, record["route"], " ".join(statement.split())[:200])
+
+        if (
+            explain_sample
+            and not executemany
+            and _explain_options(statement)
+            and random.random() < explain_sample
+        ):
+            task = asyncio.get_running_loop().create_task(_explain(engine, record, statement, parameters))
+            _background.add(task)
+            task.add_done_callback(_background.discard)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("slow_query_start"):
+            conn.info["slow_query_start"].pop()
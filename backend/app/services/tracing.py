@@ -0,0 +1,114 @@
+"""
+OpenTelemetry tracing for HTTP requests, SQL statements, AI calls and PDF
+exports.
+
+Off by default (TRACING_EXPORTER=none): no tracer provider is installed,
+so every span below is the API's non-recording no-op and the engine hooks
+are never registered. With "file", finished spans are appended to
+TRACING_FILE as JSON lines; with "otlp" they go to the OTLP/HTTP endpoint
+from the standard OTEL_EXPORTER_OTLP_* variables. Each request gets an
+X-Request-ID (incoming one kept if sane) which is set on its root span.
+"""
+import functools
+import inspect
+import re
+import uuid
+from contextvars import ContextVar
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from ..config import Settings
+
+tracer = trace.get_tracer("medidiary")
+
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{8,128}$")
+STATEMENT_MAX_CHARS = 2000
+
+
+def resolve_request_id(incoming: str | None) -> str:
+    return incoming if incoming and _REQUEST_ID.match(incoming) else uuid.uuid4().hex
+
+
+def traced(name: str):
+    """Run the decorated function (sync or async) inside a span called `name`."""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_as_current_span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _exporter(settings: Settings):
+    if settings.TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    if settings.TRACING_EXPORTER == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        out = open(settings.TRACING_FILE, "a", buffering=1)
+        return ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+    raise ValueError(f"Unknown TRACING_EXPORTER {settings.TRACING_EXPORTER!r} (expected none, file or otlp)")
+
+
+def setup_tracing(settings: Settings, *engines: Engine) -> None:
+    if settings.TRACING_EXPORTER == "none":
+        return
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": "medidiary-backend"}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATE)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_exporter(settings)))
+    trace.set_tracer_provider(provider)
+    for engine in engines:
+        _trace_engine(engine)
+
+
+def _trace_engine(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.setdefault("otel_spans", [])
+        if not trace.get_current_span().is_recording():
+            spans.append(None)  # unsampled request (or none at all) — no statement span
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        span = tracer.start_span(
+            f"db {operation}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "postgresql",
+                "db.statement": statement[:STATEMENT_MAX_CHARS],
+                "db.executemany": executemany,
+            },
+        )
+        spans.append(span)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("otel_spans")
+        if spans and (span := spans.pop()) is not None:
+            span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("otel_spans") if conn is not None else None
+        if spans and (span := spans.pop()) is not None:
+            span.record_exception(exception_context.original_exception)
+            span.set_status(Status(StatusCode.ERROR))
+            span.end()
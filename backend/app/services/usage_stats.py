@@ -0,0 +1,185 @@
+"""
+Quick-log suggestions from incrementally maintained usage statistics.
+
+food_usage_stats counts each catalogue item's uses per (meal type, hour of
+day) and exercise_usage_stats each exercise's uses. Entry writes adjust
+them by ±1 in the same transaction, so suggesting never reads the entries
+themselves: it sums a few rows per item.
+
+Each row also carries a frecency `weight`: every use adds
+2 ** (days since EPOCH / HALF_LIFE_DAYS), the use's time on a scale that
+doubles every HALF_LIFE_DAYS. Ranking by the summed weight is ranking by
+a count in which a use loses half its value every HALF_LIFE_DAYS. Removing
+a use subtracts the same term it added, but not exactly: weights are
+around 2 ** 80 by now and doubles keep ~16 significant digits, so each
+add/remove pair can leave rounding residue of about 1e-16 of the use's
+weight. That is far below one use's worth, too small to matter for ranking;
+`python -m app.backfill` rebuilds the rows exactly when wanted. (Doubles
+hold this scale for another ~80 years.)
+
+Food suggestions for a given time favour uses logged at that hour, then
+the neighbouring hours, then the rest of the day (HOUR_FACTORS).
+"""
+import uuid
+from collections import Counter
+from datetime import date, time
+from sqlalchemy import Float, and_, case, delete, extract, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.entries import (
+    ExerciseCatalogueItem, ExerciseUsageStats, FoodCatalogueItem, FoodEntry, FoodUsageStats, GymEntry, GymExercise, MealType,
+)
+
+EPOCH = date(2020, 1, 1)
+HALF_LIFE_DAYS = 30
+HOUR_FACTORS = (1.0, 0.5)  # same hour, an hour either side; anything further counts OTHER_HOURS
+OTHER_HOURS = 0.1
+
+FoodUse = tuple[uuid.UUID, MealType, date, time]
+
+
+def _weight(day: date, at: time | None = None) -> float:
+    days = (day - EPOCH).days
+    if at:
+        days += (at.hour * 3600 + at.minute * 60 + at.second) / 86400
+    return 2 ** (days / HALF_LIFE_DAYS)
+
+
+def _sql_weight(day, at=None):
+    """_weight in SQL, for rebuilding from entries."""
+    days = day - literal(EPOCH)
+    if at is not None:
+        days = days + extract("epoch", at) / 86400
+    return func.power(2.0, days / float(HALF_LIFE_DAYS))
+
+
+async def _apply(session: AsyncSession, model, keys: list[str], rows: list[dict]) -> None:
+    """Add each row's (signed) uses and weight onto its stats row; rows left without uses are dropped."""
+    if not rows:
+        return
+    stmt = insert(model).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[getattr(model, k) for k in keys],
+        set_={col: func.greatest(getattr(model, col) + stmt.excluded[col], 0) for col in ("uses", "weight")},
+    )
+    await session.execute(stmt)
+    if any(row["uses"] < 0 for row in rows):
+        await session.execute(delete(model).where(model.user_id == rows[0]["user_id"], model.uses <= 0))
+
+
+def food_use(entry: FoodEntry) -> FoodUse | None:
+    """What a food entry contributes to the stats; None unless it was logged from the catalogue."""
+    if entry.catalogue_item_id is None:
+        return None
+    return entry.catalogue_item_id, MealType(entry.meal_type), entry.entry_date, entry.entry_time
+
+
+async def record_food(session: AsyncSession, user_id: uuid.UUID, use: FoodUse | None, delta: int) -> None:
+    """Count a food entry's use in (delta=1) or out of (delta=-1) the user's stats."""
+    if use is None:
+        return
+    item_id, meal_type, day, at = use
+    await _apply(session, FoodUsageStats, ["user_id", "meal_type", "catalogue_item_id", "hour"], [{
+        "user_id": user_id, "meal_type": meal_type, "catalogue_item_id": item_id, "hour": at.hour,
+        "uses": delta, "weight": delta * _weight(day, at),
+    }])
+
+
+async def record_exercises(session: AsyncSession, user_id: uuid.UUID, day: date, machines: list[str], delta: int) -> None:
+    """Count a gym session's exercises in or out of the user's stats."""
+    counts = Counter(machine.lower() for machine in machines)
+    await _apply(session, ExerciseUsageStats, ["user_id", "name"], [
+        {"user_id": user_id, "name": name, "uses": delta * n, "weight": delta * n * _weight(day)}
+        for name, n in sorted(counts.items())  # one row per key, in a fixed order so concurrent writers don't deadlock
+    ])
+
+
+async def suggest_food(
+    session: AsyncSession, user_id: uuid.UUID, meal_type: MealType | None, at: time, limit: int,
+) -> list[FoodCatalogueItem]:
+    """The user's catalogue items most likely to be logged for `meal_type` (any, if None) around `at`."""
+    apart = func.abs(FoodUsageStats.hour - at.hour)
+    apart = func.least(apart, 24 - apart)
+    factor = case(*((apart == i, f) for i, f in enumerate(HOUR_FACTORS)), else_=OTHER_HOURS)
+    filters = [FoodUsageStats.meal_type == meal_type] if meal_type else []
+    scores = (
+        select(FoodUsageStats.catalogue_item_id, func.sum(FoodUsageStats.weight * factor).label("score"))
+        .where(FoodUsageStats.user_id == user_id, *filters)
+        .group_by(FoodUsageStats.catalogue_item_id)
+        .subquery()
+    )
+    result = await session.execute(
+        select(FoodCatalogueItem)
+        .join(scores, scores.c.catalogue_item_id == FoodCatalogueItem.id)
+        .where(FoodCatalogueItem.user_id == user_id)
+        .order_by(scores.c.score.desc(), FoodCatalogueItem.name)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def suggest_exercises(session: AsyncSession, user_id: uuid.UUID, limit: int) -> list[ExerciseCatalogueItem]:
+    """The user's catalogue exercises by frecency."""
+    result = await session.execute(
+        select(ExerciseCatalogueItem)
+        .join(ExerciseUsageStats, and_(
+            ExerciseUsageStats.user_id == ExerciseCatalogueItem.user_id,
+            ExerciseUsageStats.name == func.lower(ExerciseCatalogueItem.name),
+        ))
+        .where(ExerciseCatalogueItem.user_id == user_id)
+        .order_by(ExerciseUsageStats.weight.desc(), ExerciseCatalogueItem.name)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+# ── Rebuilding from entries ──────────────────────────────────────────────────
+
+def _food_aggregate(*where):
+    hour = extract("hour", FoodEntry.entry_time).cast(FoodUsageStats.hour.type)
+    return (
+        select(
+            FoodEntry.user_id, FoodEntry.meal_type, FoodEntry.catalogue_item_id, hour, func.count(),
+            func.sum(_sql_weight(FoodEntry.entry_date, FoodEntry.entry_time)).cast(Float),
+        )
+        .where(FoodEntry.catalogue_item_id.is_not(None), *where)
+        .group_by(FoodEntry.user_id, FoodEntry.meal_type, FoodEntry.catalogue_item_id, hour)
+    )
+
+
+def _exercise_aggregate(*where):
+    name = func.lower(GymExercise.machine)
+    return (
+        select(GymEntry.user_id, name, func.count(), func.sum(_sql_weight(GymEntry.entry_date)).cast(Float))
+        .join(GymEntry, GymEntry.id == GymExercise.gym_entry_id)
+        .where(*where)
+        .group_by(GymEntry.user_id, name)
+    )
+
+
+_FOOD_COLUMNS = ["user_id", "meal_type", "catalogue_item_id", "hour", "uses", "weight"]
+_EXERCISE_COLUMNS = ["user_id", "name", "uses", "weight"]
+
+
+async def build_usage_stats(session: AsyncSession, user_ids: list[uuid.UUID]) -> int:
+    """Insert usage stats for users that have none yet (freshly bulk-loaded); returns rows written."""
+    food = await session.execute(
+        insert(FoodUsageStats).from_select(_FOOD_COLUMNS, _food_aggregate(FoodEntry.user_id.in_(user_ids)))
+    )
+    exercises = await session.execute(
+        insert(ExerciseUsageStats).from_select(_EXERCISE_COLUMNS, _exercise_aggregate(GymEntry.user_id.in_(user_ids)))
+    )
+    return food.rowcount + exercises.rowcount
+
+
+async def backfill_usage_stats(session: AsyncSession, user_id: uuid.UUID | None = None) -> int:
+    """Rebuild both usage stats tables from scratch for one user or everyone; returns rows written."""
+    rows = 0
+    for model, columns, aggregate, entry in (
+        (FoodUsageStats, _FOOD_COLUMNS, _food_aggregate, FoodEntry),
+        (ExerciseUsageStats, _EXERCISE_COLUMNS, _exercise_aggregate, GymEntry),
+    ):
+        await session.execute(delete(model).where(model.user_id == user_id) if user_id else delete(model))
+        where = [entry.user_id == user_id] if user_id else []
+        rows += (await session.execute(insert(model).from_select(columns, aggregate(*where)))).rowcount
+    return rows
@@ -0,0 +1,116 @@
+"""
+Per-worker LRU of each user's small, rarely changing sets: tags, the food
+and exercise catalogues, and the usage counts that rank autocomplete.
+
+Every entry remembers the user's version it was loaded at and is only
+served while that still matches. The sets use users.catalogue_version,
+bumped when a tag or catalogue item is written (services.data_version).
+Usage counts use users.data_version, bumped by any write. The user row is
+read on every request anyway, so checking costs nothing, and a write in
+one worker retires the other workers' copies on their next request.
+Values are shared between requests and must not be mutated.
+
+The user row comes from the primary, but a set may be loaded through the
+read replica. So a load reads the version in the same statement as the
+data and the entry is stored under that version: a lagging replica's
+answer is served once and then fails the check, instead of being cached
+under the newer version until the next write.
+"""
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import Any, TypeVar
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import get_settings
+from ..models.entries import ExerciseCatalogueItem, FoodCatalogueItem
+from ..models.profile import Tag
+from ..models.user import User
+from ..schemas.entries import ExerciseCatalogueItemOut, FoodCatalogueItemOut
+from ..schemas.profile import TagOut
+from . import metrics
+
+T = TypeVar("T")
+_MISS = object()
+
+
+class UserCache:
+    """Bounded LRU of (user id, kind) → value, valid while the version it was stored at holds."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[uuid.UUID, str], tuple[int, Any]] = OrderedDict()
+
+    def get(self, user_id: uuid.UUID, kind: str, version: int) -> Any:
+        entry = self._entries.get((user_id, kind))
+        if entry is None or entry[0] != version:
+            return _MISS
+        self._entries.move_to_end((user_id, kind))
+        return entry[1]
+
+    def put(self, user_id: uuid.UUID, kind: str, version: int, value: Any) -> None:
+        self._entries[(user_id, kind)] = (version, value)
+        self._entries.move_to_end((user_id, kind))
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+@lru_cache
+def get_user_cache() -> UserCache:
+    return UserCache(get_settings().USER_CACHE_SIZE)
+
+
+async def cached(user_id: uuid.UUID, kind: str, version: int, load: Callable[[], Awaitable[tuple[int, T]]]) -> T:
+    """`kind` for the user at `version`, calling `load` on a miss.
+
+    `load` returns the version its data was read at along with the data.
+    """
+    cache = get_user_cache()
+    value = cache.get(user_id, kind, version)
+    if value is not _MISS:
+        metrics.user_cache.inc(kind, "hit")
+        return value
+    metrics.user_cache.inc(kind, "miss")
+    loaded_version, value = await load()
+    cache.put(user_id, kind, loaded_version, value)
+    return value
+
+
+async def _user_set(session: AsyncSession, user: User, kind: str, model, schema) -> tuple | None:
+    async def load():
+        # One row past the cap tells us the set is too big; that answer is cached too.
+        # Outer join from the user row so the version comes back even for an empty set.
+        max_items = get_settings().USER_CACHE_MAX_ITEMS
+        result = await session.execute(
+            select(User.catalogue_version, model)
+            .select_from(User)
+            .outerjoin(model, model.user_id == User.id)
+            .where(User.id == user.id)
+            .order_by(model.name)
+            .limit(max_items + 1)
+        )
+        rows = result.all()
+        items = [row for _, row in rows if row is not None]
+        value = None if len(items) > max_items else tuple(schema.model_validate(row) for row in items)
+        return rows[0][0], value
+
+    return await cached(user.id, kind, user.catalogue_version, load)
+
+
+async def tags(session: AsyncSession, user: User) -> tuple[TagOut, ...] | None:
+    """The user's tags by name, or None when there are more than USER_CACHE_MAX_ITEMS."""
+    return await _user_set(session, user, "tags", Tag, TagOut)
+
+
+async def food_catalogue(session: AsyncSession, user: User) -> tuple[FoodCatalogueItemOut, ...] | None:
+    """The user's food catalogue by name, or None when it's too big to cache."""
+    return await _user_set(session, user, "food_catalogue", FoodCatalogueItem, FoodCatalogueItemOut)
+
+
+async def exercise_catalogue(session: AsyncSession, user: User) -> tuple[ExerciseCatalogueItemOut, ...] | None:
+    """The user's exercise catalogue by name, or None when it's too big to cache."""
+    return await _user_set(session, user, "exercise_catalogue", ExerciseCatalogueItem, ExerciseCatalogueItemOut)
@@ -0,0 +1,299 @@
+"""
+Synthetic diaries for load tests and benchmarks.
+
+    python -m app.seed synthetic --users 1000 --years 3 [--seed 42] [--password ...]
+
+Each user gets a personal BP baseline with a morning surge, evening dip,
+weekend and seasonal effects and a slowly drifting trend; symptoms whose
+odds and severity follow that day's BP; meals drawn from their own food
+catalogue with favourites; gym sessions with progressive loads and
+deloads; and a few tags sprinkled over entries. Rows are bulk-loaded with
+COPY, users are committed in chunks, and bp_daily_stats and the usage
+stats are built for each chunk. Users are named synthetic-<n>@example.test
+and share one password, so re-running adds more users rather than
+clashing.
+"""
+import argparse
+import asyncio
+import logging
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from time import perf_counter
+import numpy as np
+from sqlalchemy import func, select
+from .database import AsyncSessionLocal
+from .models.user import User
+from .services.analytics import BP_CATEGORY_ORDER, categorise
+from .services.auth import hash_password
+from .services.bp_stats import build_daily_stats
+from .services.usage_stats import build_usage_stats
+
+log = logging.getLogger(__name__)
+
+EMAIL_DOMAIN = "example.test"
+DEFAULT_PASSWORD = "synthetic-password"
+
+# Load order respects foreign keys
+COLUMNS = {
+    "users": ("id", "email", "hashed_password", "name", "role", "is_active", "mfa_enabled", "data_version"),
+    "tags": ("id", "user_id", "name", "colour"),
+    "food_catalogue_items": ("id", "user_id", "name", "category", "typical_portion"),
+    "exercise_catalogue_items": ("id", "user_id", "name"),
+    "bp_entries": ("id", "user_id", "entry_date"),
+    "bp_readings": ("id", "bp_entry_id", "systolic", "diastolic", "pulse", "recorded_at", "order_index", "category"),
+    "symptom_entries": ("id", "user_id", "entry_date", "entry_time", "description", "severity"),
+    "food_entries": ("id", "user_id", "entry_date", "entry_time", "meal_type", "description", "quantity", "catalogue_item_id"),
+    "gym_entries": ("id", "user_id", "entry_date"),
+    "gym_exercises": ("id", "gym_entry_id", "machine", "duration_min", "sets", "reps", "weight_kg", "order_index"),
+    "bp_entry_tags": ("bp_entry_id", "tag_id"),
+    "symptom_entry_tags": ("symptom_entry_id", "tag_id"),
+    "food_entry_tags": ("food_entry_id", "tag_id"),
+    "gym_entry_tags": ("gym_entry_id", "tag_id"),
+}
+
+TAGS = [("Stress", "#ef4444"), ("Poor sleep", "#8b5cf6"), ("Travel", "#0ea5e9"), ("Medication change", "#f59e0b"), ("Illness", "#10b981")]
+TAG_RATE = 0.06
+
+# (name, category, typical portion, meal types it is eaten at)
+FOODS = [
+    ("Porridge with berries", "food", "1 bowl", ("breakfast",)),
+    ("Wholemeal toast", "food", "2 slices", ("breakfast", "snack")),
+    ("Scrambled eggs", "food", "2 eggs", ("breakfast",)),
+    ("Greek yoghurt", "food", "150 g", ("breakfast", "snack")),
+    ("Granola", "food", "50 g", ("breakfast",)),
+    ("Full English breakfast", "food", "1 plate", ("breakfast",)),
+    ("Chicken salad", "food", "1 bowl", ("lunch",)),
+    ("Ham sandwich", "food", "1 sandwich", ("lunch",)),
+    ("Tomato soup", "food", "1 bowl", ("lunch",)),
+    ("Jacket potato with beans", "food", "1 potato", ("lunch", "dinner")),
+    ("Tuna pasta", "food", "1 plate", ("lunch", "dinner")),
+    ("Sushi", "food", "8 pieces", ("lunch",)),
+    ("Spaghetti bolognese", "food", "1 plate", ("dinner",)),
+    ("Grilled salmon with vegetables", "food", "1 fillet", ("dinner",)),
+    ("Chicken curry with rice", "food", "1 plate", ("dinner",)),
+    ("Vegetable stir fry", "food", "1 plate", ("dinner",)),
+    ("Pizza", "food", "half", ("dinner",)),
+    ("Roast dinner", "food", "1 plate", ("dinner",)),
+    ("Fish and chips", "food", "1 portion", ("dinner",)),
+    ("Lentil dahl", "food", "1 bowl", ("dinner", "lunch")),
+    ("Apple", "food", "1", ("snack",)),
+    ("Banana", "food", "1", ("snack", "breakfast")),
+    ("Crisps", "food", "1 bag", ("snack",)),
+    ("Mixed nuts", "food", "30 g", ("snack",)),
+    ("Chocolate bar", "food", "1 bar", ("snack",)),
+    ("Coffee", "drink", "1 mug", ("drink",)),
+    ("Tea", "drink", "1 mug", ("drink",)),
+    ("Water", "drink", "500 ml", ("drink",)),
+    ("Orange juice", "drink", "250 ml", ("drink",)),
+    ("Beer", "drink", "1 pint", ("drink",)),
+    ("Red wine", "drink", "175 ml", ("drink",)),
+    ("Cola", "drink", "330 ml", ("drink",)),
+]
+# meal type → (probability per day or mean count for snack/drink, hour window)
+MEALS = {
+    "breakfast": (0.85, (6, 10)),
+    "lunch": (0.8, (12, 14)),
+    "dinner": (0.9, (18, 21)),
+    "snack": (0.7, (10, 22)),
+    "drink": (1.5, (7, 22)),
+}
+
+# (name, starting weight kg, or None for cardio)
+EXERCISES = [
+    ("Treadmill", None), ("Rowing machine", None), ("Exercise bike", None), ("Cross trainer", None),
+    ("Leg press", 60.0), ("Chest press", 25.0), ("Lat pulldown", 30.0), ("Seated row", 30.0),
+    ("Shoulder press", 15.0), ("Leg curl", 20.0), ("Leg extension", 25.0), ("Bicep curl", 8.0),
+    ("Squat", 40.0), ("Deadlift", 50.0), ("Bench press", 30.0),
+]
+
+BP_SYMPTOMS = ["Headache", "Dizziness", "Blurred vision", "Pounding in ears", "Nosebleed", "Chest tightness"]
+OTHER_SYMPTOMS = ["Fatigue", "Poor sleep", "Back pain", "Nausea", "Feeling anxious", "Joint stiffness", "Cold symptoms", "Low mood"]
+
+
+class _Batch:
+    """Rows per table for one chunk of users, in COPY column order."""
+
+    def __init__(self) -> None:
+        self.rows: dict[str, list[tuple]] = {table: [] for table in COLUMNS}
+
+    def add(self, table: str, *row) -> None:
+        self.rows[table].append(row)
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self.rows.values())
+
+
+def _ar1(rng: np.random.Generator, n: int, phi: float, sd: float) -> np.ndarray:
+    """Mean-reverting drift (AR(1)) — weeks-long highs and lows around the baseline."""
+    noise = rng.normal(0, sd, n)
+    out = np.empty(n)
+    level = 0.0
+    for i in range(n):
+        level = phi * level + noise[i]
+        out[i] = level
+    return out
+
+
+def _clock(hour: float) -> time:
+    minutes = int(hour * 60)
+    return time(minutes // 60, minutes % 60)
+
+
+def _diary(batch: _Batch, rng: np.random.Generator, user_id: uuid.UUID, start: date, days: int) -> None:
+    dates = [start + timedelta(days=d) for d in range(days)]
+    midnights = [datetime(d.year, d.month, d.day, tzinfo=timezone.utc) for d in dates]
+    doy = np.array([d.timetuple().tm_yday for d in dates])
+    weekend = np.array([d.weekday() >= 5 for d in dates])
+    tagged: dict[str, list[uuid.UUID]] = {}
+
+    # ── Blood pressure: morning and evening sessions of 1–3 readings ──
+    base_sys = float(np.clip(rng.normal(126, 13), 100, 175))
+    base_dia = base_sys * 0.55 + rng.normal(12, 5)
+    base_pulse = rng.normal(70, 7)
+    surge = rng.uniform(2, 12)
+    adherence = rng.uniform(0.5, 0.95)
+    day_sys = base_sys + _ar1(rng, days, 0.97, 1.2) + 3 * np.cos(2 * np.pi * doy / 365) - 2 * weekend
+
+    day = np.repeat(np.arange(days), 2)
+    evening = np.tile([False, True], days)
+    keep = rng.random(2 * days) < np.where(evening, adherence * 0.8, adherence)
+    day, evening = day[keep], evening[keep]
+    n_sessions = day.size
+    hours = np.where(evening, rng.uniform(19, 22.5, n_sessions), rng.uniform(6, 9, n_sessions))
+    counts = np.where(evening, rng.choice([1, 2, 3], n_sessions, p=[0.4, 0.45, 0.15]), rng.choice([1, 2, 3], n_sessions, p=[0.3, 0.5, 0.2]))
+    expected = day_sys[day] + np.where(evening, -surge * 0.5, surge)
+
+    session = np.repeat(np.arange(n_sessions), counts)
+    order = np.arange(session.size) - np.repeat(np.cumsum(counts) - counts, counts)
+    n = session.size
+    # Repeat readings settle a little lower than the first
+    systolic = np.round(expected[session] - 3 * (order > 0) + rng.normal(0, 6, n))
+    diastolic = np.round(base_dia + (systolic - base_sys) * 0.5 + rng.normal(0, 4, n))
+    pulse = np.round(base_pulse + 4 * ~evening[session] + rng.normal(0, 5, n))
+    pulse = [int(p) if present else None for p, present in zip(pulse.tolist(), rng.random(n) < 0.9)]
+    categories = [BP_CATEGORY_ORDER[i].value for i in categorise(systolic, diastolic)]
+
+    entry_ids = [uuid.uuid4() for _ in range(n_sessions)]
+    tagged["bp_entry_tags"] = entry_ids
+    session_days = day.tolist()
+    for entry_id, d in zip(entry_ids, session_days):
+        batch.add("bp_entries", entry_id, user_id, dates[d])
+    reading_minutes = (hours[session] * 60 + order * 3).astype(int).tolist()
+    for i, (s, k, sy, di) in enumerate(zip(session.tolist(), order.tolist(), systolic.tolist(), diastolic.tolist())):
+        recorded_at = midnights[session_days[s]] + timedelta(minutes=reading_minutes[i])
+        batch.add("bp_readings", uuid.uuid4(), entry_ids[s], int(sy), int(di), pulse[i], recorded_at, k, categories[i])
+
+    # ── Symptoms — likelier and worse on high-BP days ──
+    excess = day_sys - 135
+    symptom_days = np.flatnonzero(rng.random(days) < 0.04 + 0.3 / (1 + np.exp(-excess / 6)))
+    m = symptom_days.size
+    bp_related = rng.random(m) < 0.2 + 0.6 / (1 + np.exp(-excess[symptom_days] / 6))
+    descriptions = np.where(bp_related, rng.choice(BP_SYMPTOMS, m), rng.choice(OTHER_SYMPTOMS, m))
+    severities = np.clip(np.round(3 + np.maximum(excess[symptom_days], 0) / 8 + rng.normal(0, 1.5, m)), 1, 10)
+    entry_ids = [uuid.uuid4() for _ in range(m)]
+    tagged["symptom_entry_tags"] = entry_ids
+    for entry_id, d, hour, description, severity in zip(
+        entry_ids, symptom_days.tolist(), rng.uniform(7, 22, m).tolist(), descriptions.tolist(), severities.tolist()
+    ):
+        batch.add("symptom_entries", entry_id, user_id, dates[d], _clock(hour), description, int(severity))
+
+    # ── Meals from a personal catalogue with favourites ──
+    foods = [FOODS[j] for j in rng.choice(len(FOODS), size=rng.integers(15, len(FOODS)), replace=False)]
+    food_ids = [uuid.uuid4() for _ in foods]
+    for food_id, (name, category, portion, _) in zip(food_ids, foods):
+        batch.add("food_catalogue_items", food_id, user_id, name, category, portion)
+    tagged["food_entry_tags"] = []
+    for meal, (rate, (lo, hi)) in MEALS.items():
+        options = [j for j, f in enumerate(foods) if meal in f[3]]
+        if not options:
+            continue
+        weights = 1 / np.arange(1, len(options) + 1) ** 1.2  # Zipf: a few favourites dominate
+        per_day = rng.poisson(rate, days) if meal in ("snack", "drink") else (rng.random(days) < rate).astype(int)
+        meal_days = np.repeat(np.arange(days), per_day)
+        k = meal_days.size
+        picks = rng.choice(options, size=k, p=weights / weights.sum())
+        for d, j, hour, linked in zip(meal_days.tolist(), picks.tolist(), rng.uniform(lo, hi, k).tolist(), (rng.random(k) < 0.7).tolist()):
+            entry_id = uuid.uuid4()
+            tagged["food_entry_tags"].append(entry_id)
+            name, _, portion, _ = foods[j]
+            batch.add("food_entries", entry_id, user_id, dates[d], _clock(hour), meal, name, portion, food_ids[j] if linked else None)
+
+    # ── Gym with progressive overload and periodic deloads ──
+    exercises = [EXERCISES[j] for j in rng.choice(len(EXERCISES), size=8, replace=False)]
+    for name, _ in exercises:
+        batch.add("exercise_catalogue_items", uuid.uuid4(), user_id, name)
+    per_week = rng.choice([0, 1, 2, 3, 4], p=[0.3, 0.15, 0.25, 0.2, 0.1])
+    strength = rng.uniform(0.8, 1.3)
+    gym_days = np.flatnonzero(rng.random(days) < per_week / 7)
+    tagged["gym_entry_tags"] = []
+    for n_session, d in enumerate(gym_days.tolist()):
+        progress = 1 + 0.35 * (1 - np.exp(-n_session / 80))
+        deload = 0.85 if n_session % 24 >= 21 else 1.0
+        entry_id = uuid.uuid4()
+        tagged["gym_entry_tags"].append(entry_id)
+        batch.add("gym_entries", entry_id, user_id, dates[d])
+        for k, j in enumerate(rng.choice(len(exercises), size=rng.integers(3, 7), replace=False).tolist()):
+            name, start_kg = exercises[j]
+            if start_kg is None:
+                row = (int(rng.integers(10, 35)), None, None, None)
+            else:
+                row = (None, 3, int(rng.integers(8, 13)), round(start_kg * strength * progress * deload / 2.5) * 2.5)
+            batch.add("gym_exercises", uuid.uuid4(), entry_id, name, *row, k)
+
+    # ── Tags on a few entries of every kind ──
+    tag_ids = [uuid.uuid4() for _ in TAGS]
+    for tag_id, (name, colour) in zip(tag_ids, TAGS):
+        batch.add("tags", tag_id, user_id, name, colour)
+    for table, ids in tagged.items():
+        chosen = np.flatnonzero(rng.random(len(ids)) < TAG_RATE)
+        for i, t in zip(chosen.tolist(), rng.integers(len(tag_ids), size=chosen.size).tolist()):
+            batch.add(table, ids[i], tag_ids[t])
+
+
+async def _copy(session, batch: _Batch) -> None:
+    conn = await session.connection()
+    raw = (await conn.get_raw_connection()).driver_connection
+    for table, columns in COLUMNS.items():
+        if batch.rows[table]:
+            await raw.copy_records_to_table(table, records=batch.rows[table], columns=columns)
+
+
+def _build_chunk(numbers: range, hashed: str, seed: int | None, start: date, days: int) -> tuple[_Batch, list[uuid.UUID]]:
+    batch, user_ids = _Batch(), []
+    for n in numbers:
+        user_id = uuid.uuid4()
+        user_ids.append(user_id)
+        batch.add("users", user_id, f"synthetic-{n}@{EMAIL_DOMAIN}", hashed, f"Synthetic User {n}", "user", True, False, 0)
+        _diary(batch, np.random.default_rng(None if seed is None else [seed, n]), user_id, start, days)
+    return batch, user_ids
+
+
+async def generate(users: int, years: float, seed: int | None, password: str, chunk: int) -> None:
+    days = int(years * 365)
+    start = date.today() - timedelta(days=days - 1)
+    hashed = hash_password(password)  # one bcrypt hash shared by every synthetic user
+    async with AsyncSessionLocal() as session:
+        offset = await session.scalar(select(func.count()).select_from(User).where(User.email.like(f"synthetic-%@{EMAIL_DOMAIN}")))
+
+    began, total_rows = perf_counter(), 0
+    for first in range(0, users, chunk):
+        numbers = range(offset + first, offset + min(first + chunk, users))
+        batch, user_ids = _build_chunk(numbers, hashed, seed, start, days)
+        async with AsyncSessionLocal() as session:
+            await _copy(session, batch)
+            await build_daily_stats(session, user_ids)
+            await build_usage_stats(session, user_ids)
+            await session.commit()
+        total_rows += len(batch)
+        log.info("Synthetic: %d/%d users, %d rows (%.0f rows/s).", first + len(numbers), users, total_rows, total_rows / (perf_counter() - began))
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.seed synthetic", description="Bulk-load synthetic diaries.")
+    parser.add_argument("--users", type=int, required=True)
+    parser.add_argument("--years", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=None, help="make the generated data reproducible")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="login password for every synthetic user")
+    parser.add_argument("--chunk", type=int, default=50, help="users per COPY batch and transaction (default 50)")
+    args = parser.parse_args(argv)
+    asyncio.run(generate(args.users, args.years, args.seed, args.password, args.chunk))
@@ -0,0 +1,83 @@
+"""
+Benchmark of connection pool saturation. Needs a real database in DATABASE_URL.
+
+Runs `concurrency` tasks that each check out a connection, hold it for a
+query of `hold_ms` (pg_sleep, standing in for a request's DB time) and
+return it, for each pool size/overflow profile. Reports throughput, the
+time spent waiting for a connection and pool timeouts — queueing starts
+once concurrency exceeds pool_size + max_overflow. Also compares the first
+query on a cold pool with one after warm_up_pool:
+
+    python -m benchmarks.bench_pool [concurrency ...] [--hold-ms 20] [--rounds 20]
+"""
+import argparse
+import asyncio
+import os
+import time
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.database import warm_up_pool
+
+# (pool_size, max_overflow)
+PROFILES = [(5, 0), (5, 10), (20, 0), (20, 10)]
+POOL_TIMEOUT = 2.0
+
+
+async def _worker(engine, hold: float, rounds: int, waits: list[float], timeouts: list[int]) -> None:
+    for _ in range(rounds):
+        start = time.perf_counter()
+        try:
+            async with engine.connect() as conn:
+                waits.append(time.perf_counter() - start)
+                await conn.execute(text("SELECT pg_sleep(:s)"), {"s": hold})
+        except PoolTimeout:
+            timeouts.append(1)
+
+
+async def saturate(url: str, pool_size: int, max_overflow: int, concurrency: int, hold_ms: float, rounds: int) -> dict:
+    engine = create_async_engine(url, pool_size=pool_size, max_overflow=max_overflow, pool_timeout=POOL_TIMEOUT)
+    await warm_up_pool(engine, pool_size)
+    waits, timeouts = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker(engine, hold_ms / 1000, rounds, waits, timeouts) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    p50, p95, p99 = np.percentile(np.array(waits) * 1000, [50, 95, 99]) if waits else (0, 0, 0)
+    return {"qps": len(waits) / elapsed, "p50": p50, "p95": p95, "p99": p99, "timeouts": len(timeouts)}
+
+
+async def cold_vs_warm(url: str, pool_size: int = 5) -> tuple[float, float]:
+    results = []
+    for warm in (False, True):
+        engine = create_async_engine(url, pool_size=pool_size)
+        if warm:
+            await warm_up_pool(engine, pool_size)
+        start = time.perf_counter()
+        await asyncio.gather(*(_worker(engine, 0, 1, [], []) for _ in range(pool_size)))
+        results.append((time.perf_counter() - start) * 1000)
+        await engine.dispose()
+    return results[0], results[1]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("concurrency", nargs="*", type=int, default=[5, 15, 30, 60])
+    parser.add_argument("--hold-ms", type=float, default=20)
+    parser.add_argument("--rounds", type=int, default=20, help="checkouts per task")
+    args = parser.parse_args()
+    url = os.environ["DATABASE_URL"]
+
+    cold, warm = await cold_vs_warm(url)
+    print(f"first 5 concurrent queries: cold pool {cold:.1f} ms   warmed pool {warm:.1f} ms\n")
+    print(f"hold {args.hold_ms:.0f} ms per checkout, {args.rounds} checkouts per task, pool_timeout {POOL_TIMEOUT:.0f}s")
+    print(f"{'pool':>10} {'tasks':>6} {'queries/s':>10} {'wait p50':>9} {'p95':>8} {'p99':>8} {'timeouts':>9}")
+    for size, overflow in PROFILES:
+        for concurrency in args.concurrency:
+            r = await saturate(url, size, overflow, concurrency, args.hold_ms, args.rounds)
+            print(f"{f'{size}+{overflow}':>10} {concurrency:>6} {r['qps']:>10.0f} {r['p50']:>7.1f}ms {r['p95']:>6.1f}ms {r['p99']:>6.1f}ms {r['timeouts']:>9}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+"""
+Compare two pytest-benchmark JSON results and flag regressions.
+
+    python -m benchmarks.compare BASELINE.json CURRENT.json [--threshold 0.10] [--stat median] [--update]
+
+Exits 1 when any benchmark's statistic grew by more than the threshold
+(a fraction: 0.10 = 10% slower). Benchmarks present in only one file are
+listed but never fail the run. --update then overwrites the baseline with
+the current results, minus the raw per-round timings.
+"""
+import argparse
+import json
+import sys
+
+
+def _load(path: str, stat: str) -> dict[str, float]:
+    with open(path) as f:
+        report = json.load(f)
+    return {b["fullname"]: b["stats"][stat] for b in report["benchmarks"]}
+
+
+def save_baseline(current_path: str, baseline_path: str) -> None:
+    with open(current_path) as f:
+        report = json.load(f)
+    for bench in report["benchmarks"]:
+        bench["stats"].pop("data", None)
+    with open(baseline_path, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+
+def compare(baseline: dict[str, float], current: dict[str, float], threshold: float) -> tuple[list[str], bool]:
+    lines, regressed = [], False
+    width = max((len(n) for n in baseline | current), default=0)
+    for name in sorted(baseline | current):
+        if name not in current or name not in baseline:
+            lines.append(f"{name:<{width}}  {'only in baseline' if name in baseline else 'new'}")
+            continue
+        before, after = baseline[name], current[name]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag, regressed = "  REGRESSION", True
+        lines.append(f"{name:<{width}}  {before * 1e6:>12.1f} µs → {after * 1e6:>12.1f} µs  {change:>+7.1%}{flag}")
+    return lines, regressed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown as a fraction (default 0.10)")
+    parser.add_argument("--stat", default="median", choices=["min", "median", "mean"])
+    parser.add_argument("--update", action="store_true", help="replace the baseline with the current results")
+    args = parser.parse_args(argv)
+
+    lines, regressed = compare(_load(args.baseline, args.stat), _load(args.current, args.stat), args.threshold)
+    print("\n".join(lines))
+    if regressed:
+        print(f"\nRegressions beyond {args.threshold:.0%} ({args.stat}).")
+    if args.update:
+        save_baseline(args.current, args.baseline)
+        print(f"\nBaseline {args.baseline} updated.")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
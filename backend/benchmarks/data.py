@@ -0,0 +1,123 @@
+"""
+Synthetic, ORM-shaped diary data for benchmarks (no database needed).
+
+Objects are SimpleNamespaces with the attributes the renderers and
+response models read, so they stand in for loaded model instances.
+"""
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from types import SimpleNamespace
+import numpy as np
+from app.models.entries import MealType
+from app.services.bp_category import classify_bp
+
+START = date(2025, 1, 6)
+READING_HOURS = (7, 12, 18, 22)
+
+
+def _tags(user_id: uuid.UUID) -> list[SimpleNamespace]:
+    return [SimpleNamespace(id=uuid.uuid4(), user_id=user_id, name=n, colour="#6366f1") for n in ("home", "work")]
+
+
+def user() -> SimpleNamespace:
+    from app.models.user import UserRole
+    return SimpleNamespace(id=uuid.uuid4(), email="bench@example.com", name="Alex Bench", role=UserRole.user)
+
+
+def bp_entries(days: int, readings_per_day: int = 4, seed: int = 0) -> list[SimpleNamespace]:
+    rng = np.random.default_rng(seed)
+    user_id = uuid.uuid4()
+    tags = _tags(user_id)
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    entries = []
+    for d in range(days):
+        day = START + timedelta(days=d)
+        entry_id = uuid.uuid4()
+        readings = []
+        for j in range(readings_per_day):
+            sys_, dia = int(rng.normal(132, 12)), int(rng.normal(84, 8))
+            readings.append(SimpleNamespace(
+                id=uuid.uuid4(), bp_entry_id=entry_id, systolic=sys_, diastolic=dia,
+                pulse=int(rng.normal(72, 6)) if j % 5 else None,
+                recorded_at=datetime.combine(day, time(READING_HOURS[j % 4]), timezone.utc),
+                order_index=j, category=classify_bp(sys_, dia),
+            ))
+        entries.append(SimpleNamespace(
+            id=entry_id, user_id=user_id, entry_date=day,
+            notes="Felt light-headed after standing." if d % 4 == 0 else None,
+            readings=readings, tags=tags, created_at=now, updated_at=now,
+        ))
+    return entries
+
+
+def symptoms(days: int) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(entry_date=START + timedelta(days=d), entry_time=time(9, 30), description="Mild headache behind the eyes", severity=d % 10 + 1)
+        for d in range(days) if d % 2 == 0
+    ]
+
+
+def foods(days: int) -> list[SimpleNamespace]:
+    meals = [(MealType.breakfast, "Porridge with berries"), (MealType.lunch, "Chicken salad"), (MealType.dinner, "Salmon, rice and greens")]
+    return [
+        SimpleNamespace(entry_date=START + timedelta(days=d), entry_time=time(8 + 5 * i), meal_type=m, description=desc)
+        for d in range(days) for i, (m, desc) in enumerate(meals)
+    ]
+
+
+def gym_entries(days: int) -> list[SimpleNamespace]:
+    user_id = uuid.uuid4()
+    tags = _tags(user_id)
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    entries = []
+    for d in range(0, days, 2):
+        entry_id = uuid.uuid4()
+        exercises = [
+            SimpleNamespace(id=uuid.uuid4(), gym_entry_id=entry_id, machine=name, duration_min=None,
+                            sets=3, reps=10, weight_kg=40.0 + d * 0.25 + i * 10, order_index=i)
+            for i, name in enumerate(("Bench press", "Lat pulldown", "Leg press"))
+        ]
+        exercises.append(SimpleNamespace(id=uuid.uuid4(), gym_entry_id=entry_id, machine="Rowing machine",
+                                         duration_min=15, sets=None, reps=None, weight_kg=None, order_index=3))
+        entries.append(SimpleNamespace(
+            id=entry_id, user_id=user_id, entry_date=START + timedelta(days=d), session_notes="Felt strong",
+            exercises=exercises, tags=tags, created_at=now, updated_at=now,
+        ))
+    return entries
+
+
+AI_SUMMARY = """# Weekly Health Summary
+
+## 1. Blood Pressure Trends
+
+Readings were taken on **6 of 7 days** (24 readings in total).
+
+| Period | Average | Range |
+|---|---|---|
+| Morning | 138/88 mmHg | 128–149 / 82–94 |
+| Evening | 129/83 mmHg | 121–137 / 78–88 |
+
+- Morning readings are consistently higher than evening readings
+- Two readings reached **High Stage 2** (149/94 on Tuesday, 145/92 on Friday)
+- No hypertensive crisis readings
+
+---
+
+## 2. Symptom Highlights
+
+- Headaches reported on *three* days, severity 3–5/10, usually mid-morning
+- Light-headedness after standing on Wednesday
+
+### Possible patterns
+1. Headaches coincide with the higher morning readings
+2. Symptoms eased on days with exercise
+
+## 3. Lifestyle Notes
+
+Three gym sessions were logged with progressive loads on the bench press.
+
+## 4. Key Observations for your GP
+
+- Morning hypertension pattern worth discussing
+- Consider reviewing the timing of **amlodipine**
+"""
@@ -0,0 +1,85 @@
+"""
+pytest-benchmark suite for backend hot paths. No database needed.
+
+    python -m pytest benchmarks --benchmark-json=current.json
+    python -m benchmarks.compare benchmarks/baselines/main.json current.json
+"""
+from datetime import date, timedelta
+import numpy as np
+import pytest
+from pydantic import TypeAdapter
+from app.routers.summaries import _iso_week_to_dates
+from app.schemas.entries import BPEntryOut, GymEntryOut
+from app.services.analytics import categorise
+from app.services.auth import create_access_token, decode_token
+from app.services.bp_category import classify_bp
+from app.services.pdf import DAILY_AGGREGATE_AFTER_DAYS, _bp_daily_aggregates, _build_html, _markdown_to_html
+from . import data
+
+BATCH = 100_000
+
+
+def test_markdown_to_html(benchmark):
+    html = benchmark(_markdown_to_html, data.AI_SUMMARY)
+    assert "<table" in html
+
+
+@pytest.mark.parametrize("days", [1, 7, 365], ids=["day", "week", "year"])
+def test_build_html(benchmark, days):
+    """Mirrors generate_pdf: ranges over DAILY_AGGREGATE_AFTER_DAYS tabulate BP per day."""
+    bp = data.bp_entries(days)
+    daily = None
+    if days > DAILY_AGGREGATE_AFTER_DAYS:
+        daily, bp = _bp_daily_aggregates(bp), []
+    args = (
+        data.user(), None, data.START, data.START + timedelta(days=days - 1),
+        bp, data.symptoms(days), data.foods(days), data.gym_entries(days), data.AI_SUMMARY, daily,
+    )
+    html = benchmark(_build_html, *args)
+    assert html.endswith("</html>")
+
+
+@pytest.fixture(scope="module")
+def bp_batch():
+    rng = np.random.default_rng(0)
+    return rng.normal(130, 18, BATCH).round(), rng.normal(84, 12, BATCH).round()
+
+
+def test_classify_bp_batch(benchmark, bp_batch):
+    pairs = list(zip(bp_batch[0].astype(int).tolist(), bp_batch[1].astype(int).tolist()))
+    result = benchmark(lambda: [classify_bp(s, d) for s, d in pairs])
+    assert len(result) == BATCH
+
+
+def test_categorise_batch(benchmark, bp_batch):
+    result = benchmark(categorise, *bp_batch)
+    assert result.size == BATCH
+
+
+@pytest.mark.parametrize("model,make", [
+    (BPEntryOut, lambda: data.bp_entries(100)),
+    (GymEntryOut, lambda: data.gym_entries(200)),
+], ids=["bp_entry_out", "gym_entry_out"])
+def test_serialise_list(benchmark, model, make):
+    """Validated from ORM-like objects and dumped to JSON, as a list endpoint does."""
+    adapter = TypeAdapter(list[model])
+    entries = make()
+    body = benchmark(lambda: adapter.dump_json(adapter.validate_python(entries, from_attributes=True)))
+    assert body.startswith(b"[")
+
+
+def test_jwt_encode(benchmark):
+    token = benchmark(create_access_token, data.user())
+    assert token.count(".") == 2
+
+
+def test_jwt_decode(benchmark):
+    token = create_access_token(data.user())
+    payload = benchmark(decode_token, token)
+    assert payload["type"] == "access"
+
+
+def test_iso_week_to_dates(benchmark):
+    weeks = [f"{year}-W{week:02d}" for year in (2025, 2026) for week in range(1, 53)]
+    result = benchmark(lambda: [_iso_week_to_dates(w) for w in weeks])
+    assert result[0] == (date(2024, 12, 30), date(2025, 1, 5))
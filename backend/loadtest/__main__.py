@@ -0,0 +1,84 @@
+"""
+Load test the API with scenarios that mirror the PWA's views.
+
+    python -m loadtest --host http://localhost:8000 --email me@example.com --password ... \\
+        --users 10,50,100 --duration 60
+
+Runs one stage per user count and prints throughput and p50/p95/p99 per
+endpoint. Start the backend with AI_PROVIDER=stub so summary generation
+doesn't call Anthropic.
+"""
+import argparse
+import asyncio
+import json
+import os
+from .runner import Account, run_stage
+from .scenarios import SCENARIOS
+
+COLUMNS = ("requests", "rps", "failures", "rate_limited", "not_modified", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+HEADINGS = ("reqs", "req/s", "fail", "429", "304", "p50 ms", "p95 ms", "p99 ms", "max ms")
+
+
+def _accounts(args) -> list[Account]:
+    if args.accounts:
+        with open(args.accounts) as f:
+            pairs = [line.strip().split(",", 1) for line in f if line.strip() and not line.startswith("#")]
+        return [Account(email, password) for email, password in pairs]
+    if not (args.email and args.password):
+        raise SystemExit("Pass --email/--password (or LOADTEST_EMAIL/LOADTEST_PASSWORD) or --accounts")
+    return [Account(args.email, args.password)]
+
+
+def _print_table(users: int, rows: list[dict], elapsed: float) -> None:
+    width = max([len("endpoint"), *(len(r["endpoint"]) for r in rows)])
+    print(f"\n{users} users, {elapsed:.0f}s")
+    print(f"{'endpoint':<{width}}  " + "  ".join(f"{h:>8}" for h in HEADINGS))
+    for row in rows:
+        print(f"{row['endpoint']:<{width}}  " + "  ".join(f"{row[c]:>8}" for c in COLUMNS))
+    total = sum(r["requests"] for r in rows)
+    print(f"{'total':<{width}}  {total:>8}  {total / elapsed:>8.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay the PWA's request patterns against a running backend.")
+    parser.add_argument("--host", default="http://localhost:8000", help="backend origin (API is under /api/v1)")
+    parser.add_argument("--email", default=os.environ.get("LOADTEST_EMAIL"))
+    parser.add_argument("--password", default=os.environ.get("LOADTEST_PASSWORD"))
+    parser.add_argument("--accounts", help="file of email,password lines; virtual users are spread across them")
+    parser.add_argument("--users", default="10", help="comma-separated user counts, one stage each (default 10)")
+    parser.add_argument("--duration", type=float, default=60, help="seconds per stage (default 60)")
+    parser.add_argument("--ramp-up", type=float, default=10, help="seconds to start all users (default 10)")
+    parser.add_argument("--think", default="1,5", help="min,max seconds between actions (default 1,5)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated subset of {', '.join(SCENARIOS)} (default: weighted mix of all)")
+    parser.add_argument("--history-days", type=int, default=365, help="how far back dates are picked (default 365)")
+    parser.add_argument("--relogin-rate", type=float, default=0.1,
+                        help="share of auth scenario runs that log in instead of refreshing (default 0.1)")
+    parser.add_argument("--json", help="also write the per-stage results to this file")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios.split(",")) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    mix = {name: SCENARIOS[name] for name in args.scenarios.split(",")}
+    think = tuple(float(x) for x in args.think.split(","))
+    accounts = _accounts(args)
+
+    results = []
+    for users in (int(n) for n in args.users.split(",")):
+        stats = asyncio.run(run_stage(
+            args.host.rstrip("/") + "/api/v1", accounts, mix,
+            users=users, duration=args.duration, ramp_up=args.ramp_up, think_time=think,
+            history_days=args.history_days, relogin_rate=args.relogin_rate,
+        ))
+        rows = stats.summary()
+        _print_table(users, rows, stats.elapsed)
+        results.append({"users": users, "elapsed": round(stats.elapsed, 1), "endpoints": rows})
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Minimal locust-style runner on asyncio + httpx.
+
+Virtual users start from their account's session, then loop: pick a scenario by weight, run it, think.
+Like the PWA they keep their access token in memory, refresh it on a 401
+and revalidate GETs with the ETag of the previous response.
+"""
+import asyncio
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+import httpx
+import numpy as np
+
+OK_STATUSES = (200, 201, 204, 304)
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    failures: int = 0
+    rate_limited: int = 0
+    not_modified: int = 0
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def record(self, name: str, status: int | None, seconds: float) -> None:
+        ep = self.endpoints[name]
+        ep.latencies.append(seconds)
+        if status == 429:
+            ep.rate_limited += 1
+        elif status == 304:
+            ep.not_modified += 1
+        elif status not in OK_STATUSES:
+            ep.failures += 1
+
+    def stop(self) -> None:
+        self.elapsed = time.perf_counter() - self.started
+
+    def summary(self) -> list[dict]:
+        rows = []
+        for name, ep in sorted(self.endpoints.items()):
+            ms = np.array(ep.latencies) * 1000
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            rows.append({
+                "endpoint": name,
+                "requests": len(ms),
+                "rps": round(len(ms) / self.elapsed, 2),
+                "failures": ep.failures,
+                "rate_limited": ep.rate_limited,
+                "not_modified": ep.not_modified,
+                "p50_ms": round(float(p50), 1),
+                "p95_ms": round(float(p95), 1),
+                "p99_ms": round(float(p99), 1),
+                "max_ms": round(float(ms.max()), 1),
+            })
+        return rows
+
+
+@dataclass
+class Account:
+    email: str
+    password: str
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, account: Account, stats: Stats, *, think_time: tuple[float, float],
+                 history_days: int, relogin_rate: float) -> None:
+        self.client = client
+        self.account = account
+        self.stats = stats
+        self.think_time = think_time
+        self.history_days = history_days
+        self.relogin_rate = relogin_rate
+        self.access_token: str | None = None
+        self._etags: dict[str, str] = {}
+
+    async def think(self) -> None:
+        await asyncio.sleep(random.uniform(*self.think_time))
+
+    async def _send(self, method: str, url: str, name: str, **kwargs) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(name, None, time.perf_counter() - start)
+            return None
+        self.stats.record(name, response.status_code, time.perf_counter() - start)
+        return response
+
+    async def login(self) -> bool:
+        response = await self._send(
+            "POST", "/auth/login", "POST /auth/login",
+            json={"email": self.account.email, "password": self.account.password},
+        )
+        if response is None or response.status_code != 200:
+            return False
+        self.access_token = response.json()["access_token"]
+        return True
+
+    async def refresh(self) -> bool:
+        response = await self._send("POST", "/auth/refresh", "POST /auth/refresh")
+        if response is None or response.status_code != 200:
+            return False
+        self.access_token = response.json()["access_token"]
+        return True
+
+    async def request(self, method: str, url: str, *, name: str, **kwargs) -> httpx.Response | None:
+        headers = kwargs.pop("headers", {})
+        cache_key = str(self.client.build_request(method, url, params=kwargs.get("params")).url)
+        if method == "GET" and cache_key in self._etags:
+            headers["If-None-Match"] = self._etags[cache_key]
+        for attempt in range(2):
+            headers["Authorization"] = f"Bearer {self.access_token}"
+            response = await self._send(method, url, name, headers=headers, **kwargs)
+            # Same as the axios interceptor: one refresh, one retry
+            if response is None or response.status_code != 401 or attempt or not await self.refresh():
+                break
+        if response is not None and method == "GET" and (etag := response.headers.get("etag")):
+            self._etags[cache_key] = etag
+        return response
+
+    async def get(self, url: str, *, name: str, **kwargs) -> httpx.Response | None:
+        return await self.request("GET", url, name=name, **kwargs)
+
+    async def post(self, url: str, *, name: str, **kwargs) -> httpx.Response | None:
+        return await self.request("POST", url, name=name, **kwargs)
+
+
+async def _user_loop(vu: VirtualUser, scenarios: list, weights: list[int], deadline: float) -> None:
+    if not await vu.refresh():  # first access token from the shared cookie
+        return
+    while time.perf_counter() < deadline:
+        scenario = random.choices(scenarios, weights)[0]
+        await scenario(vu)
+        await vu.think()
+
+
+async def run_stage(
+    base_url: str,
+    accounts: list[Account],
+    mix: dict[str, tuple],
+    *,
+    users: int,
+    duration: float,
+    ramp_up: float,
+    think_time: tuple[float, float],
+    history_days: int,
+    relogin_rate: float,
+) -> Stats:
+    """Run `users` virtual users for `duration` seconds, starting them evenly over `ramp_up`.
+
+    Each account logs in once; its virtual users share the refresh cookie
+    (refresh tokens are stateless) so the login rate limit isn't hit at
+    start-up. Login churn is then driven by the auth scenario.
+    """
+    stats = Stats()
+    scenarios = [fn for fn, _ in mix.values()]
+    weights = [w for _, w in mix.values()]
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as bootstrap:
+        cookies = {}
+        for account in accounts:
+            vu = VirtualUser(bootstrap, account, stats, think_time=think_time, history_days=history_days, relogin_rate=0)
+            if not await vu.login():
+                raise SystemExit(f"Login failed for {account.email}")
+            cookies[account.email] = httpx.Cookies(bootstrap.cookies)
+            bootstrap.cookies.clear()
+
+        deadline = time.perf_counter() + duration
+        clients, tasks = [], []
+        try:
+            for i in range(users):
+                account = accounts[i % len(accounts)]
+                client = httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120, cookies=cookies[account.email])
+                clients.append(client)
+                vu = VirtualUser(client, account, stats, think_time=think_time, history_days=history_days, relogin_rate=relogin_rate)
+                tasks.append(asyncio.create_task(_user_loop(vu, scenarios, weights, deadline)))
+                if ramp_up and i < users - 1:
+                    await asyncio.sleep(ramp_up / users)
+            await asyncio.gather(*tasks)
+        finally:
+            for client in clients:
+                await client.aclose()
+    stats.stop()
+    return stats
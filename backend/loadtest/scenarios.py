@@ -0,0 +1,93 @@
+"""
+Scenarios replaying the request patterns of the Vue views.
+
+Each scenario is one visit to a view: its calls are issued concurrently
+where the view uses Promise.allSettled, sequentially where it awaits.
+Requests are named after their route template so stats group per endpoint.
+"""
+import asyncio
+import random
+from datetime import date, timedelta
+from .runner import VirtualUser
+
+ENTRY_TYPES = ("bp", "symptom", "food", "gym")
+
+
+def _random_day(vu: VirtualUser) -> date:
+    return date.today() - timedelta(days=random.randrange(vu.history_days))
+
+
+def _week_of(day: date) -> tuple[date, date]:
+    start = day - timedelta(days=day.weekday())
+    return start, start + timedelta(days=6)
+
+
+async def _entry_lists(vu: VirtualUser, params: dict, types=ENTRY_TYPES) -> None:
+    await asyncio.gather(*(
+        vu.get(f"/entries/{t}", params=params, name=f"GET /entries/{t}") for t in types
+    ))
+
+
+async def dashboard(vu: VirtualUser) -> None:
+    """DashboardView: latest few entries of each type."""
+    await asyncio.gather(
+        vu.get("/entries/bp", params={"limit": 5}, name="GET /entries/bp"),
+        vu.get("/entries/symptom", params={"limit": 5}, name="GET /entries/symptom"),
+        vu.get("/entries/food", params={"limit": 5}, name="GET /entries/food"),
+        vu.get("/entries/gym", params={"limit": 3}, name="GET /entries/gym"),
+    )
+
+
+async def daily_log_week(vu: VirtualUser) -> None:
+    """DailyLogView: every entry type for one week."""
+    start, end = _week_of(_random_day(vu))
+    await _entry_lists(vu, {"start_date": start.isoformat(), "end_date": end.isoformat(), "limit": 100})
+
+
+async def calendar(vu: VirtualUser) -> None:
+    """CalendarView: month overview, then a few days opened one after another."""
+    day = _random_day(vu)
+    await vu.get(f"/entries/calendar/{day.year}/{day.month}", name="GET /entries/calendar/{year}/{month}")
+    for _ in range(random.randint(1, 3)):
+        await vu.think()
+        picked = day.replace(day=random.randint(1, 28)).isoformat()
+        await _entry_lists(vu, {"start_date": picked, "end_date": picked})
+
+
+async def auth_churn(vu: VirtualUser) -> None:
+    """Access-token expiry: mostly silent refreshes, occasionally a fresh login."""
+    if random.random() < vu.relogin_rate:
+        await vu.login()
+    else:
+        await vu.refresh()
+
+
+async def weekly_summary(vu: VirtualUser) -> None:
+    """WeeklySummaryView: load the week, generate the AI summary, export the PDF."""
+    start, end = _week_of(_random_day(vu))
+    iso = start.isocalendar()
+    iso_week = f"{iso.year}-W{iso.week:02d}"
+    params = {"start_date": start.isoformat(), "end_date": end.isoformat(), "limit": 100}
+    await asyncio.gather(
+        vu.get("/entries/bp", params=params, name="GET /entries/bp"),
+        vu.get("/entries/symptom", params=params, name="GET /entries/symptom"),
+        vu.get(f"/summaries/weekly/{iso_week}", name="GET /summaries/weekly/{iso_week}"),
+    )
+    await vu.think()
+    await vu.post(f"/summaries/weekly/{iso_week}/generate", name="POST /summaries/weekly/{iso_week}/generate")
+    await vu.think()
+    await vu.post(
+        "/export/pdf",
+        json={"type": "weekly", "start_date": start.isoformat(), "end_date": end.isoformat(), "include_summary": True},
+        name="POST /export/pdf",
+    )
+
+
+# name → (scenario, relative weight in the default mix)
+SCENARIOS = {
+    "dashboard": (dashboard, 6),
+    "week": (daily_log_week, 4),
+    "calendar": (calendar, 2),
+    "auth": (auth_churn, 2),
+    "summary": (weekly_summary, 1),
+}
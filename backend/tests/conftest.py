@@ -0,0 +1,59 @@
+"""
+Shared fixtures. Tests run against the database in DATABASE_URL (migrated
+to head) and are skipped when it isn't configured or reachable.
+"""
+import os
+import uuid
+import httpx
+import pytest
+
+# Importing app modules reads the settings, so pure-function tests need these
+# even without a database. The placeholder URL is never connected to: the
+# `app` fixture skips database tests unless DATABASE_URL was really set.
+DATABASE_CONFIGURED = "DATABASE_URL" in os.environ
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://unconfigured/unconfigured")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # One event loop for the whole session — pooled asyncpg connections are loop-bound
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def app(anyio_backend):
+    if not DATABASE_CONFIGURED:
+        pytest.skip("DATABASE_URL not set")
+    from sqlalchemy import text
+    from app.database import engine
+    from app.main import app
+
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as exc:  # noqa: BLE001
+        pytest.skip(f"database unreachable: {exc}")
+    return app
+
+
+@pytest.fixture
+async def user(app):
+    from app.database import AsyncSessionLocal
+    from app.services.auth import create_user
+
+    async with AsyncSessionLocal() as session:
+        return await create_user(
+            session, email=f"test-{uuid.uuid4().hex[:12]}@example.com", password="password1", name="Test",
+        )
+
+
+@pytest.fixture
+async def client(app, user):
+    # Token minted directly — going through /auth/login would trip its rate limit
+    from app.services.auth import create_access_token
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        c.headers["Authorization"] = f"Bearer {create_access_token(user)}"
+        yield c
@@ -0,0 +1,89 @@
+"""
+BP statistics on fixed inputs: category boundaries, the UTC morning/evening
+split and calendar-day rolling means.
+"""
+from datetime import date
+import numpy as np
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def _data(days, hours, systolic, diastolic, pulse=None):
+    n = len(systolic)
+    return np.array([days, hours, systolic, diastolic, pulse or [np.nan] * n], dtype=np.float64)
+
+
+@pytest.mark.parametrize("systolic, diastolic, label", [
+    (119, 79, "Normal"),
+    (120, 79, "Elevated"),
+    (129, 79, "Elevated"),
+    (130, 79, "High Stage 1"),
+    (119, 80, "High Stage 1"),
+    (139, 89, "High Stage 1"),
+    (140, 70, "High Stage 2"),
+    (110, 90, "High Stage 2"),
+    (180, 120, "High Stage 2"),
+    (181, 70, "Hypertensive Crisis"),
+    (110, 121, "Hypertensive Crisis"),
+    (89, 59, "Low (Hypotension)"),
+    (89, 60, "Normal"),
+    (90, 59, "Normal"),
+])
+def test_category_boundaries(systolic, diastolic, label):
+    from app.services.analytics import BP_CATEGORIES, categorise
+    from app.services.bp_category import BP_CATEGORY_LABELS, classify_bp
+
+    index = categorise(np.array([systolic]), np.array([diastolic]))[0]
+    assert BP_CATEGORIES[index] == label
+    assert BP_CATEGORY_LABELS[classify_bp(systolic, diastolic)] == label  # same table as the scalar classifier
+
+
+def test_morning_evening_split():
+    from app.services.analytics import compute_bp_statistics
+
+    stats = compute_bp_statistics(_data(
+        days=[0, 0, 0, 0, 0], hours=[3, 4, 11, 12, 16], systolic=[100, 120, 130, 150, 140], diastolic=[60, 80, 90, 95, 85],
+    ))
+    assert stats["morning"] == {"n": 2, "systolic_mean": 125.0, "diastolic_mean": 85.0}
+    assert stats["evening"] == {"n": 1, "systolic_mean": 140.0, "diastolic_mean": 85.0}
+
+
+def test_rolling_means_span_calendar_days():
+    from app.services.analytics import compute_bp_statistics
+
+    # Days 0, 1 and 9 (a gap of a week); two readings on day 1
+    day0 = (date(2026, 1, 1) - date(1970, 1, 1)).days
+    stats = compute_bp_statistics(_data(
+        days=[day0, day0 + 1, day0 + 1, day0 + 9], hours=[8] * 4, systolic=[120, 130, 140, 150], diastolic=[80, 80, 80, 90],
+    ))
+    rolling = stats["rolling"]
+    assert [p["date"] for p in rolling] == [date(2026, 1, 1), date(2026, 1, 2), date(2026, 1, 10)]
+    assert [p["systolic_7d"] for p in rolling] == [120.0, 130.0, 150.0]  # day 9's week excludes days 0–2
+    assert [p["systolic_30d"] for p in rolling] == [120.0, 130.0, 135.0]
+    assert [p["diastolic_30d"] for p in rolling] == [80.0, 80.0, 82.5]
+
+
+def test_empty():
+    from app.services.analytics import compute_bp_statistics
+
+    stats = compute_bp_statistics(np.empty((5, 0)))
+    assert stats["n"] == 0 and stats["rolling"] == [] and stats["morning"]["n"] == 0
+
+
+async def test_load_bp_arrays_uses_utc_hours(client, user):
+    from app.database import AsyncSessionLocal
+    from app.services.analytics import load_bp_arrays
+
+    r = await client.post("/api/v1/entries/bp", json={"entry_date": "2026-01-05", "readings": [
+        {"systolic": 125, "diastolic": 82, "pulse": 70, "recorded_at": "2026-01-05T07:30:00+05:00"},
+        {"systolic": 118, "diastolic": 76, "recorded_at": "2026-01-05T20:00:00Z"},
+    ]})
+    assert r.status_code == 201
+    async with AsyncSessionLocal() as session:
+        data = await load_bp_arrays(session, user.id, date(2026, 1, 5), date(2026, 1, 5))
+    days, hours, systolic, diastolic, pulse = data
+    assert days.tolist() == [(date(2026, 1, 5) - date(1970, 1, 1)).days] * 2
+    assert hours.tolist() == [2, 20]
+    assert systolic.tolist() == [125, 118]
+    assert pulse[0] == 70 and np.isnan(pulse[1])
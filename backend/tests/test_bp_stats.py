@@ -0,0 +1,49 @@
+"""
+bp_daily_stats stays exact when two transactions write the same day at once.
+"""
+import asyncio
+from datetime import date, datetime, timezone
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+DAY = date(2026, 3, 2)
+
+
+async def _add_reading(session, user_id, systolic):
+    from app.models.entries import BPEntry, BPReading
+    from app.services.bp_category import classify_bp
+
+    entry = BPEntry(user_id=user_id, entry_date=DAY)
+    session.add(entry)
+    await session.flush()
+    session.add(BPReading(
+        bp_entry_id=entry.id, systolic=systolic, diastolic=80, recorded_at=datetime(2026, 3, 2, 8, tzinfo=timezone.utc),
+        category=classify_bp(systolic, 80),
+    ))
+    await session.flush()
+
+
+async def test_concurrent_writes_to_one_day(user):
+    from sqlalchemy import select
+    from app.database import AsyncSessionLocal
+    from app.models.entries import BPDailyStats
+    from app.services.bp_stats import refresh_daily_stats
+
+    async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+        await _add_reading(first, user.id, 120)
+        await _add_reading(second, user.id, 140)
+        await refresh_daily_stats(first, user.id, {DAY})
+        # Blocks until `first` commits, then must see its reading
+        rebuild = asyncio.create_task(refresh_daily_stats(second, user.id, {DAY}))
+        await asyncio.sleep(0.2)
+        assert not rebuild.done()
+        await first.commit()
+        await rebuild
+        await second.commit()
+
+    async with AsyncSessionLocal() as session:
+        stats = (await session.execute(
+            select(BPDailyStats).where(BPDailyStats.user_id == user.id, BPDailyStats.day == DAY)
+        )).scalar_one()
+    assert (stats.n, stats.sys_sum, stats.sys_min, stats.sys_max) == (2, 260, 120, 140)
@@ -0,0 +1,80 @@
+"""
+Catalogue autocomplete (`?limit=`): prefix, word-prefix and substring
+matches ranked with the user's recent usage, capped at `limit`. Each test
+runs twice: ranked in Python over the user cache, and in SQL as for
+catalogues too big to cache.
+"""
+from datetime import date
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True, params=["cached", "sql"])
+def ranking(request, monkeypatch):
+    from app.config import get_settings
+
+    if request.param == "sql":
+        monkeypatch.setattr(get_settings(), "USER_CACHE_MAX_ITEMS", 0)
+    return request.param
+
+
+async def _post(client, path, body):
+    r = await client.post(path, json=body)
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+async def _names(client, path, **params):
+    r = await client.get(path, params=params)
+    assert r.status_code == 200, r.text
+    return [item["name"] for item in r.json()]
+
+
+@pytest.fixture
+async def foods(client):
+    ids = {}
+    for name in ("Cheddar cheese", "Chicken curry", "Fish and chips", "Spinach", "Orange juice"):
+        ids[name] = (await _post(client, "/api/v1/catalogue", {"name": name, "category": "food"}))["id"]
+    for _ in range(3):
+        await _post(client, "/api/v1/entries/food", {
+            "entry_date": date.today().isoformat(), "entry_time": "12:00:00", "meal_type": "lunch",
+            "description": "Fish and chips", "catalogue_item_id": ids["Fish and chips"],
+        })
+    return ids
+
+
+async def test_prefixes_rank_above_word_prefixes_and_substrings(client, foods):
+    names = await _names(client, "/api/v1/catalogue", search="ch", limit=8)
+    assert set(names[:2]) == {"Cheddar cheese", "Chicken curry"}
+    assert names[2] == "Fish and chips"
+    # Two-letter terms only look inside names the user has logged
+    assert "Spinach" not in names
+    assert await _names(client, "/api/v1/catalogue", search="nach", limit=8) == ["Spinach"]
+
+
+async def test_usage_and_limit(client, foods):
+    assert await _names(client, "/api/v1/catalogue", limit=2) == ["Fish and chips", "Cheddar cheese"]
+    assert len(await _names(client, "/api/v1/catalogue", search="ch", limit=1)) == 1
+    assert (await client.get("/api/v1/catalogue", params={"limit": 51})).status_code == 422
+
+
+async def test_like_wildcards_are_literal(client, foods):
+    assert await _names(client, "/api/v1/catalogue", search="_", limit=8) == []
+
+
+async def test_without_limit_lists_everything_by_name(client, foods):
+    assert await _names(client, "/api/v1/catalogue", search="ch") == [
+        "Cheddar cheese", "Chicken curry", "Fish and chips", "Spinach",
+    ]
+
+
+async def test_exercise_usage_breaks_prefix_ties(client):
+    for name in ("Leg press", "Leg curl", "Chest press"):
+        await _post(client, "/api/v1/exercise-catalogue", {"name": name})
+    for _ in range(2):
+        await _post(client, "/api/v1/entries/gym", {
+            "entry_date": date.today().isoformat(), "exercises": [{"machine": "leg curl"}],
+        })
+    assert await _names(client, "/api/v1/exercise-catalogue", search="leg", limit=8) == ["Leg curl", "Leg press"]
+    assert await _names(client, "/api/v1/exercise-catalogue", search="press", limit=8) == ["Chest press", "Leg press"]
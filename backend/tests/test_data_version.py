@@ -0,0 +1,54 @@
+"""
+Conditional GETs: the ETag follows users.data_version, which any write
+bumps in the writing transaction and reads leave alone.
+"""
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+SYMPTOMS = "/api/v1/entries/symptom"
+
+
+async def _versions(user_id):
+    from app.database import AsyncSessionLocal
+    from app.models.user import User
+
+    async with AsyncSessionLocal() as session:
+        user = await session.get(User, user_id)
+        return user.data_version, user.catalogue_version
+
+
+async def test_write_retires_the_etag(client):
+    etag = (await client.get(SYMPTOMS)).headers["etag"]
+    r = await client.get(SYMPTOMS, headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["etag"] == etag
+
+    r = await client.post(SYMPTOMS, json={"entry_date": "2026-01-10", "entry_time": "09:00:00", "description": "Headache"})
+    assert r.status_code == 201
+    r = await client.get(SYMPTOMS, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert [s["description"] for s in r.json()] == ["Headache"]
+
+
+async def test_reads_leave_the_version_alone(client, user):
+    before = await _versions(user.id)
+    for path in (SYMPTOMS, "/api/v1/tags", "/api/v1/catalogue", "/api/v1/entries/calendar/2026/1"):
+        assert (await client.get(path)).status_code == 200
+    assert await _versions(user.id) == before
+
+
+async def test_core_dml_counts_as_a_write(user):
+    from sqlalchemy import insert
+    from app.database import AsyncSessionLocal
+    from app.models.profile import Tag
+    from app.services.data_version import track_user
+
+    data, catalogue = await _versions(user.id)
+    async with AsyncSessionLocal() as session:
+        track_user(session, user.id)
+        # No ORM objects, so no flush sees this write
+        await session.execute(insert(Tag).values(user_id=user.id, name="core"))
+        await session.commit()
+    assert await _versions(user.id) == (data + 1, catalogue + 1)
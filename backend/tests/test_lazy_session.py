@@ -0,0 +1,37 @@
+"""
+Sessions check out a pooled connection on their first statement, so
+requests that are answered before any SQL runs never touch the pool.
+"""
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def _no_db(route: str) -> float:
+    from app.services.metrics import http_no_db
+    return http_no_db.value("GET", route)
+
+
+@pytest.mark.parametrize("headers, status", [
+    ({}, 403),
+    ({"Authorization": "Bearer not-a-token"}, 401),
+])
+async def test_rejected_auth_checks_out_no_connection(app, headers, status):
+    before = _no_db("/api/v1/tags")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        r = await c.get("/api/v1/tags", headers=headers)
+    assert r.status_code == status
+    assert _no_db("/api/v1/tags") == before + 1
+
+
+async def test_db_route_is_not_counted(client):
+    before = _no_db("/api/v1/tags")
+    assert (await client.get("/api/v1/tags")).status_code == 200
+    assert _no_db("/api/v1/tags") == before
+
+
+async def test_health_checks_out_no_connection(client):
+    before = _no_db("/health")
+    assert (await client.get("/health")).status_code == 200
+    assert _no_db("/health") == before + 1
@@ -0,0 +1,70 @@
+"""
+PDF export building blocks: per-day BP aggregation for long ranges, the
+chart series and the inline SVG chart. No database needed.
+"""
+import re
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from app.services.pdf import DAILY_AGGREGATE_AFTER_DAYS, _bp_chart_svg, _bp_daily_aggregates, _bp_series, _build_html
+
+
+def _entry(day: date, *readings: tuple) -> SimpleNamespace:
+    return SimpleNamespace(entry_date=day, readings=[
+        SimpleNamespace(
+            systolic=sys, diastolic=dia, pulse=pulse,
+            recorded_at=datetime.combine(day, datetime.min.time(), timezone.utc) + timedelta(hours=hour),
+        )
+        for hour, sys, dia, pulse in readings
+    ])
+
+
+def test_daily_aggregates():
+    d1, d2 = date(2026, 1, 1), date(2026, 1, 2)
+    daily = _bp_daily_aggregates([
+        _entry(d1, (8, 120, 80, 60), (20, 140, 90, None)),
+        _entry(d1, (22, 130, 70, 70)),  # a second entry on the same day joins its row
+        _entry(d2, (9, 118, 76, None)),
+    ])
+    assert daily == [
+        {"date": d1, "n": 3, "sys_avg": 130, "dia_avg": 80, "sys_min": 120, "sys_max": 140,
+         "dia_min": 70, "dia_max": 90, "pulse_avg": 65},
+        {"date": d2, "n": 1, "sys_avg": 118, "dia_avg": 76, "sys_min": 118, "sys_max": 118,
+         "dia_min": 76, "dia_max": 76, "pulse_avg": None},
+    ]
+
+
+def test_series_per_reading_or_per_day():
+    d1 = date(2026, 1, 1)
+    entries = [_entry(d1, (20, 140, 90, None), (8, 120, 80, 60))]
+    per_reading = _bp_series(entries, None)
+    assert [p[1:] for p in per_reading] == [(120, 80, 60), (140, 90, None)]  # in time order
+    assert per_reading[1][0] - per_reading[0][0] == 0.5  # x is in days
+    assert _bp_series(entries, _bp_daily_aggregates(entries)) == [(d1.toordinal(), 130, 85, 60)]
+
+
+def test_long_range_is_tabulated_per_day():
+    start = date(2026, 1, 1)
+    days = DAILY_AGGREGATE_AFTER_DAYS + 6
+    entries = [_entry(start + timedelta(days=i), (8, 120 + i, 80, None), (20, 130 + i, 84, None)) for i in range(days)]
+    daily = _bp_daily_aggregates(entries)
+    html = _build_html(
+        SimpleNamespace(name="Test", email="t@example.com"), None, start, start + timedelta(days=days - 1),
+        [], [], [], [], None, bp_daily=daily,
+    )
+    assert len(daily) == days
+    assert html.count("mmHg</td>") == days  # one table row per day, not per reading
+    assert "<td>2</td><td>125/82 mmHg</td><td>120–130 / 80–84</td>" in html
+    assert html.count("<circle") == 2 * days  # systolic and diastolic, one point per day
+
+
+def test_chart_empty():
+    assert _bp_chart_svg([], date(2026, 1, 1), date(2026, 1, 1)) == ""
+
+
+def test_chart_single_point():
+    svg = _bp_chart_svg([(20454.0, 128, 82, 70)], date(2026, 1, 1), date(2026, 1, 1))
+    assert svg.startswith("<svg") and svg.endswith("</svg>")
+    circles = re.findall(r'<circle cx="([\d.]+)" cy="([\d.]+)"', svg)
+    assert len(circles) == 3  # systolic, diastolic, pulse
+    assert {cx for cx, _ in circles} == {"363.0"}  # centred horizontally
+    assert len({cy for _, cy in circles}) == 3
@@ -0,0 +1,38 @@
+"""
+The PDF queue gauge must not leak when an export is cancelled before an
+executor thread picks it up.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from types import SimpleNamespace
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cancelled_export_leaves_queue_gauge_alone(app, user, monkeypatch):
+    from app.database import AsyncSessionLocal
+    from app.services import pdf
+    from app.services.metrics import pdf_queue_depth, pdf_rendering
+
+    # A one-thread executor kept busy, so the export waits in its queue
+    executor, release = ThreadPoolExecutor(max_workers=1), threading.Event()
+    executor.submit(release.wait)
+    loop = asyncio.get_running_loop()
+    fake_loop = SimpleNamespace(run_in_executor=lambda _, fn, *args: loop.run_in_executor(executor, fn, *args))
+    monkeypatch.setattr(pdf, "asyncio", SimpleNamespace(get_running_loop=lambda: fake_loop))
+
+    before = pdf_queue_depth.value()
+    async with AsyncSessionLocal() as session:
+        task = asyncio.create_task(pdf.generate_pdf(session, user, date(2026, 1, 1), date(2026, 1, 7), [], False))
+        while pdf_queue_depth.value() == before:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    release.set()
+    executor.shutdown()
+    assert pdf_queue_depth.value() == before
+    assert pdf_rendering.value() == 0
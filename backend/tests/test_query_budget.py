@@ -0,0 +1,85 @@
+"""
+Statement budgets per route. Data is seeded with several tagged entries per
+type so an N+1 (a query per entry, reading or tag) pushes a route over.
+Budgets include the user lookup made by get_current_user.
+"""
+import pytest
+from .utils import max_queries
+
+pytestmark = pytest.mark.anyio
+
+DAYS = ["2026-01-05", "2026-01-06", "2026-01-07", "2026-01-08"]
+
+
+async def _post(client, path, body):
+    r = await client.post(path, json=body)
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+@pytest.fixture
+async def seeded(client):
+    tags = [(await _post(client, "/api/v1/tags", {"name": n}))["id"] for n in ("home", "work")]
+    for day in DAYS:
+        readings = [
+            {"systolic": 118 + i * 9, "diastolic": 76 + i * 5, "pulse": 70, "recorded_at": f"{day}T{7 + i:02d}:00:00Z"}
+            for i in range(3)
+        ]
+        await _post(client, "/api/v1/entries/bp", {"entry_date": day, "tag_ids": tags, "readings": readings})
+        await _post(client, "/api/v1/entries/symptom", {
+            "entry_date": day, "entry_time": "09:00:00", "description": "Headache", "severity": 3, "tag_ids": tags,
+        })
+        await _post(client, "/api/v1/entries/food", {
+            "entry_date": day, "entry_time": "08:00:00", "meal_type": "breakfast", "description": "Toast", "tag_ids": tags,
+        })
+        await _post(client, "/api/v1/entries/gym", {
+            "entry_date": day, "tag_ids": tags,
+            "exercises": [{"machine": "Bench press", "sets": 3, "reps": 10}, {"machine": "Rowing", "duration_min": 10}],
+        })
+    await _post(client, "/api/v1/profile/diagnoses", {"condition_name": "Hypertension"})
+    await _post(client, "/api/v1/profile/medications", {"name": "Amlodipine", "dosage": "5mg", "frequency": "daily"})
+    return client
+
+
+READ_BUDGETS = [
+    ("/api/v1/entries/bp", 4),
+    (f"/api/v1/entries/bp?start_date={DAYS[0]}&end_date={DAYS[-1]}", 4),
+    ("/api/v1/entries/symptom", 3),
+    ("/api/v1/entries/food", 3),
+    ("/api/v1/entries/gym", 4),
+    ("/api/v1/entries/calendar/2026/1", 5),
+    ("/api/v1/profile", 5),
+    ("/api/v1/profile/diagnoses", 2),
+    ("/api/v1/profile/medications", 2),
+    ("/api/v1/tags", 2),
+    ("/api/v1/catalogue", 2),
+    ("/api/v1/exercise-catalogue", 2),
+    (f"/api/v1/summaries/daily/{DAYS[0]}", 2),
+    ("/api/v1/summaries/weekly/2026-W02", 2),
+    (f"/api/v1/analytics/bp?start_date={DAYS[0]}&end_date={DAYS[-1]}", 2),
+    (f"/api/v1/analytics/bp/concerning?start_date={DAYS[0]}&end_date={DAYS[-1]}", 2),
+]
+
+
+@pytest.mark.parametrize("path,budget", READ_BUDGETS)
+async def test_read_route_query_budget(seeded, path, budget):
+    with max_queries(budget):
+        r = await seeded.get(path)
+    assert r.status_code == 200
+
+
+async def test_bp_write_query_budget(seeded):
+    body = {
+        "entry_date": "2026-01-09",
+        "readings": [{"systolic": 120 + i, "diastolic": 80, "recorded_at": f"2026-01-09T{7 + i:02d}:00:00Z"} for i in range(5)],
+    }
+    with max_queries(11):
+        r = await seeded.post("/api/v1/entries/bp", json=body)
+    assert r.status_code == 201
+
+
+async def test_conditional_get_skips_entry_queries(seeded):
+    r = await seeded.get("/api/v1/entries/bp")
+    with max_queries(1):
+        r = await seeded.get("/api/v1/entries/bp", headers={"If-None-Match": r.headers["etag"]})
+    assert r.status_code == 304
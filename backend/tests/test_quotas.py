@@ -0,0 +1,89 @@
+"""
+Cost quotas and admission control on the summary routes, with the stub AI
+provider standing in for Anthropic.
+"""
+import asyncio
+import uuid
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+GENERATE = "/api/v1/summaries/daily/2026-01-05/generate"
+
+
+@pytest.fixture
+def settings(app, monkeypatch):
+    from app.config import get_settings
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "AI_PROVIDER", "stub")
+    monkeypatch.setattr(settings, "AI_STUB_LATENCY_MS", 0)
+    return settings
+
+
+async def test_quota_charges_cost_and_rejects_with_retry_after(client, user, settings, monkeypatch):
+    monkeypatch.setattr(settings, "QUOTA_PER_MINUTE", 10)  # two daily summaries at 5 units each
+
+    assert [(await client.post(GENERATE)).status_code for _ in range(2)] == [201, 201]
+    r = await client.post(GENERATE)
+    assert r.status_code == 429
+    assert 0 < int(r.headers["retry-after"]) <= 30
+
+    from app.database import AsyncSessionLocal
+    from app.models.user import UserRole
+    from app.services.auth import create_access_token, create_user
+
+    async with AsyncSessionLocal() as session:
+        admin = await create_user(session, f"admin-{uuid.uuid4().hex[:12]}@example.com", "password1", "Admin", UserRole.admin)
+    r = await client.get("/api/v1/admin/usage", headers={"Authorization": f"Bearer {create_access_token(admin)}"})
+    assert r.status_code == 200
+    rows = [row for row in r.json() if row["user_id"] == str(user.id)]
+    assert [(row["kind"], row["requests"], row["cost"], row["rejected"]) for row in rows] == [("summary_daily", 2, 10, 1)]
+
+
+async def test_admission_sheds_when_queue_full(client, settings, monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_MAX_AI", 0)
+    r = await client.post(GENERATE)
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == str(settings.ADMISSION_RETRY_AFTER)
+
+
+async def test_admission_counts_requests_from_the_start(client, settings, monkeypatch):
+    # A burst arrives before any of it reaches the model; only the free slot gets in
+    monkeypatch.setattr(settings, "ADMISSION_MAX_AI", 1)
+    monkeypatch.setattr(settings, "AI_STUB_LATENCY_MS", 200)
+    codes = await asyncio.gather(*(client.post(GENERATE) for _ in range(3)))
+    assert sorted(r.status_code for r in codes) == [201, 503, 503]
+    # The slot is given back once the route returns
+    assert (await client.post(GENERATE)).status_code == 201
+
+    from app.services.metrics import admission_slots
+    assert admission_slots.value("ai") == 0
+
+
+async def test_failed_work_is_refunded(client, user, settings, monkeypatch):
+    from fastapi import HTTPException
+    from app.routers import summaries
+
+    monkeypatch.setattr(settings, "QUOTA_PER_MINUTE", 5)  # exactly one daily summary
+
+    async def fail(*args):
+        raise HTTPException(status_code=502, detail="AI provider error")
+
+    with monkeypatch.context() as m:
+        m.setattr(summaries, "generate_daily_summary", fail)
+        assert [(await client.post(GENERATE)).status_code for _ in range(2)] == [502, 502]
+    assert (await client.post(GENERATE)).status_code == 201
+    assert (await client.post(GENERATE)).status_code == 429
+
+    from sqlalchemy import select
+    from app.database import AsyncSessionLocal
+    from app.models import UsageCounter
+
+    async with AsyncSessionLocal() as session:
+        row = (await session.execute(select(UsageCounter).where(UsageCounter.user_id == user.id))).scalar_one()
+    assert (row.requests, row.cost, row.rejected) == (1, 5, 1)
+
+
+async def test_usage_requires_admin(client):
+    assert (await client.get("/api/v1/admin/usage")).status_code == 403
@@ -0,0 +1,121 @@
+"""
+Rate limiter: bucket arithmetic on an injected clock, client IP resolution
+and the shared Postgres storage. Only the last two need a database.
+"""
+import uuid
+import pytest
+from starlette.requests import Request
+from app.services.rate_limit import MemoryStorage, PostgresStorage, RateLimiter, parse_rate
+
+pytestmark = pytest.mark.anyio
+
+PRIVATE = "127.0.0.0/8,10.0.0.0/8"
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _request(peer: str, forwarded: str | None = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "headers": headers, "client": (peer, 1234)})
+
+
+@pytest.mark.parametrize("value, limit, period", [
+    ("5/minute", 5, 60), ("100 per hour", 100, 3600), ("20/5minutes", 20, 300), ("1/second", 1, 1),
+])
+def test_parse_rate(value, limit, period):
+    rate = parse_rate(value)
+    assert (rate.limit, rate.period) == (limit, period)
+
+
+@pytest.mark.parametrize("value", ["5", "0/minute", "5/fortnight"])
+def test_parse_rate_rejects(value):
+    with pytest.raises(ValueError):
+        parse_rate(value)
+
+
+async def test_memory_bucket_bursts_then_refills():
+    clock = Clock()
+    limiter = RateLimiter(MemoryStorage(clock))
+    rate = parse_rate("5/minute")
+
+    assert [await limiter.hit("k", rate) for _ in range(5)] == [0] * 5
+    assert await limiter.hit("k", rate) == pytest.approx(12)
+    assert await limiter.hit("other", rate) == 0
+
+    clock.now += 12
+    assert await limiter.hit("k", rate) == 0
+    assert await limiter.hit("k", rate) == pytest.approx(12)
+
+
+async def test_cost_weighted_hits():
+    limiter = RateLimiter(MemoryStorage(Clock()))
+    rate = parse_rate("10/minute")
+    assert await limiter.hit("k", rate, cost=8) == 0
+    assert await limiter.hit("k", rate, cost=3) == pytest.approx(6)
+    assert await limiter.hit("k", rate, cost=2) == 0
+    with pytest.raises(ValueError):
+        await limiter.hit("k", rate, cost=11)
+
+
+async def test_refund_gives_back_a_hit():
+    limiter = RateLimiter(MemoryStorage(Clock()))
+    rate = parse_rate("10/minute")
+    assert await limiter.hit("k", rate, cost=8) == 0
+    await limiter.refund("k", rate, cost=8)
+    assert await limiter.hit("k", rate, cost=10) == 0
+
+
+@pytest.mark.parametrize("peer, forwarded, client", [
+    ("203.0.113.7", None, "203.0.113.7"),
+    ("10.0.0.2", "203.0.113.7", "203.0.113.7"),
+    ("10.0.0.2", "198.51.100.1, 203.0.113.7", "203.0.113.7"),  # leftmost entry is client-supplied
+    ("10.0.0.2", "203.0.113.7, 10.0.0.3", "203.0.113.7"),  # two proxies
+    ("203.0.113.7", "198.51.100.1", "203.0.113.7"),  # untrusted peer can't forward
+])
+def test_client_ip(peer, forwarded, client):
+    assert RateLimiter(MemoryStorage(), PRIVATE).client_ip(_request(peer, forwarded)) == client
+
+
+@pytest.mark.parametrize("peer, client", [
+    ("127.0.0.1", "203.0.113.7"),  # host nginx
+    ("172.18.0.1", "203.0.113.7"),  # docker bridge gateway / frontend container
+    ("192.168.1.50", "192.168.1.50"),  # a LAN host hitting :8000 directly can't pick its address
+    ("10.0.4.2", "10.0.4.2"),
+])
+def test_client_ip_default_trusts_only_the_local_hop(peer, client):
+    from app.config import Settings
+
+    proxies = Settings.model_fields["RATE_LIMIT_TRUSTED_PROXIES"].default
+    assert RateLimiter(MemoryStorage(), proxies).client_ip(_request(peer, "203.0.113.7")) == client
+
+
+async def test_postgres_storage_shares_buckets(app):
+    from app.database import engine
+
+    key = f"test:{uuid.uuid4().hex}"
+    rate = parse_rate("3/minute")
+    workers = [RateLimiter(PostgresStorage(engine)) for _ in range(2)]
+    assert [await workers[i % 2].hit(key, rate) for i in range(3)] == [0] * 3
+    assert 0 < await workers[0].hit(key, rate) <= 20
+    assert 0 < await workers[1].hit(key, rate) <= 20
+
+
+async def test_login_limit_uses_forwarded_client(app):
+    import httpx
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        body = {"email": "nobody@example.com", "password": "wrong"}
+        blocked = {"X-Forwarded-For": f"198.51.100.{uuid.uuid4().int % 250}"}
+        statuses = [(await c.post("/api/v1/auth/login", json=body, headers=blocked)).status_code for _ in range(6)]
+        assert statuses == [401] * 5 + [429]
+        r = await c.post("/api/v1/auth/login", json=body, headers=blocked)
+        assert r.status_code == 429 and int(r.headers["retry-after"]) > 0
+
+        other = {"X-Forwarded-For": "192.0.2.44"}
+        assert (await c.post("/api/v1/auth/login", json=body, headers=other)).status_code == 401
@@ -0,0 +1,78 @@
+"""
+Read-only routes go to the replica session unless the user wrote recently.
+The "replica" here is the test database behind a read-only engine.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import update
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def replica(app, monkeypatch):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from app.routers import deps
+
+    engine = create_async_engine(
+        os.environ["DATABASE_URL"], connect_args={"server_settings": {"default_transaction_read_only": "on"}},
+    )
+    monkeypatch.setattr(deps, "ReadSessionLocal", async_sessionmaker(engine, expire_on_commit=False))
+    yield
+    await engine.dispose()
+
+
+def _routed():
+    from app.services.metrics import read_routing
+    return read_routing.value("replica"), read_routing.value("primary")
+
+
+async def _get_tags(client) -> tuple[list, str]:
+    before = _routed()
+    r = await client.get("/api/v1/tags")
+    assert r.status_code == 200, r.text
+    after = _routed()
+    return r.json(), "replica" if after[0] > before[0] else "primary"
+
+
+async def test_reads_use_replica_until_user_writes(client, replica):
+    assert (await _get_tags(client))[1] == "replica"
+
+    r = await client.post("/api/v1/tags", json={"name": "fresh"})
+    assert r.status_code == 201
+    tags, routed = await _get_tags(client)
+    assert routed == "primary"
+    assert [t["name"] for t in tags] == ["fresh"]
+
+
+async def test_stickiness_expires(client, user, replica):
+    from app.database import AsyncSessionLocal
+    from app.models.user import User
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(User).where(User.id == user.id).values(data_written_at=datetime.now(timezone.utc) - timedelta(minutes=1))
+        )
+        await session.commit()
+    assert (await _get_tags(client))[1] == "replica"
+
+
+async def test_without_replica_reads_use_primary(client):
+    assert (await _get_tags(client))[1] == "primary"
+
+
+async def test_replica_bodies_carry_no_etag(client, replica, monkeypatch):
+    # Fresh user: no writes yet, so reads go to the replica
+    r = await client.get("/api/v1/tags")
+    assert r.status_code == 200 and "etag" not in r.headers
+
+    assert (await client.post("/api/v1/tags", json={"name": "fresh"})).status_code == 201
+    r = await client.get("/api/v1/tags")  # on the primary while the write is recent
+    etag = r.headers["etag"]
+    # An ETag from a primary read still revalidates once reads go back to the replica
+    from app.config import get_settings
+    monkeypatch.setattr(get_settings(), "READ_AFTER_WRITE_SECONDS", 0)
+    assert (await client.get("/api/v1/tags", headers={"If-None-Match": etag})).status_code == 304
+    r = await client.get("/api/v1/tags")
+    assert r.status_code == 200 and "etag" not in r.headers
@@ -0,0 +1,92 @@
+"""
+GET /search: matching across entry types, ranking, highlighting and
+keyset pagination.
+"""
+import base64
+import json
+import pytest
+from .utils import max_queries
+
+pytestmark = pytest.mark.anyio
+
+
+async def _post(client, path, body):
+    r = await client.post(path, json=body)
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+@pytest.fixture
+async def diary(client):
+    ids = {}
+    ids["migraine"] = (await _post(client, "/api/v1/entries/symptom", {
+        "entry_date": "2026-01-10", "entry_time": "21:00:00", "description": "Migraine behind the left eye",
+        "severity": 7, "notes": "Started an hour after dinner",
+    }))["id"]
+    ids["old_migraine"] = (await _post(client, "/api/v1/entries/symptom", {
+        "entry_date": "2025-06-01", "entry_time": "09:00:00", "description": "Headache", "notes": "Mild migraines again",
+    }))["id"]
+    ids["wine"] = (await _post(client, "/api/v1/entries/food", {
+        "entry_date": "2026-01-10", "entry_time": "19:30:00", "meal_type": "dinner",
+        "description": "Steak and a glass of red wine", "notes": "Shared fish & chips",
+    }))["id"]
+    await _post(client, "/api/v1/entries/bp", {
+        "entry_date": "2026-01-11", "notes": "After migraine, felt tired",
+        "readings": [{"systolic": 130, "diastolic": 85, "recorded_at": "2026-01-11T08:00:00Z"}],
+    })
+    return ids
+
+
+async def test_search_ranks_and_highlights(client, diary):
+    r = await client.get("/api/v1/search", params={"q": "migraine"})
+    assert r.status_code == 200
+    hits = r.json()["hits"]
+    assert {h["type"] for h in hits} == {"symptom", "bp"}
+    # Description matches are weighted above notes
+    assert hits[0]["id"] == diary["migraine"]
+    assert "<mark>Migraine</mark>" in hits[0]["snippet"]
+    assert r.json()["next_cursor"] is None
+
+
+async def test_search_escapes_entry_text(client, diary):
+    hits = (await client.get("/api/v1/search", params={"q": "red wine"})).json()["hits"]
+    assert [h["id"] for h in hits] == [diary["wine"]]
+    assert "fish &amp; chips" in hits[0]["snippet"]
+    assert "<mark>red</mark> <mark>wine</mark>" in hits[0]["snippet"]
+
+
+async def test_search_filters_and_sorts(client, diary):
+    params = {"q": "migraine", "type": "symptom", "sort": "recent"}
+    hits = (await client.get("/api/v1/search", params=params)).json()["hits"]
+    assert [h["id"] for h in hits] == [diary["migraine"], diary["old_migraine"]]
+
+
+@pytest.mark.parametrize("sort", ["relevance", "recent"])
+async def test_cursor_pages_cover_every_hit_once(client, diary, sort):
+    everything = (await client.get("/api/v1/search", params={"q": "migraine", "sort": sort})).json()["hits"]
+    seen, cursor = [], None
+    while True:
+        params = {"q": "migraine", "sort": sort, "limit": 1, **({"cursor": cursor} if cursor else {})}
+        with max_queries(2):  # user lookup + search
+            page = (await client.get("/api/v1/search", params=params)).json()
+        seen += [h["id"] for h in page["hits"]]
+        if not (cursor := page["next_cursor"]):
+            break
+    assert seen == [h["id"] for h in everything]
+    assert len(seen) == 3
+
+
+def _cursor(key) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    _cursor(["high", "2026-01-10", "symptom", "00000000-0000-0000-0000-000000000000"]),  # rank not a number
+    _cursor(["0.5", "2026-01-10", "symptom", 42]),  # id not a string
+    _cursor(["0.5", "2026-01-10", "symptom"]),
+    _cursor({"rank": "0.5"}),
+])
+async def test_bad_cursor(client, cursor):
+    r = await client.get("/api/v1/search", params={"q": "x", "cursor": cursor})
+    assert r.status_code == 400
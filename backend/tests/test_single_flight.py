@@ -0,0 +1,96 @@
+"""
+Single-flight coalescing: a stub ASGI app held open on an event shows
+which requests share a run, then the real app is hit concurrently.
+"""
+import asyncio
+import uuid
+from types import SimpleNamespace
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+class HeldApp:
+    """Answers GETs once `release` is set, counting how often it ran."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.runs: list[str] = []
+
+    async def __call__(self, scope, receive, send):
+        self.runs.append(f"{scope['method']} {scope['path']}?{scope['query_string'].decode()}")
+        body = f"run {len(self.runs)}".encode()
+        if scope["method"] == "GET":
+            await self.release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+
+@pytest.fixture
+def held(app):
+    from app.middleware import SingleFlightMiddleware
+    from app.services.auth import create_access_token
+
+    inner = HeldApp()
+    user = SimpleNamespace(id=uuid.uuid4(), email="x@example.com", name="X", role=SimpleNamespace(value="user"))
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=SingleFlightMiddleware(inner, prefixes=("/api/v1/entries",))),
+        base_url="http://test", headers={"Authorization": f"Bearer {create_access_token(user)}"},
+    )
+    return inner, client
+
+
+async def _settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def test_identical_gets_share_one_run(held):
+    inner, client = held
+    urls = ["/api/v1/entries/bp?page=1&limit=20", "/api/v1/entries/bp?limit=20&page=1", "/api/v1/entries/bp?page=1&limit=20",
+            "/api/v1/entries/bp?page=2&limit=20"]
+    requests = [asyncio.ensure_future(client.get(url)) for url in urls]
+    await _settle()
+    inner.release.set()
+    bodies = [(await r).text for r in requests]
+    assert len(inner.runs) == 2
+    assert bodies[0] == bodies[1] == bodies[2] != bodies[3]
+
+
+async def test_unauthenticated_and_other_paths_are_not_coalesced(held):
+    inner, client = held
+    requests = [asyncio.ensure_future(client.get("/api/v1/analytics/bp")) for _ in range(2)]
+    requests += [asyncio.ensure_future(client.get("/api/v1/entries/bp", headers={"Authorization": ""})) for _ in range(2)]
+    await _settle()
+    inner.release.set()
+    await asyncio.gather(*requests)
+    assert len(inner.runs) == 4
+
+
+async def test_write_detaches_in_flight_reads(held):
+    inner, client = held
+    before = asyncio.ensure_future(client.get("/api/v1/entries/bp"))
+    await _settle()
+    assert (await client.post("/api/v1/entries/bp")).status_code == 200
+    after = asyncio.ensure_future(client.get("/api/v1/entries/bp"))
+    await _settle()
+    inner.release.set()
+    await asyncio.gather(before, after)
+    assert inner.runs.count("GET /api/v1/entries/bp?") == 2
+
+
+async def test_concurrent_reads_on_real_routes(client):
+    from app.config import get_settings
+    from app.services.metrics import single_flight
+
+    if not get_settings().SINGLE_FLIGHT:
+        pytest.skip("SINGLE_FLIGHT disabled")
+
+    r = await client.post("/api/v1/tags", json={"name": "morning"})
+    assert r.status_code == 201
+    before = single_flight.value("/api/v1/tags", "follower")
+    responses = await asyncio.gather(*(client.get("/api/v1/tags") for _ in range(4)))
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.text for r in responses}) == 1
+    assert single_flight.value("/api/v1/tags", "follower") > before
@@ -0,0 +1,74 @@
+"""
+Slow-query recorder: parameter redaction, the bounded buffer and which
+statements are safe to re-run under EXPLAIN ANALYZE.
+"""
+import uuid
+from datetime import date, datetime
+import pytest
+from app.services import slow_queries
+from app.services.slow_queries import _explain, _explain_options, _redact_params, get_slow_queries, install_slow_query_log
+
+pytestmark = pytest.mark.anyio
+
+
+def test_redact_params():
+    assert _redact_params({"email": "a@example.com", "id": uuid.uuid4(), "n": 3, "x": None}) == {
+        "email": "<str:13>", "id": "<uuid>", "n": "<int>", "x": None,
+    }
+    assert _redact_params(("secret", date(2026, 1, 1), datetime(2026, 1, 1), [1, 2], 1.5)) == [
+        "<str:6>", "<date>", "<datetime>", "<list:2>", "<float>",
+    ]
+    assert _redact_params(None) == []
+
+
+@pytest.mark.parametrize("statement, options", [
+    ("SELECT * FROM food_entries WHERE user_id = $1", "(ANALYZE, BUFFERS)"),
+    ("  select count(*) from bp_readings", "(ANALYZE, BUFFERS)"),
+    ("SELECT pg_advisory_xact_lock(hashtextextended($1, 0))", "(COSTS)"),
+    ("SELECT set_config('jit', 'off', true)", "(COSTS)"),
+    ("SELECT * FROM users WHERE id = $1 FOR UPDATE", "(COSTS)"),
+    ("SELECT * FROM users WHERE id = $1 for no key update", "(COSTS)"),
+    ("SELECT nextval('seq')", "(COSTS)"),
+    ("UPDATE users SET name = $1", None),
+    ("WITH gone AS (DELETE FROM tags RETURNING id) SELECT count(*) FROM gone", None),
+])
+def test_explain_options(statement, options):
+    assert _explain_options(statement) == options
+
+
+@pytest.fixture
+async def engine(app):
+    import os
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(os.environ["DATABASE_URL"])
+    yield engine
+    await engine.dispose()
+    slow_queries._records.clear()
+
+
+async def test_buffer_keeps_the_most_recent(engine):
+    from sqlalchemy import text
+
+    install_slow_query_log(engine, threshold_ms=0, hash_key="k", capacity=3)
+    async with engine.connect() as conn:
+        for i in range(5):
+            await conn.execute(text(f"SELECT {i}"))
+    assert [r["statement"] for r in get_slow_queries()] == ["SELECT 4", "SELECT 3", "SELECT 2"]
+    assert [r["statement"] for r in get_slow_queries(limit=1)] == ["SELECT 4"]
+
+
+async def test_explain_is_bounded_and_skips_side_effects(engine, monkeypatch):
+    record = {}
+    await _explain(engine, record, "SELECT count(*) FROM generate_series(1, 2)", ())
+    assert "actual time" in record["explain"]
+
+    # Plain EXPLAIN doesn't take the lock, so it returns even while another session holds it
+    async with engine.connect() as holder:
+        await holder.exec_driver_sql("SELECT pg_advisory_xact_lock(4242)")
+        await _explain(engine, record, "SELECT pg_advisory_xact_lock(4242)", ())
+        assert record["explain"].startswith("Result") and "actual time" not in record["explain"]
+
+    monkeypatch.setattr(slow_queries, "EXPLAIN_TIMEOUT_MS", 50)
+    await _explain(engine, record, "SELECT count(*) FROM generate_series(1, 100000000)", ())
+    assert record["explain"].startswith("EXPLAIN failed") and "statement timeout" in record["explain"]
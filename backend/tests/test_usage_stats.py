@@ -0,0 +1,130 @@
+"""
+Quick-log suggestions (`/catalogue/suggestions`, `/exercise-catalogue/suggestions`)
+and the usage statistics behind them, kept in step with entry writes.
+"""
+from datetime import date, timedelta
+import pytest
+from .utils import max_queries
+
+pytestmark = pytest.mark.anyio
+
+
+async def _post(client, path, body):
+    r = await client.post(path, json=body)
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+async def _names(client, path, **params):
+    r = await client.get(path, params=params)
+    assert r.status_code == 200, r.text
+    return [item["name"] for item in r.json()]
+
+
+async def _log(client, item_id, meal_type, at, day=None):
+    return await _post(client, "/api/v1/entries/food", {
+        "entry_date": (day or date.today()).isoformat(), "entry_time": at, "meal_type": meal_type,
+        "description": "-", "catalogue_item_id": item_id,
+    })
+
+
+@pytest.fixture
+async def foods(client):
+    return {
+        name: (await _post(client, "/api/v1/catalogue", {"name": name, "category": "food"}))["id"]
+        for name in ("Porridge", "Sandwich", "Soup", "Curry")
+    }
+
+
+async def _stats(user_id):
+    from sqlalchemy import select
+    from app.database import AsyncSessionLocal
+    from app.models import ExerciseUsageStats, FoodUsageStats
+
+    async with AsyncSessionLocal() as session:
+        food = (await session.execute(
+            select(FoodUsageStats.meal_type, FoodUsageStats.catalogue_item_id, FoodUsageStats.hour, FoodUsageStats.uses, FoodUsageStats.weight)
+            .where(FoodUsageStats.user_id == user_id)
+        )).all()
+        exercises = (await session.execute(
+            select(ExerciseUsageStats.name, ExerciseUsageStats.uses, ExerciseUsageStats.weight)
+            .where(ExerciseUsageStats.user_id == user_id)
+        )).all()
+    return sorted(map(tuple, food), key=str), sorted(map(tuple, exercises))
+
+
+async def _assert_matches_rebuild(user_id):
+    from app.database import AsyncSessionLocal
+    from app.services.usage_stats import backfill_usage_stats
+
+    incremental = await _stats(user_id)
+    async with AsyncSessionLocal() as session:
+        await backfill_usage_stats(session, user_id)
+        await session.commit()
+    rebuilt = await _stats(user_id)
+    for kept, fresh in zip(incremental, rebuilt):
+        assert [row[:-1] for row in kept] == [row[:-1] for row in fresh]
+        assert [row[-1] for row in kept] == pytest.approx([row[-1] for row in fresh], rel=1e-9)
+
+
+async def test_suggests_by_meal_and_hour(client, foods):
+    for _ in range(2):
+        await _log(client, foods["Porridge"], "breakfast", "08:00:00")
+        await _log(client, foods["Sandwich"], "lunch", "12:10:00")
+    await _log(client, foods["Soup"], "lunch", "13:30:00")
+    await _log(client, foods["Curry"], "dinner", "19:00:00")
+
+    path = "/api/v1/catalogue/suggestions"
+    assert await _names(client, path, meal_type="breakfast", at="08:30") == ["Porridge"]
+    assert await _names(client, path, meal_type="lunch", at="12:00") == ["Sandwich", "Soup"]
+    # Uses at the asked-for hour count double those an hour either side
+    await _log(client, foods["Soup"], "lunch", "13:45:00")
+    assert await _names(client, path, meal_type="lunch", at="13:00") == ["Soup", "Sandwich"]
+    assert (await _names(client, path, at="08:00", limit=2))[0] == "Porridge"
+    with max_queries(2):  # user lookup + suggestions
+        await client.get(path, params={"meal_type": "lunch"})
+
+
+async def test_recent_uses_outweigh_old_ones(client, foods):
+    long_ago = date.today() - timedelta(days=200)
+    for _ in range(5):
+        await _log(client, foods["Porridge"], "breakfast", "08:00:00", long_ago)
+    await _log(client, foods["Soup"], "breakfast", "08:00:00")
+    assert await _names(client, "/api/v1/catalogue/suggestions", meal_type="breakfast", at="08:00") == ["Soup", "Porridge"]
+
+
+async def test_edits_and_deletes_move_the_counts(client, user, foods):
+    entry = await _log(client, foods["Curry"], "lunch", "12:00:00")
+    await _log(client, foods["Soup"], "dinner", "18:00:00")
+    await _log(client, None, "dinner", "18:00:00")  # free text: not counted
+    r = await client.patch(f"/api/v1/entries/food/{entry['id']}", json={"meal_type": "dinner", "entry_time": "19:00:00"})
+    assert r.status_code == 200
+    path = "/api/v1/catalogue/suggestions"
+    assert await _names(client, path, meal_type="lunch") == []
+    assert await _names(client, path, meal_type="dinner", at="19:00") == ["Curry", "Soup"]
+    await _assert_matches_rebuild(user.id)
+
+    assert (await client.delete(f"/api/v1/entries/food/{entry['id']}")).status_code == 204
+    assert await _names(client, path, meal_type="dinner", at="19:00") == ["Soup"]
+    await _assert_matches_rebuild(user.id)
+
+
+async def test_exercise_suggestions(client, user):
+    for name in ("Leg press", "Rowing machine", "Treadmill"):
+        await _post(client, "/api/v1/exercise-catalogue", {"name": name})
+    today = date.today().isoformat()
+    sessions = [
+        await _post(client, "/api/v1/entries/gym", {"entry_date": today, "exercises": [{"machine": "treadmill"}, {"machine": "Leg press"}]}),
+        await _post(client, "/api/v1/entries/gym", {"entry_date": today, "exercises": [{"machine": "Treadmill"}, {"machine": "treadmill"}]}),
+    ]
+    path = "/api/v1/exercise-catalogue/suggestions"
+    assert await _names(client, path) == ["Treadmill", "Leg press"]
+
+    r = await client.patch(f"/api/v1/entries/gym/{sessions[1]['id']}", json={"exercises": [{"machine": "Rowing machine"}]})
+    assert r.status_code == 200
+    assert set(await _names(client, path)) == {"Leg press", "Rowing machine", "Treadmill"}
+    await _assert_matches_rebuild(user.id)
+
+    assert (await client.delete(f"/api/v1/entries/gym/{sessions[0]['id']}")).status_code == 204
+    assert await _names(client, path, limit=1) == ["Rowing machine"]
+    await _assert_matches_rebuild(user.id)
@@ -0,0 +1,111 @@
+"""
+Per-user cache of tags and catalogues: served without queries while the
+user's catalogue_version holds, refreshed when it moves.
+"""
+import uuid
+import pytest
+from .utils import max_queries
+
+pytestmark = pytest.mark.anyio
+
+
+async def _versions(user_id):
+    from app.database import AsyncSessionLocal
+    from app.models.user import User
+
+    async with AsyncSessionLocal() as session:
+        user = await session.get(User, user_id)
+        return user.data_version, user.catalogue_version
+
+
+async def test_lists_are_served_from_cache(client):
+    assert (await client.post("/api/v1/tags", json={"name": "work"})).status_code == 201
+    assert (await client.post("/api/v1/exercise-catalogue", json={"name": "Rowing"})).status_code == 201
+    await client.get("/api/v1/tags")
+    await client.get("/api/v1/exercise-catalogue")
+    with max_queries(1):  # user lookup
+        assert [t["name"] for t in (await client.get("/api/v1/tags")).json()] == ["work"]
+    with max_queries(1):
+        assert [e["name"] for e in (await client.get("/api/v1/exercise-catalogue", params={"search": "row"})).json()] == ["Rowing"]
+
+
+async def test_only_tag_and_catalogue_writes_move_catalogue_version(client, user):
+    data, catalogue = await _versions(user.id)
+    assert (await client.post("/api/v1/tags", json={"name": "travel"})).status_code == 201
+    assert await _versions(user.id) == (data + 1, catalogue + 1)
+    assert (await client.post("/api/v1/entries/symptom", json={
+        "entry_date": "2026-01-10", "entry_time": "09:00:00", "description": "Headache",
+    })).status_code == 201
+    assert await _versions(user.id) == (data + 2, catalogue + 1)
+
+
+async def test_write_from_another_worker_is_seen(client, user):
+    from app.database import AsyncSessionLocal
+    from app.models.profile import Tag
+    from app.services.data_version import track_user
+
+    await client.get("/api/v1/tags")
+    # A separate session stands in for another worker: this process's cache isn't told
+    async with AsyncSessionLocal() as session:
+        track_user(session, user.id)
+        session.add(Tag(user_id=user.id, name="elsewhere"))
+        await session.commit()
+    assert [t["name"] for t in (await client.get("/api/v1/tags")).json()] == ["elsewhere"]
+
+
+async def test_entry_tags_resolve_without_a_query(client):
+    tag = (await client.post("/api/v1/tags", json={"name": "morning"})).json()
+    await client.get("/api/v1/tags")
+    body = {"entry_date": "2026-01-10", "entry_time": "09:00:00", "description": "Headache", "tag_ids": [tag["id"]]}
+    with max_queries(20) as statements:
+        r = await client.post("/api/v1/entries/symptom", json=body)
+    assert r.status_code == 201
+    assert [t["name"] for t in r.json()["tags"]] == ["morning"]
+    assert not [s for s in statements if "FROM tags WHERE" in s]
+
+    r = await client.post("/api/v1/entries/symptom", json={**body, "tag_ids": [tag["id"], str(uuid.uuid4())]})
+    assert r.status_code == 400
+    r = await client.post("/api/v1/entries/symptom", json={**body, "tag_ids": [tag["id"], tag["id"]]})
+    assert r.status_code == 400
+
+
+async def test_stale_replica_load_is_not_cached_under_the_new_version(client, user):
+    from app.database import AsyncSessionLocal
+    from app.models.user import User
+    from app.services import user_cache
+    from app.services.catalogue import autocomplete_food
+
+    assert (await client.post("/api/v1/catalogue", json={"name": "Oats", "category": "food"})).status_code == 201
+    async with AsyncSessionLocal() as session:
+        behind = await session.get(User, user.id)
+    # The primary's user row has moved on (e.g. "Toast" was just added) but this session is a lagging replica
+    ahead = User(id=user.id, catalogue_version=behind.catalogue_version + 1, data_version=behind.data_version + 1)
+    async with AsyncSessionLocal() as lagging:
+        assert [i.name for i in await user_cache.food_catalogue(lagging, ahead)] == ["Oats"]
+        await autocomplete_food(lagging, ahead, "", 5)
+    # Stored under the version the rows were read at, so a caught-up read reloads
+    cache = user_cache.get_user_cache()
+    assert cache.get(user.id, "food_catalogue", ahead.catalogue_version) is user_cache._MISS
+    assert cache.get(user.id, "food_catalogue", behind.catalogue_version) is not user_cache._MISS
+    assert cache.get(user.id, "food_uses", ahead.data_version) is user_cache._MISS
+    assert cache.get(user.id, "food_uses", behind.data_version) == {}
+
+
+def test_lru_eviction_and_versions():
+    from app.services.user_cache import _MISS, UserCache
+
+    cache, a, b, c = UserCache(2), uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    cache.put(a, "tags", 1, "a")
+    cache.put(b, "tags", 1, "b")
+    assert cache.get(a, "tags", 1) == "a"  # a is now the most recent
+    cache.put(c, "tags", 1, "c")
+    assert cache.get(b, "tags", 1) is _MISS
+    assert cache.get(a, "tags", 2) is _MISS
+    assert cache.get(c, "tags", 1) == "c"
+
+
+def test_similarity_matches_pg_trgm():
+    from app.services.catalogue import _similarity
+
+    # SELECT similarity('word', 'two words') in the pg_trgm docs
+    assert round(_similarity("word", "two words"), 6) == 0.363636
@@ -0,0 +1,34 @@
+"""Assertion helpers shared by the test modules."""
+from contextlib import contextmanager
+import pytest
+
+
+@contextmanager
+def max_queries(n: int):
+    """Fail if the block issues more than `n` SQL statements.
+
+        with max_queries(3):
+            await client.get("/api/v1/entries/bp")
+
+    The failure message lists every statement, with repeats counted, so an
+    N+1 shows up as one SELECT executed many times.
+    """
+    from sqlalchemy import event
+    from app.database import engine
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(" ".join(statement.split()))
+
+    event.listen(engine.sync_engine, "after_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "after_cursor_execute", record)
+    if len(statements) > n:
+        counts: dict[str, int] = {}
+        for s in statements:
+            counts[s] = counts.get(s, 0) + 1
+        listing = "\n".join(f"  {c}x {s[:160]}" for s, c in counts.items())
+        pytest.fail(f"{len(statements)} queries issued, budget {n}:\n{listing}", pytrace=False)
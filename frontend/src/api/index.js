@@ -119,6 +119,7 @@ export const gymApi = {
 
 export const catalogueApi = {
   search: (params) => api.get('/catalogue', { params }),
+  suggestions: (params) => api.get('/catalogue/suggestions', { params }),
   create: (data) => api.post('/catalogue', data),
   update: (id, data) => api.patch('/catalogue/' + id, data),
   delete: (id) => api.delete('/catalogue/' + id),
@@ -126,6 +127,7 @@ export const catalogueApi = {
 
 export const exerciseCatalogueApi = {
   search: (params) => api.get('/exercise-catalogue', { params }),
+  suggestions: (params) => api.get('/exercise-catalogue/suggestions', { params }),
   create: (data) => api.post('/exercise-catalogue', data),
   delete: (id) => api.delete('/exercise-catalogue/' + id),
 }